@@ -1,20 +1,47 @@
+import asyncio
+from contextlib import asynccontextmanager
 from typing import List, Optional
 import os
 import json
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 
+from src.cache import AsyncSingleFlight, make_flight_key
 from src.models import Project
 from src.github import ProjectService
+from src.github.async_github_client import close_shared_http_client
+from src.github.session_pool import close_shared_session
+from src.github.token_pool import load_github_tokens
+from src.github.trending_cache import get_trending_cache_settings
+from src.llm import close_llm_http_clients
+from src.resilience import Deadline, deadline_scope, request_deadline
 from src.searchagent.graph import graph as search_graph
+from src.searchagent.verdict_cache import get_verdict_cache
 from src.React.graph import graph as react_graph
+from src.React.summary_cache import get_summary_cache
 load_dotenv()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 启动时预热当日 trending 快照，并在后台持续刷新
+    project_service.trending_cache.start(
+        warm_keys=[("daily", False)],
+        interval=get_trending_cache_settings()["interval"],
+    )
+    yield
+    await project_service.trending_cache.stop()
+    # 关闭共享的 HTTP/2 连接池、同步 Session 连接池和模型调用的连接池
+    await close_shared_http_client()
+    close_shared_session()
+    await close_llm_http_clients()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",
@@ -29,13 +56,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-github_token = os.getenv("GITHUB_TOKEN")
-project_service = ProjectService(github_token=github_token)
+# 支持逗号分隔的 GITHUB_TOKENS 组成 token 池，未配置时使用 GITHUB_TOKEN
+project_service = ProjectService(github_tokens=load_github_tokens())
+
+# 合并相同的并发 /summary 请求
+summary_flight = AsyncSingleFlight()
+
+
+def get_request_deadline(
+    timeout: Optional[float] = Query(None, gt=0, description="请求时间预算（秒），默认 REQUEST_DEADLINE_SECONDS"),
+    x_request_timeout: Optional[float] = Header(None, gt=0, description="同 timeout 参数，参数优先"),
+) -> Deadline:
+    """
+    请求级截止时间：经 LangGraph config（configurable.deadline）和上下文传递到
+    所有节点、工具和 HTTP 调用，时间用完时各节点返回已有的部分结果
+    """
+    return request_deadline(timeout if timeout is not None else x_request_timeout)
+
 
 @app.get("/projects", response_model=List[Project])
-async def get_projects() -> List[Project]:
-    """获取当日的 GitHub trending 项目"""
-    return project_service.get_trending_projects(limit=25)
+async def get_projects(
+    since: str = Query("daily", pattern="^(daily|weekly|monthly)$", description="时间范围"),
+    enrich: bool = Query(False, description="是否通过 GitHub API 补全 topics 等字段"),
+) -> List[Project]:
+    """获取 GitHub trending 项目（从快照缓存返回，后台定期刷新）"""
+    return await project_service.aget_trending_projects(limit=25, enrich=enrich, since=since)
 
 
 @app.get("/summary/readme")
@@ -46,7 +91,7 @@ async def summarize_readme_get(
     """
     GET 方式生成 README 摘要，便于前端直接调用。
     """
-    readme_text = project_service.get_repository_readme(repo_name, ref)
+    readme_text = await project_service.aget_repository_readme(repo_name, ref)
 
     if not readme_text:
         raise HTTPException(
@@ -79,6 +124,7 @@ async def summarize_readme_get(
 async def get_summary(
     repo_name: str = Query(..., description="仓库全名，如 owner/repo"),
     max_steps: int = Query(10, description="最大执行步骤数，默认 10"),
+    deadline: Deadline = Depends(get_request_deadline),
 ):
     """
     使用 ReAct 框架生成项目总结。
@@ -91,12 +137,33 @@ async def get_summary(
     参数：
     - repo_name: GitHub 仓库全名，如 "owner/repo"
     - max_steps: 最大执行步骤数，防止无限循环，默认 10
+    - timeout: 请求时间预算（秒），也可通过 X-Request-Timeout 请求头设置；时间不足时提前生成总结
+
+    README 和模型都没有变化时直接返回缓存的总结（响应中 cached 为 true）
     """
-    readme_text = project_service.get_repository_readme(repo_name, None)
+    # 多个用户同时请求同一个仓库的总结时，只获取一次 README、执行一次 ReAct 工作流
+    # （共享的执行使用第一个请求的截止时间）
+    with deadline_scope(deadline):
+        return await summary_flight.do(
+            make_flight_key("summary", repo_name, max_steps),
+            lambda: run_summary(repo_name, max_steps, deadline),
+        )
+
+
+async def run_summary(repo_name: str, max_steps: int, deadline: Optional[Deadline] = None):
+    """获取 README 并执行 ReAct 工作流生成项目总结，结果按 README 内容和模型缓存"""
+    readme_text = await project_service.aget_repository_readme(repo_name, None)
     if not readme_text:
         raise HTTPException(
             status_code=404, detail="缺少 README 内容，且无法通过仓库名获取。"
         )
+
+    # SQLite 读写在线程中执行，不阻塞事件循环
+    summary_cache = await asyncio.to_thread(get_summary_cache)
+    cached = await asyncio.to_thread(summary_cache.get, repo_name, readme_text)
+    if cached is not None:
+        print(f"⚡ 命中总结缓存: {repo_name}")
+        return {**cached, "cached": True}
     
     # 初始化 ReAct 状态
     input_data = {
@@ -109,7 +176,7 @@ async def get_summary(
     
     # 执行 ReAct 工作流
     try:
-        result = react_graph.invoke(input_data)
+        result = await react_graph.ainvoke(input_data, config={"configurable": {"deadline": deadline}})
         
         # 检查是否成功生成总结
         if not result.get('final_summary'):
@@ -118,34 +185,74 @@ async def get_summary(
                 detail=f"ReAct 框架未能生成总结。步骤数: {result.get('step_count', 0)}/{max_steps}"
             )
         
-        return {
+        response = {
             "repo": repo_name,
             "summary": result['final_summary'],
             "steps": result.get('step_count', 0),
             "thoughts": result.get('thoughts', []),
         }
+        # 时间用完时的部分结果不缓存，下次请求重新生成
+        if not result.get('partial'):
+            await asyncio.to_thread(summary_cache.set, repo_name, readme_text, response)
+        return {**response, "cached": False}
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"ReAct 框架执行失败: {str(e)}"
         )
 
+
+def to_project_data(project: dict) -> dict:
+    """把通过验证的 GitHub 仓库数据转换为前端的 Project 格式"""
+    full_name = project.get("full_name", "")
+    language = project.get("language")
+    tags = list(project.get("topics", []))
+    if language and language.lower() not in tags:
+        tags.append(language.lower())
+    
+    # 提取仓库名称（不包含owner）
+    repo_name = project.get("name", "") or (full_name.split("/")[-1] if "/" in full_name else full_name)
+    
+    return {
+        "id": full_name,
+        "title": repo_name,
+        "authors": project.get("owner", {}).get("login", "Unknown"),
+        "description": project.get("description", "") or "",
+        "tags": tags[:10],
+        "stars": project.get("stargazers_count", 0),
+        "forks": project.get("forks_count", 0),
+        "language": language,
+    }
+
+
 @app.get("/search")
 async def search(
     user_input: str = Query(..., description="用户输入"),
+    deadline: Deadline = Depends(get_request_deadline),
 ):
-    """搜索 GitHub 项目，流式返回结果"""
+    """搜索 GitHub 项目，流式返回结果；时间预算用完时返回已验证的部分结果"""
     
     async def generate():
+        with deadline_scope(deadline):
+            async for chunk in stream_search_events():
+                yield chunk
+
+    async def stream_search_events():
         try:
             # 初始化状态
             initial_state = {"user_input": user_input}
             
             # 用于跟踪已发送的项目，避免重复发送
             sent_projects = set()
+            # 本次搜索的验证缓存命中情况
+            verdict_cache_stats = {"hits": 0, "misses": 0}
+            # 预筛选过滤掉、没有交给 LLM 验证的项目数
+            prefilter_pruned = 0
             
             # 使用 astream 来流式执行 graph
-            async for event in search_graph.astream(initial_state):
+            async for event in search_graph.astream(
+                initial_state, config={"configurable": {"deadline": deadline}}
+            ):
                 # 发送每个节点的更新
                 for node_name, node_output in event.items():
                     if node_name == "generate_search_queries":
@@ -166,39 +273,35 @@ async def search(
                         if github_results:
                             yield f"data: {json.dumps({'type': 'search_progress', 'data': {'total': len(github_results)}}, ensure_ascii=False)}\n\n"
                     
-                    elif node_name == "validate_project":
-                        # 流式发送验证后的项目（并行验证，每个项目验证完成后立即发送）
-                        validated_projects = node_output.get("validated_projects", [])
-                        # 每个 validate_project 节点只返回一个项目，取最后一个确保是最新验证的
-                        if validated_projects:
-                            project = validated_projects[-1]
+                    elif node_name == "prefilter_projects":
+                        # 发送预筛选结果：保留交给 LLM 验证的项目数和被过滤的项目数
+                        prefilter_pruned = node_output.get("prefilter_pruned", 0)
+                        kept = len(node_output.get("github_results", []))
+                        yield f"data: {json.dumps({'type': 'prefilter', 'data': {'kept': kept, 'pruned': prefilter_pruned}}, ensure_ascii=False)}\n\n"
+                    
+                    elif node_name in ("validate_project", "validate_projects_batch"):
+                        verdict_cache_stats["hits"] += node_output.get("verdict_cache_hits", 0)
+                        verdict_cache_stats["misses"] += node_output.get("verdict_cache_misses", 0)
+                        # 流式发送验证后的项目（并行验证，每个项目或每批项目验证完成后立即发送）
+                        # validate_project 只返回一个项目，validate_projects_batch 返回一批中所有通过验证的项目
+                        for project in node_output.get("validated_projects", []):
                             full_name = project.get("full_name", "")
                             if full_name and full_name not in sent_projects:
                                 sent_projects.add(full_name)
-                                
-                                # 转换为 Project 格式
-                                language = project.get("language")
-                                tags = project.get("topics", [])
-                                if language and language not in tags:
-                                    tags.append(language.lower())
-                                
-                                # 提取仓库名称（不包含owner）
-                                repo_name = project.get("name", "") or (full_name.split("/")[-1] if "/" in full_name else full_name)
-                                
-                                project_data = {
-                                    "id": full_name,
-                                    "title": repo_name,
-                                    "authors": project.get("owner", {}).get("login", "Unknown"),
-                                    "description": project.get("description", "") or "",
-                                    "tags": tags[:10],
-                                    "stars": project.get("stargazers_count", 0),
-                                    "forks": project.get("forks_count", 0),
-                                    "language": language,
-                                }
-                                yield f"data: {json.dumps({'type': 'project', 'data': project_data}, ensure_ascii=False)}\n\n"
+                                yield f"data: {json.dumps({'type': 'project', 'data': to_project_data(project)}, ensure_ascii=False)}\n\n"
             
-            # 发送完成信号
-            yield f"data: {json.dumps({'type': 'complete', 'data': {'total': len(sent_projects)}}, ensure_ascii=False)}\n\n"
+            # 发送完成信号（附带验证缓存命中率）
+            lookups = verdict_cache_stats["hits"] + verdict_cache_stats["misses"]
+            verdict_cache_stats["hit_ratio"] = round(verdict_cache_stats["hits"] / lookups, 4) if lookups else 0.0
+            verdict_cache_totals = await asyncio.to_thread(lambda: get_verdict_cache().stats())
+            print(f"⚡ 验证缓存命中 {verdict_cache_stats['hits']}/{lookups}，累计 {verdict_cache_totals}")
+            complete_data = {
+                'total': len(sent_projects),
+                'timed_out': deadline.expired,
+                'pruned': prefilter_pruned,
+                'verdict_cache': verdict_cache_stats,
+            }
+            yield f"data: {json.dumps({'type': 'complete', 'data': complete_data}, ensure_ascii=False)}\n\n"
         
         except Exception as e:
             yield f"data: {json.dumps({'type': 'error', 'data': str(e)}, ensure_ascii=False)}\n\n"
@@ -213,35 +316,52 @@ async def search(
         }
     )
 
+# /new 最多爬取的项目数（超过 1000 时按创建时间分片爬取），以及同时获取 README 的请求数
+NEW_REPOS_LIMIT = int(os.getenv("NEW_REPOS_LIMIT", "3000"))
+NEW_REPOS_README_CONCURRENCY = int(os.getenv("NEW_REPOS_README_CONCURRENCY", "8"))
+
+
+def save_readme(output_dir: Path, repo_name: str, readme: str) -> Path:
+    """把 README 写入 output_dir，返回文件路径"""
+    # 生成安全的文件名
+    safe_repo_name = repo_name.replace("/", "_").replace("\\", "_")
+    safe_repo_name = "".join(c for c in safe_repo_name if c.isalnum() or c in ('_', '-', '.'))
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{safe_repo_name}_{timestamp}.md"
+    filepath = output_dir / filename
+    
+    # 写入文件
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(f"# {repo_name}\n\n")
+        f.write(f"**GitHub URL:** https://github.com/{repo_name}\n\n")
+        f.write(f"**获取时间:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        f.write("---\n\n")
+        f.write(readme)
+    return filepath
+
+
 @app.get("/new")
 async def get_new_projects() -> int:
     """获取新的 GitHub 项目"""
-    repos = project_service.get_new_repositories(days=20, min_stars=2000, language="Python", limit=1000)
+    # 超过 1000 时按创建时间分片爬取，不受单个查询 1000 条结果的限制；NEW_REPOS_LIMIT 限制总量
+    repos = await project_service.aget_new_repositories(
+        days=20, min_stars=2000, language="Python", limit=NEW_REPOS_LIMIT
+    )
     
     # 创建输出目录
     output_dir = Path(__file__).parent / "readmes"
     output_dir.mkdir(exist_ok=True)
     
-    for repo in repos:
+    # 并发获取 README，同时进行的请求数不超过 NEW_REPOS_README_CONCURRENCY
+    semaphore = asyncio.Semaphore(max(1, NEW_REPOS_README_CONCURRENCY))
+    
+    async def fetch_and_save(repo: dict) -> None:
         repo_name = repo.get("full_name")
-        readme = project_service.get_repository_readme(repo_name)
-        
+        async with semaphore:
+            readme = await project_service.aget_repository_readme(repo_name)
         if readme:
-            # 生成安全的文件名
-            safe_repo_name = repo_name.replace("/", "_").replace("\\", "_")
-            safe_repo_name = "".join(c for c in safe_repo_name if c.isalnum() or c in ('_', '-', '.'))
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{safe_repo_name}_{timestamp}.md"
-            filepath = output_dir / filename
-            
-            # 写入文件
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"# {repo_name}\n\n")
-                f.write(f"**GitHub URL:** https://github.com/{repo_name}\n\n")
-                f.write(f"**获取时间:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                f.write("---\n\n")
-                f.write(readme)
-            
+            filepath = await asyncio.to_thread(save_readme, output_dir, repo_name, readme)
             print(f"💾 README saved: {filepath}")
-
+    
+    await asyncio.gather(*(fetch_and_save(repo) for repo in repos))
     return len(repos)
\ No newline at end of file
@@ -9,9 +9,11 @@
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List
-from langchain.chat_models import init_chat_model
-from tavily import TavilyClient
+from typing import Dict, Any, List, Optional
+from langchain_core.runnables import RunnableConfig
+from src.llm import PLANNING_README_TOKENS, SUMMARY_README_TOKENS, get_chat_model, prepare_readme
+from src.resilience import Deadline, get_deadline, invoke_with_retry, remaining_timeout
+from src.web_search import tavily_search
 
 from .state import ReActState
 from .schemas import ThoughtAction, SearchQueryList, RelevanceAssessmentList, FinalSummary
@@ -25,18 +27,51 @@ from .prompts import (
 MODEL_NAME = os.getenv("MODEL_NAME")
 MODEL_PROVIDER = os.getenv("MODEL_PROVIDER") or None
 
-def get_llm():
-    return init_chat_model(model=MODEL_NAME, model_provider=MODEL_PROVIDER, temperature=0)
+# 为最终总结预留的时间（秒）：请求剩余时间不足时停止搜索，直接生成总结
+SUMMARY_RESERVE_SECONDS = float(os.getenv("REACT_SUMMARY_RESERVE_SECONDS", "20"))
+
+def get_llm(cache: bool = True, schema: Optional[type] = None, tools: Optional[list] = None):
+    """
+    获取复用的模型实例，调用超时不超过请求剩余时间
+
+    Args:
+        cache: 是否使用 LLM 响应缓存（结果已有更高层缓存的节点可以关闭）
+        schema: 结构化输出的 schema
+        tools: 绑定的工具
+    """
+    return get_chat_model(
+        MODEL_NAME,
+        MODEL_PROVIDER,
+        temperature=0,
+        cache=cache,
+        timeout=remaining_timeout(),
+        schema=schema,
+        tools=tools,
+    )
 
 
-def think(state: ReActState) -> ReActState:
+def think(state: ReActState, config: RunnableConfig) -> ReActState:
     """思考节点：分析当前状态，决定下一步行动
     
     这是 ReAct 框架的核心，Agent 会思考：
     - 当前已经收集了什么信息
     - 还需要什么信息
     - 下一步应该执行什么动作
+
+    请求剩余时间不足 SUMMARY_RESERVE_SECONDS 时不再思考，直接基于已有结果生成总结
     """
+    deadline = get_deadline(config)
+    if deadline is not None and deadline.running_out(SUMMARY_RESERVE_SECONDS):
+        thought_text = f"步骤 {state.get('step_count', 0) + 1}: 请求剩余时间不足，基于已有信息直接生成总结"
+        print(f"⏱️ {thought_text}")
+        return {
+            'current_thought': thought_text,
+            'current_action': 'summarize',
+            'action_input': None,
+            'thoughts': [thought_text],
+            'should_continue': True
+        }
+
     # 构建已完成步骤的描述
     completed_steps = []
     if state.get('search_queries'):
@@ -51,7 +86,7 @@ def think(state: ReActState) -> ReActState:
     # 准备提示词
     messages = react_system_prompt.format_messages(
         project_name=state['project_name'],
-        readme=state['readme'],
+        readme=prepare_readme(state['readme'], PLANNING_README_TOKENS),
         completed_steps="; ".join(completed_steps),
         search_results_count=len(state.get('search_results', [])),
         filtered_results_count=len(state.get('filtered_results', [])),
@@ -60,8 +95,7 @@ def think(state: ReActState) -> ReActState:
     )
     
     # 调用 LLM 进行思考
-    llm = get_llm()
-    response = llm.with_structured_output(ThoughtAction).invoke(messages)
+    response = invoke_with_retry(lambda: get_llm(schema=ThoughtAction), messages)
     
     # 记录思考内容
     thought_text = f"步骤 {state.get('step_count', 0) + 1}: {response.thought}"
@@ -80,7 +114,7 @@ def think(state: ReActState) -> ReActState:
     }
 
 
-def act(state: ReActState) -> ReActState:
+def act(state: ReActState, config: RunnableConfig) -> ReActState:
     """行动节点：根据思考结果执行相应的动作
     
     支持的动作：
@@ -90,31 +124,32 @@ def act(state: ReActState) -> ReActState:
     - finish: 完成任务
     """
     action = state.get('current_action', '')
+    deadline = get_deadline(config)
     
     print(f"🎬 执行动作: {action}")
     
     # 根据动作类型执行相应的操作
     if action == 'search':
-        return _act_search(state)
+        return _act_search(state, deadline)
     elif action == 'filter':
         return _act_filter(state)
     elif action == 'summarize':
-        return _act_summarize(state)
+        return _act_summarize(state, deadline)
     elif action == 'finish':
         return {'should_continue': False}
     else:
         # 如果没有明确动作，根据状态自动决定
         if not state.get('search_queries'):
-            return _act_search(state)
+            return _act_search(state, deadline)
         elif not state.get('filtered_results') and state.get('search_results'):
             return _act_filter(state)
         elif not state.get('final_summary') and state.get('filtered_results'):
-            return _act_summarize(state)
+            return _act_summarize(state, deadline)
         else:
             return {'should_continue': False}
 
 
-def _act_search(state: ReActState) -> ReActState:
+def _act_search(state: ReActState, deadline: Optional[Deadline] = None) -> ReActState:
     """执行搜索动作：生成搜索查询并执行网络搜索"""
     print(f"🔍 执行搜索动作...")
 
@@ -126,11 +161,10 @@ def _act_search(state: ReActState) -> ReActState:
     # 生成搜索查询
     messages = search_query_prompt.format_messages(
         project_name=state['project_name'],
-        readme=state['readme']
+        readme=prepare_readme(state['readme'], PLANNING_README_TOKENS)
     )
     
-    llm = get_llm()
-    response = llm.with_structured_output(SearchQueryList).invoke(messages)
+    response = invoke_with_retry(lambda: get_llm(schema=SearchQueryList), messages)
     
     # 只保留前 1~2 个查询，避免生成太多查询导致搜索太慢
     raw_queries = response.queries
@@ -150,15 +184,17 @@ def _act_search(state: ReActState) -> ReActState:
     search_queries = deduped[:2] or [state["project_name"]]
     print(f"   ✅ 生成搜索查询（已精简）: {search_queries}")
     
-    # 执行网络搜索
-    tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+    # 执行网络搜索（相同查询的结果在有效期内直接复用）
     all_results = []
     
     for query in search_queries:
+        if deadline is not None and deadline.running_out(SUMMARY_RESERVE_SECONDS):
+            print("   ⏱️ 请求剩余时间不足，停止搜索")
+            break
         print(f"   🔍 搜索: {query}")
         try:
-            results = tavily_client.search(
-                query=query,
+            results = tavily_search(
+                query,
                 # 每个查询最多拿少量结果，避免结果数量爆炸
                 max_results=5,
                 include_raw_content=True
@@ -226,8 +262,21 @@ def _act_filter(state: ReActState) -> ReActState:
     }
 
 
-def _act_summarize(state: ReActState) -> ReActState:
-    """执行总结动作：生成最终的项目总结"""
+def _fallback_summary(state: ReActState, results: List[Dict[str, Any]]) -> str:
+    """请求时间用完、无法调用 LLM 时的部分结果：README 开头 + 已收集的参考链接"""
+    lines = [
+        "> ⏱️ 请求时间预算已用完，以下为未经模型整理的部分结果。",
+        "",
+        state.get('readme', '')[:2000].strip(),
+    ]
+    if results:
+        lines += ["", "## 参考资料", ""]
+        lines += [f"- [{r.get('title', 'N/A')}]({r.get('url', '')})" for r in results]
+    return "\n".join(lines)
+
+
+def _act_summarize(state: ReActState, deadline: Optional[Deadline] = None) -> ReActState:
+    """执行总结动作：生成最终的项目总结（请求时间用完时返回部分结果）"""
     print(f"📝 执行总结动作...")
     
     filtered_results = state.get('filtered_results', [])
@@ -246,16 +295,23 @@ def _act_summarize(state: ReActState) -> ReActState:
     # 构建提示词
     messages = final_summary_prompt.format_messages(
         project_name=state['project_name'],
-        readme=state['readme'],
+        readme=prepare_readme(state['readme'], SUMMARY_README_TOKENS),
         filtered_results=results_text
     )
     
     # 调用 LLM 生成总结
-    llm = get_llm()
-    response = llm.with_structured_output(FinalSummary).invoke(messages)
-    
-    final_summary = response.summary
-    print(f"   ✅ 生成总结 ({len(final_summary)} 字符)")
+    partial = False
+    try:
+        # 最终总结已按 README 和模型缓存（summary_cache），不再重复写入 LLM 响应缓存
+        response = invoke_with_retry(lambda: get_llm(cache=False, schema=FinalSummary), messages)
+        final_summary = response.summary
+        print(f"   ✅ 生成总结 ({len(final_summary)} 字符)")
+    except Exception as e:
+        if deadline is None or not deadline.expired:
+            raise
+        print(f"   ⏱️ 请求时间用完，返回部分结果: {e}")
+        final_summary = _fallback_summary(state, filtered_results or state.get('search_results', []))
+        partial = True
     
     # 将总结写入文件
     output_dir = Path(__file__).parent.parent.parent.parent / "summaries"
@@ -279,6 +335,7 @@ def _act_summarize(state: ReActState) -> ReActState:
     
     return {
         'final_summary': final_summary,
+        'partial': partial,
         'observations': [f"生成最终总结，共 {len(final_summary)} 字符"],
         'should_continue': False
     }
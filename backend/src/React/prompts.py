@@ -1,5 +1,8 @@
 from langchain_core.prompts import ChatPromptTemplate
 
+# 提示词版本：修改下方任一提示词时递增，使已缓存的总结失效
+PROMPT_VERSION = "1"
+
 # ReAct 框架的系统提示词
 react_system_prompt = ChatPromptTemplate.from_messages([
     ("system", """你是一个使用 ReAct（Reasoning + Acting）框架的智能研究助手。
@@ -31,6 +31,7 @@ class ReActState(TypedDict, total=False):
     
     # 最终输出
     final_summary: str
+    partial: bool  # 最终总结是否为请求时间用完时的部分结果（不写入缓存）
     
     # 控制流程
     step_count: int  # 步骤计数，防止无限循环
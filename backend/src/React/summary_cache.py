@@ -0,0 +1,89 @@
+"""
+项目总结缓存：按 (仓库, README blob SHA, 模型, 提示词版本, README 预处理设置) 持久化 ReAct 工作流的结果，
+README 和模型都没有变化时 /summary 直接返回缓存，不再执行 ReAct 循环
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from ..cache import SQLiteCache, get_cache_dir, git_blob_sha, make_flight_key
+from ..llm import PLANNING_README_TOKENS, SUMMARY_README_TOKENS, readme_settings_tag
+
+from .nodes import MODEL_NAME, MODEL_PROVIDER
+from .prompts import PROMPT_VERSION
+
+
+class SummaryCache:
+    """基于 SQLiteCache 的总结缓存，支持 TTL 和容量上限淘汰"""
+
+    def __init__(
+        self,
+        ttl: Optional[float] = 7 * 86400,
+        max_entries: Optional[int] = 2000,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+    ):
+        """
+        Args:
+            ttl: 总结的有效期（秒），过期后重新生成（外部搜索结果可能已经变化）
+            max_entries: 最多缓存的总结数
+            max_bytes: 压缩后的最大总字节数
+        """
+        self._cache = SQLiteCache(
+            get_cache_dir() / "summaries.sqlite3",
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl=ttl,
+        )
+
+    @staticmethod
+    def make_key(repo_name: str, readme: str) -> str:
+        """
+        缓存 key：仓库 + README 的 git blob SHA + 模型 + 提示词版本 + README 预处理设置
+
+        Args:
+            repo_name: 仓库全名 "owner/repo"
+            readme: README 文本
+        """
+        readme_sha = git_blob_sha(readme.encode("utf-8"))
+        return make_flight_key(
+            repo_name.lower(),
+            readme_sha,
+            MODEL_PROVIDER,
+            MODEL_NAME,
+            PROMPT_VERSION,
+            readme_settings_tag(PLANNING_README_TOKENS, SUMMARY_README_TOKENS),
+        )
+
+    def get(self, repo_name: str, readme: str) -> Optional[Dict[str, Any]]:
+        """读取缓存的总结，未命中或已过期时返回 None"""
+        return self._cache.get(self.make_key(repo_name, readme))
+
+    def set(self, repo_name: str, readme: str, result: Dict[str, Any]) -> None:
+        """保存总结结果（/summary 的响应内容）"""
+        self._cache.set(self.make_key(repo_name, readme), result)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+_summary_cache: Optional[SummaryCache] = None
+_summary_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> SummaryCache:
+    """
+    获取进程内共享的 SummaryCache
+
+    可通过环境变量配置：
+    - SUMMARY_CACHE_TTL: 总结有效期（秒），默认 604800（7 天）
+    - SUMMARY_CACHE_MAX_ENTRIES: 最多缓存的总结数，默认 2000
+    """
+    global _summary_cache
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            _summary_cache = SummaryCache(
+                ttl=float(os.getenv("SUMMARY_CACHE_TTL", str(7 * 86400))),
+                max_entries=int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "2000")),
+            )
+        return _summary_cache
@@ -1,7 +1,7 @@
 """Backend source modules"""
 
 from .models import Project
-from .github import GitHubClient, ProjectService
+from .github import GitHubClient, AsyncGitHubClient, ProjectService
 
-__all__ = ["Project", "GitHubClient", "ProjectService"]
+__all__ = ["Project", "GitHubClient", "AsyncGitHubClient", "ProjectService"]
 
@@ -1,19 +1,37 @@
 from datetime import datetime
 import os
 from pathlib import Path
+from typing import Optional
 from langgraph.types import Send
 from .schemas import FinalSummary, SearchQueryList, RelevanceAssessmentList
 from .state import ResearchState, WebSearchState
 from .prompts import query_writer_instructions, relevance_assessment_system_prompt, final_summary_prompt, test_summary_prompt
-from langchain.chat_models import init_chat_model
 
-from tavily import TavilyClient
+from src.llm import get_chat_model
+from src.resilience import invoke_with_retry, remaining_timeout
+from src.web_search import tavily_search
 
 MODEL_NAME = os.getenv("MODEL_NAME")
 MODEL_PROVIDER = os.getenv("MODEL_PROVIDER") or None
 
-def get_llm():
-    return init_chat_model(model=MODEL_NAME, model_provider=MODEL_PROVIDER, temperature=0)
+def get_llm(cache: bool = True, schema: Optional[type] = None, tools: Optional[list] = None):
+    """
+    获取复用的模型实例，调用超时不超过请求剩余时间
+
+    Args:
+        cache: 是否使用 LLM 响应缓存（结果已有更高层缓存的节点可以关闭）
+        schema: 结构化输出的 schema
+        tools: 绑定的工具
+    """
+    return get_chat_model(
+        MODEL_NAME,
+        MODEL_PROVIDER,
+        temperature=0,
+        cache=cache,
+        timeout=remaining_timeout(),
+        schema=schema,
+        tools=tools,
+    )
     
 def generate_queries(state: ResearchState) -> ResearchState:
     """生成搜索查询"""
@@ -23,9 +41,7 @@ def generate_queries(state: ResearchState) -> ResearchState:
         readme=state['readme']
     )
 
-    llm = get_llm()
-    
-    response = llm.with_structured_output(SearchQueryList).invoke(messages)
+    response = invoke_with_retry(lambda: get_llm(schema=SearchQueryList), messages)
 
     print(f"🔍 Generated search queries: {response.query}")
 
@@ -45,19 +61,22 @@ def to_web_research(state: ResearchState):
 def web_research(state: WebSearchState) -> ResearchState:
     """处理单个搜索查询（由 Send 并行调用）"""
     
-    tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
-    
     # 从 Send 传递的 state 中获取单个查询
     query = state['search_query']
     
     print(f"🔍 Searching: {query}")
     
-    # 执行单个查询的搜索
-    results = tavily_client.search(
-        query=query,
-        max_results=10,
-        include_raw_content=True  # 包含完整网页内容
-    )
+    # 执行单个查询的搜索（结果缓存，暂时性故障自动重试，Tavily 不可用时熔断）
+    # 单个查询失败只丢失该查询的结果，不影响整个总结流程
+    try:
+        results = tavily_search(
+            query,
+            max_results=10,
+            include_raw_content=True,  # 包含完整网页内容
+        )
+    except Exception as e:
+        print(f"❌ 搜索失败 {query}: {e}")
+        results = {}
     
     search_results = results.get('results', [])
     # 只返回原始结果，LangGraph 会自动合并（使用 operator.add）
@@ -84,7 +103,7 @@ def filter_irrelevant_results(state: ResearchState) -> ResearchState:
     print(f"🔍 Filtering {len(results)} results...")
     
     # 一次性评估所有结果
-    response = get_llm().with_structured_output(RelevanceAssessmentList).invoke(prompt)
+    response = invoke_with_retry(lambda: get_llm(schema=RelevanceAssessmentList), prompt)
     
     assessments = response.assessments
     
@@ -135,8 +154,7 @@ def generate_final_summary(state: ResearchState) -> ResearchState:
     print(f"📝 Generating final summary for {state['project_name']}...")
     
     # 调用 LLM 生成总结
-    llm = get_llm()
-    response = llm.with_structured_output(FinalSummary).invoke(messages)
+    response = invoke_with_retry(lambda: get_llm(schema=FinalSummary), messages)
     
     final_summary = response.summary
     
@@ -175,8 +193,7 @@ def test_generate_final_summary(state: ResearchState) -> ResearchState:
     
     print(f"📝 Generating test summary for {state['project_name']}...")
     
-    llm = get_llm()
-    response = llm.invoke(messages)
+    response = invoke_with_retry(get_llm, messages)
     
     final_summary = response.content if hasattr(response, 'content') else str(response)
     
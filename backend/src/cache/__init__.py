@@ -0,0 +1,17 @@
+"""通用缓存组件：内存 LRU、SQLite 持久化缓存、内容寻址的 blob 存储、并发请求合并"""
+
+from .blob_store import BlobStore, git_blob_sha
+from .lru import LRUCache
+from .singleflight import AsyncSingleFlight, SingleFlight, make_flight_key
+from .sqlite_cache import SQLiteCache, get_cache_dir
+
+__all__ = [
+    "AsyncSingleFlight",
+    "BlobStore",
+    "LRUCache",
+    "SQLiteCache",
+    "SingleFlight",
+    "get_cache_dir",
+    "git_blob_sha",
+    "make_flight_key",
+]
@@ -0,0 +1,86 @@
+import hashlib
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .lru import LRUCache
+
+
+def git_blob_sha(data: bytes) -> str:
+    """计算文件内容的 git blob SHA（与 Trees API 返回的 sha 一致）"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class BlobStore:
+    """
+    内容寻址的文件内容存储，按 git blob SHA 索引
+
+    同一个 SHA 的内容永远不会变化，不需要过期或重新验证；不同仓库（如 fork）中
+    相同的文件共享同一份内容。磁盘上每个 blob 一个 zlib 压缩文件，
+    路径为 root/ab/cdef...，内存 LRU 在前
+    """
+
+    def __init__(self, root: Path, max_memory_bytes: Optional[int] = 32 * 1024 * 1024):
+        """
+        Args:
+            root: 存储目录
+            max_memory_bytes: 内存中缓存内容的最大总字节数
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._memory = LRUCache(max_entries=4096, max_bytes=max_memory_bytes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, sha: str) -> Path:
+        return self.root / sha[:2] / sha[2:]
+
+    def get(self, sha: str) -> Optional[str]:
+        """读取 blob 内容，不存在时返回 None"""
+        text = self._memory.get(sha)
+        if text is None:
+            path = self._path(sha)
+            try:
+                text = zlib.decompress(path.read_bytes()).decode("utf-8")
+            except FileNotFoundError:
+                text = None
+            except (zlib.error, UnicodeDecodeError, OSError):
+                # 文件损坏（如写入中断），删除后重新获取
+                path.unlink(missing_ok=True)
+                text = None
+            if text is not None:
+                self._memory.set(sha, text)
+
+        with self._lock:
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return text
+
+    def put(self, sha: str, text: str) -> None:
+        """保存 blob 内容（已存在时跳过写盘）"""
+        self._memory.set(sha, text)
+        path = self._path(sha)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再原子替换，避免并发读取到写了一半的文件
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(zlib.compress(text.encode("utf-8")))
+        os.replace(tmp_path, path)
+
+    def __contains__(self, sha: str) -> bool:
+        return sha in self._memory or self._path(sha).exists()
+
+    def stats(self) -> Dict[str, Any]:
+        """返回命中统计"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
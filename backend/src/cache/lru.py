@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """线程安全的内存 LRU 缓存，支持条目数上限、字节数上限和 TTL"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        """
+        Args:
+            max_entries: 最大条目数
+            max_bytes: 最大总字节数（可选，需要配合 sizeof 计算条目大小）
+            ttl: 条目存活时间（秒），None 表示永不过期
+            sizeof: 计算条目大小的函数，默认按 len(value) 估算
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof or (lambda value: len(value) if hasattr(value, "__len__") else 0)
+        # key -> (value, size, expires_at)
+        self._data: "OrderedDict[Hashable, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """读取缓存，命中时将条目移到最近使用位置"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """写入缓存，超出上限时淘汰最久未使用的条目"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        size = self._sizeof(value) if self.max_bytes else 0
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            # 单个条目超过字节上限时不缓存
+            if self.max_bytes and size > self.max_bytes:
+                return
+            self._data[key] = (value, size, expires_at)
+            self._total_bytes += size
+            while len(self._data) > self.max_entries or (
+                self.max_bytes and self._total_bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._total_bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and (entry[2] is None or entry[2] > time.time())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._data.pop(key)
+        self._total_bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """返回命中统计"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
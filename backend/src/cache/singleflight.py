@@ -0,0 +1,144 @@
+import asyncio
+import copy
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from ..resilience import DeadlineExceeded, remaining_timeout
+
+
+def make_flight_key(*parts: Any) -> str:
+    """根据请求的组成部分（URL、参数、图输入等）生成规范化的 key"""
+    return json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None  # 给等待者的结果快照，执行者的调用方修改返回值不会影响它
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    合并相同的并发调用（线程版）
+
+    同一个 key 同时只执行一次：第一个调用者执行函数，其余调用者等待并共享它的结果或异常；
+    有等待者时，在唤醒等待者之前对结果做一次深拷贝快照，执行者拿到原对象，等待者各自拿到快照的深拷贝，
+    任何调用者修改结果都不会影响其他调用者。
+    等待时间不超过当前请求截止时间的剩余时间，超时抛出 DeadlineExceeded（正在执行的调用不受影响）
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.shared = 0  # 被合并（没有重复执行）的调用次数
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """
+        执行 fn，或等待同一个 key 正在进行的调用
+
+        Args:
+            key: 请求标识，相同 key 的并发调用会被合并
+            fn: 实际执行的函数
+            timeout: 等待者最多等待的秒数（会被截断到请求剩余时间），None 时只受截止时间限制
+
+        Raises:
+            DeadlineExceeded: 等待超时或截止时间已到
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            if not call.event.wait(remaining_timeout(timeout)):
+                raise DeadlineExceeded("等待相同请求的结果超时")
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+            raise
+
+        with self._lock:
+            # 移出 _calls 之后不会再有新的等待者，此时的等待者数量就是最终数量
+            self._calls.pop(key, None)
+        try:
+            if call.waiters:
+                call.result = copy.deepcopy(result)
+        except Exception as e:
+            # 结果无法拷贝时只让等待者失败，执行者仍然拿到结果
+            call.error = e
+        finally:
+            call.event.set()
+        return result
+
+
+class AsyncSingleFlight:
+    """
+    合并相同的并发调用（asyncio 版）
+
+    共享的执行放在独立的 Task 中，单个调用者被取消（如客户端断开）不会影响其他等待者；
+    有等待者时，Task 在结束前对结果做一次深拷贝快照，执行者拿到原对象，等待者各自拿到快照的深拷贝；
+    等待时间的限制同 SingleFlight
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.shared = 0
+
+    async def do(
+        self, key: Hashable, factory: Callable[[], Awaitable[Any]], timeout: Optional[float] = None
+    ) -> Any:
+        """
+        执行 factory() 返回的协程，或等待同一个 key 正在进行的调用
+
+        Args:
+            key: 请求标识，相同 key 的并发调用会被合并
+            factory: 创建协程的函数（只有第一个调用者会调用）
+            timeout: 等待者最多等待的秒数，含义同 SingleFlight.do
+
+        Raises:
+            DeadlineExceeded: 等待超时或截止时间已到
+        """
+        task = self._tasks.get(key)
+        if task is None:
+
+            async def run() -> Tuple[Any, Any]:
+                try:
+                    result = await factory()
+                finally:
+                    # 在 Task 内部移出 _tasks：Task 结束后不会再有新的等待者加入
+                    if self._tasks.get(key) is task:
+                        del self._tasks[key]
+                    waiters = self._waiters.pop(key, 0)
+                return result, copy.deepcopy(result) if waiters else None
+
+            task = asyncio.ensure_future(run())
+            self._tasks[key] = task
+            result, _ = await asyncio.shield(task)
+            return result
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        self.shared += 1
+        try:
+            _, snapshot = await asyncio.wait_for(asyncio.shield(task), remaining_timeout(timeout))
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceeded("等待相同请求的结果超时") from e
+        return copy.deepcopy(snapshot)
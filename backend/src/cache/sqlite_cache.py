@@ -0,0 +1,173 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def get_cache_dir() -> Path:
+    """
+    获取本地缓存目录，默认 backend/.cache，可通过环境变量 RADARZ_CACHE_DIR 修改
+    """
+    cache_dir = os.getenv("RADARZ_CACHE_DIR")
+    path = Path(cache_dir) if cache_dir else Path(__file__).parent.parent.parent / ".cache"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class SQLiteCache:
+    """
+    基于 SQLite 的持久化键值缓存，值以 zlib 压缩的 JSON 存储，支持 TTL 和容量上限淘汰
+
+    读取路径不写数据库：命中时只在内存中记录访问时间，攒够一批或超过刷新间隔后
+    再一次性写回 accessed_at；过期条目在读取时视为未命中，由写入时的淘汰统一删除
+    """
+
+    # 内存中最多积累的访问记录数，以及两次写回 accessed_at 的最长间隔（秒）
+    ACCESS_FLUSH_ENTRIES = 256
+    ACCESS_FLUSH_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Args:
+            path: SQLite 数据库文件路径
+            max_entries: 最大条目数（可选）
+            max_bytes: 压缩后的最大总字节数（可选）
+            ttl: 默认存活时间（秒），None 表示永不过期
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        # 尚未写回数据库的访问时间：key -> accessed_at
+        self._pending_access: Dict[str, float] = {}
+        self._last_flush = time.time()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """读取缓存，过期条目视为未命中（由下一次写入时的淘汰删除）"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._pending_access[key] = now
+            if (
+                len(self._pending_access) >= self.ACCESS_FLUSH_ENTRIES
+                or now - self._last_flush >= self.ACCESS_FLUSH_INTERVAL
+            ):
+                self._flush_access(now)
+                self._conn.commit()
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """写入缓存，超出容量上限时按最近访问时间淘汰"""
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + ttl if ttl else None, now),
+            )
+            self._pending_access.pop(key, None)
+            # 淘汰前写回访问时间，保证按最新的访问顺序淘汰
+            self._flush_access(now)
+            self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pending_access.pop(key, None)
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending_access.clear()
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def flush(self) -> None:
+        """把内存中积累的访问时间写回数据库"""
+        with self._lock:
+            self._flush_access(time.time())
+            self._conn.commit()
+
+    def _flush_access(self, now: float) -> None:
+        """批量写回访问时间（调用方需持有锁并负责提交）"""
+        if self._pending_access:
+            self._conn.executemany(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._pending_access.items()],
+            )
+            self._pending_access.clear()
+        self._last_flush = now
+
+    def _evict(self, now: float) -> None:
+        """删除过期条目，并按最近访问时间淘汰超出上限的条目（调用方需持有锁）"""
+        self._conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        if self.max_entries:
+            self._conn.execute(
+                """
+                DELETE FROM cache WHERE key IN (
+                    SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+        if self.max_bytes:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at ASC").fetchall()
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    total -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """返回命中统计和容量信息"""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -1,5 +1,5 @@
-from .github_client import GitHubClient
+from .github_client import GitHubClient, get_github_client
+from .async_github_client import AsyncGitHubClient
 from .project_service import ProjectService
 
-__all__ = ["GitHubClient", "ProjectService"]
-
+__all__ = ["GitHubClient", "AsyncGitHubClient", "ProjectService", "get_github_client"]
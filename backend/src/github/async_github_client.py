@@ -0,0 +1,705 @@
+import asyncio
+import copy
+import os
+import httpx
+from datetime import datetime, timedelta
+from typing import Any, List, Dict, Optional
+
+from ..cache import AsyncSingleFlight, make_flight_key
+from ..resilience import (
+    NO_RETRY,
+    CircuitOpenError,
+    DeadlineExceeded,
+    aretry_call,
+    current_deadline,
+    get_circuit_breaker,
+    is_server_error,
+)
+from .github_client import (
+    COMMIT_SHA_PATTERN,
+    GITHUB_RETRY_POLICY,
+    MAX_PER_PAGE,
+    MAX_SEARCH_RESULTS,
+    RAW_CHUNK_SIZE,
+    RAW_MEDIA_TYPE,
+    SHA_MEDIA_TYPE,
+    ContentBudget,
+    GitHubClient,
+    RawContent,
+    build_headers,
+    find_blob_sha,
+    format_code_search_items,
+    get_page_concurrency,
+    merge_trending_details,
+    parse_tree_response,
+    parse_trending_html,
+    plan_search_pages,
+)
+from .graphql import (
+    DEFAULT_BATCH_SIZE,
+    GRAPHQL_URL,
+    build_repositories_query,
+    parse_repositories_response,
+)
+from .rate_limiter import classify_request
+from .response_cache import ResponseCache, get_response_cache
+from .token_pool import TokenPool, get_token_pool
+from .tree_cache import get_blob_store, get_tree_cache
+
+
+# 合并相同的并发 GET 请求
+_http_flight = AsyncSingleFlight()
+
+# 进程内共享的 HTTP/2 连接池，所有 AsyncGitHubClient 实例复用同一组 keep-alive 连接
+_shared_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """
+    获取进程内共享的异步 HTTP 客户端（HTTP/2 + keep-alive 连接池）
+
+    连接池参数可通过环境变量配置：
+    - GITHUB_HTTP_MAX_CONNECTIONS: 最大连接数，默认 100
+    - GITHUB_HTTP_MAX_KEEPALIVE: 最大空闲 keep-alive 连接数，默认 20
+    - GITHUB_HTTP_KEEPALIVE_EXPIRY: 空闲连接保活时间（秒），默认 30
+    """
+    global _shared_http_client
+    if _shared_http_client is None or _shared_http_client.is_closed:
+        limits = httpx.Limits(
+            max_connections=int(os.getenv("GITHUB_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("GITHUB_HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("GITHUB_HTTP_KEEPALIVE_EXPIRY", "30")),
+        )
+        # HTTP/2 下同一连接可以多路复用多个请求，单个 worker 即可同时挂起大量 GitHub 调用
+        _shared_http_client = httpx.AsyncClient(
+            http2=True,
+            limits=limits,
+            timeout=httpx.Timeout(30.0, connect=10.0),
+        )
+    return _shared_http_client
+
+
+async def close_shared_http_client() -> None:
+    """关闭共享的异步 HTTP 客户端（应用关闭时调用）"""
+    global _shared_http_client
+    if _shared_http_client is not None and not _shared_http_client.is_closed:
+        await _shared_http_client.aclose()
+    _shared_http_client = None
+
+
+class AsyncGitHubClient:
+    """GitHubClient 的异步版本，方法与 GitHubClient 一一对应，用于 FastAPI 的 async 路由"""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        tokens: Optional[List[str]] = None,
+    ):
+        """
+        初始化异步 GitHub 客户端
+
+        Args:
+            token: GitHub Personal Access Token (可选，用于提高 API 限制)
+            cache: 条件请求缓存（可选，默认与同步客户端共享同一个 ResponseCache）
+            tokens: 多个 token 组成的 token 池（可选，提供时忽略 token 参数）
+        """
+        self.headers = build_headers()
+        self._cache = cache
+        # 与使用同一组 token 的同步客户端共享 token 池和限额调度器
+        self.token_pool: TokenPool = get_token_pool(tokens or [token])
+
+    # 纯数据转换，不涉及 IO，直接复用同步客户端的实现
+    get_repository_details = GitHubClient.get_repository_details
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """共享的 HTTP/2 客户端"""
+        return get_shared_http_client()
+
+    @property
+    def cache(self) -> ResponseCache:
+        """条件请求缓存"""
+        return self._cache or get_response_cache()
+
+    def get_rate_limit_budget(self, api_class: Optional[str] = None) -> Dict[str, Any]:
+        """获取当前 API 额度，含义同 GitHubClient.get_rate_limit_budget"""
+        return self.token_pool.budget(api_class)
+
+    async def _get_json(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = False,
+    ) -> Optional[Any]:
+        """发送 GET 请求并返回 JSON，相同的并发请求只发送一次，参数含义见 _request_json"""
+        key = make_flight_key(id(self.token_pool), "GET", url, params, timeout, use_cache)
+        try:
+            return await _http_flight.do(
+                key,
+                lambda: self._request_json("GET", url, params=params, timeout=timeout, use_cache=use_cache),
+            )
+        except DeadlineExceeded as e:
+            raise httpx.TimeoutException(str(e)) from e
+
+    async def _request_json(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        json_body: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = False,
+        idempotent: Optional[bool] = None,
+    ) -> Optional[Any]:
+        """
+        发送请求并返回 JSON；404 时返回 None，其余错误抛出 httpx.HTTPError
+
+        use_cache 为 True 时使用 ETag 条件请求缓存，304 响应直接复用缓存内容
+        （缓存的磁盘读写在线程中执行，不阻塞事件循环）；额度调度和限流重试见 _send
+        """
+        headers = dict(self.headers)
+        cache_key = None
+        cached = None
+        if use_cache:
+            cache_key = ResponseCache.make_key(url, params, headers.get("Accept"))
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            headers.update(ResponseCache.conditional_headers(cached))
+
+        response = await self._send(
+            method, url, headers, params=params, json_body=json_body, timeout=timeout, idempotent=idempotent
+        )
+        await response.aread()
+
+        if response.status_code == 304 and cached is not None:
+            self.cache.record_hit()
+            # 调用方可能会修改返回的 JSON，返回副本以免改动缓存中的内容
+            return copy.deepcopy(cached["body"])
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        data = response.json()
+
+        if use_cache:
+            self.cache.record_miss()
+            await asyncio.to_thread(
+                self.cache.store,
+                cache_key,
+                data,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return data
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        params: Optional[Dict] = None,
+        json_body: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        idempotent: Optional[bool] = None,
+    ) -> httpx.Response:
+        """
+        流式发送请求并处理额度调度和限流重试，返回最终的响应（不检查状态码）
+
+        请求路由到 token 池中剩余额度最多的 token，额度不足时排队等待，
+        限流响应会隔离该 token 并切换 token 或等待后重试；
+        返回的响应体尚未读取，调用方负责读取或关闭；idempotent 含义同 GitHubClient._send。
+        设置了请求截止时间时，排队等待和单次请求的超时都不超过剩余时间。
+
+        Raises:
+            httpx.TimeoutException: 请求截止时间已到
+        """
+        if idempotent is None:
+            idempotent = method in ("GET", "HEAD")
+        deadline = current_deadline()
+        api_class = classify_request(url)
+        max_retries = self.token_pool.max_retries
+
+        def request_timeout() -> Optional[float]:
+            """单次请求的超时：有截止时间时不超过剩余时间，否则使用调用方指定的超时"""
+            if deadline is not None:
+                return deadline.timeout(timeout if timeout is not None else self.http.timeout.read)
+            return timeout
+
+        for attempt in range(max_retries + 1):
+            max_wait = None
+            if deadline is not None:
+                try:
+                    max_wait = request_timeout()
+                except DeadlineExceeded as e:
+                    raise httpx.TimeoutException(str(e)) from e
+            token, limiter = self.token_pool.select(api_class)
+            if not await limiter.aacquire(api_class, max_wait):
+                raise httpx.HTTPError(f"GitHub {api_class} API 额度已耗尽，等待时间超过上限")
+            request_headers = {**build_headers(token), **headers}
+
+            def send_once():
+                # 每次重试都重新构建请求，超时按当时的剩余时间计算
+                kwargs = {"params": params, "json": json_body}
+                current_timeout = request_timeout()
+                if current_timeout is not None:
+                    kwargs["timeout"] = current_timeout
+                request = self.http.build_request(method, url, headers=request_headers, **kwargs)
+                return self.http.send(request, stream=True)
+
+            try:
+                # 连接失败、超时和 5xx 按退避策略重试（仅幂等请求），GitHub 持续故障时熔断
+                response = await aretry_call(
+                    send_once,
+                    policy=GITHUB_RETRY_POLICY if idempotent else NO_RETRY,
+                    breaker=get_circuit_breaker("github"),
+                    retry_if_result=lambda r: is_server_error(r.status_code),
+                    discard=lambda r: r.aclose(),
+                )
+            except CircuitOpenError as e:
+                raise httpx.HTTPError(str(e)) from e
+            except DeadlineExceeded as e:
+                raise httpx.TimeoutException(str(e)) from e
+            if response.status_code in (403, 429):
+                await response.aread()
+            retry_after = limiter.update(
+                api_class,
+                response.status_code,
+                response.headers,
+                response.text if response.status_code in (403, 429) else "",
+            )
+            retry_after = self.token_pool.report(
+                token, response.status_code, response.headers, retry_after
+            )
+            if retry_after is None or attempt == max_retries:
+                return response
+            await response.aclose()
+            if len(self.token_pool.tokens) > 1:
+                print(f"⏳ GitHub {api_class} API 触发限流，切换 token 重试")
+            else:
+                print(f"⏳ GitHub {api_class} API 触发限流，{retry_after:.0f}s 后重试")
+        return response
+
+    async def _get_raw(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        max_lines: Optional[int] = None,
+        accept: str = RAW_MEDIA_TYPE,
+        use_cache: bool = True,
+    ) -> Optional[RawContent]:
+        """以原始媒体类型读取文件内容，相同的并发请求只发送一次，参数含义见 GitHubClient._fetch_raw"""
+        key = make_flight_key(id(self.token_pool), accept, url, params, max_bytes, max_lines, timeout, use_cache)
+        try:
+            return await _http_flight.do(
+                key,
+                lambda: self._fetch_raw(url, params, timeout, max_bytes, max_lines, accept, use_cache),
+            )
+        except DeadlineExceeded as e:
+            raise httpx.TimeoutException(str(e)) from e
+
+    async def _fetch_raw(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        max_lines: Optional[int] = None,
+        accept: str = RAW_MEDIA_TYPE,
+        use_cache: bool = True,
+    ) -> Optional[RawContent]:
+        """以原始媒体类型流式读取文件内容，读取预算用完后立即停止下载，参数含义同 GitHubClient._fetch_raw"""
+        headers = {**self.headers, "Accept": accept}
+        cache_key = ResponseCache.make_key(url, params, accept)
+        cached = await asyncio.to_thread(self.cache.get, cache_key) if use_cache else None
+        headers.update(ResponseCache.conditional_headers(cached))
+
+        response = await self._send("GET", url, headers, params=params, timeout=timeout)
+        try:
+            if response.status_code == 304 and cached is not None:
+                self.cache.record_hit()
+                return ContentBudget.apply(cached["body"], max_bytes, max_lines)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+
+            budget = ContentBudget(max_bytes, max_lines)
+            async for chunk in response.aiter_bytes(RAW_CHUNK_SIZE):
+                if not budget.feed(chunk):
+                    break
+            content = budget.result()
+        finally:
+            await response.aclose()
+
+        if use_cache:
+            self.cache.record_miss()
+        if use_cache and not content.truncated:
+            await asyncio.to_thread(
+                self.cache.store,
+                cache_key,
+                content.text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return content
+
+    async def _paginate_search(
+        self, url: str, base_params: Dict, limit: int
+    ) -> List[Dict]:
+        """
+        获取分页的搜索结果：先请求第一页拿到 total_count，再在有限并发下同时请求剩余页面，
+        结果按页码顺序合并；单个后续页面失败只会丢失该页结果
+        """
+        actual_limit = min(limit, MAX_SEARCH_RESULTS)
+        if actual_limit <= 0:
+            return []
+        per_page = min(MAX_PER_PAGE, actual_limit)
+
+        first_page = await self._get_json(
+            url, params={**base_params, "per_page": per_page, "page": 1}
+        ) or {}
+        all_items = list(first_page.get("items", []))
+        pages = plan_search_pages(first_page.get("total_count", 0), actual_limit, per_page)
+
+        semaphore = asyncio.Semaphore(get_page_concurrency())
+
+        async def fetch_page(page: int) -> List[Dict]:
+            async with semaphore:
+                try:
+                    data = await self._get_json(
+                        url, params={**base_params, "per_page": per_page, "page": page}
+                    ) or {}
+                    return data.get("items", [])
+                except httpx.HTTPError as e:
+                    print(f"⚠️ 获取第 {page} 页搜索结果失败: {e}")
+                    return []
+
+        # gather 按传入顺序返回结果，保证合并后的顺序与页码一致
+        for items in await asyncio.gather(*(fetch_page(page) for page in pages)):
+            all_items.extend(items)
+
+        return all_items[:actual_limit]
+
+    async def get_new_repositories(
+        self,
+        days: int = 7,
+        min_stars: int = 10,
+        language: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Dict]:
+        """获取新项目，参数含义同 GitHubClient.get_new_repositories"""
+        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        query = f"created:>{start_date} stars:>={min_stars}"
+        if language:
+            query += f" language:{language}"
+
+        url = "https://api.github.com/search/repositories"
+        try:
+            return await self._paginate_search(url, {"q": query}, limit)
+        except httpx.HTTPError as e:
+            print(f"❌ 获取GitHub项目失败: {e}")
+            return []
+
+    async def crawl_new_repositories(
+        self,
+        days: int = 7,
+        min_stars: int = 10,
+        language: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        获取新项目的完整列表，不受单个搜索查询 1000 条结果的限制
+
+        按创建时间（必要时再按 star 数）递归切分查询，直到每个分片的结果数都不超过 1000，
+        然后并发爬取各分片并按 full_name 去重
+
+        Args:
+            days: 查询最近几天的项目
+            min_stars: 最小 star 数
+            language: 编程语言过滤（可选）
+            limit: 返回数量上限（可选），为 None 时返回全部
+        """
+        from .sharded_search import ShardedSearchCrawler, build_new_repositories_shard
+
+        try:
+            crawler = ShardedSearchCrawler(self)
+            return await crawler.crawl(
+                build_new_repositories_shard(days, min_stars, language), limit=limit
+            )
+        except httpx.HTTPError as e:
+            print(f"❌ 分片获取GitHub项目失败: {e}")
+            return []
+
+    async def get_trending_repositories(
+        self, since: str = "daily", limit: int = 25, enrich: bool = False
+    ) -> List[Dict]:
+        """从GitHub trending页面获取trending项目，参数含义同 GitHubClient.get_trending_repositories"""
+        try:
+            url = f"https://github.com/trending?since={since}"
+            res = await aretry_call(
+                lambda: self.http.get(url, timeout=10),
+                policy=GITHUB_RETRY_POLICY,
+                breaker=get_circuit_breaker("github"),
+                retry_if_result=lambda r: is_server_error(r.status_code),
+            )
+            res.raise_for_status()
+            repos = parse_trending_html(res.text, limit)
+            if not enrich:
+                return repos
+
+            details = await self.get_repositories_batch([r["full_name"] for r in repos])
+            return merge_trending_details(repos, details)
+        except Exception as e:
+            print(f"❌ 获取trending项目失败: {e}")
+            return []
+
+    async def get_repositories_batch(
+        self,
+        repo_names: List[str],
+        include_readme: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[Dict]:
+        """使用 GraphQL 批量获取多个仓库的详细信息，各批次并发请求，参数含义同 GitHubClient.get_repositories_batch"""
+        if not any(self.token_pool.tokens):
+            return await self._get_repositories_rest(repo_names, include_readme)
+
+        async def fetch_chunk(chunk: List[str]) -> List[Dict]:
+            try:
+                query = build_repositories_query(chunk, include_readme)
+                data = await self._request_json(
+                    "POST", GRAPHQL_URL, json_body={"query": query}, timeout=30, idempotent=True
+                )
+                if not data or data.get("data") is None:
+                    raise httpx.HTTPError(f"GraphQL 查询失败: {(data or {}).get('errors')}")
+                return [repo for repo in parse_repositories_response(data, len(chunk)) if repo]
+            except httpx.HTTPError as e:
+                print(f"⚠️ GraphQL 批量获取失败，回退到 REST: {e}")
+                return await self._get_repositories_rest(chunk, include_readme)
+
+        chunks = [repo_names[i:i + batch_size] for i in range(0, len(repo_names), batch_size)]
+        results = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+        return [repo for chunk_repos in results for repo in chunk_repos]
+
+    async def _get_repositories_rest(
+        self, repo_names: List[str], include_readme: bool = False
+    ) -> List[Dict]:
+        """通过 REST API 并发获取各仓库详细信息，保持输入顺序"""
+        async def fetch_repo(repo_name: str) -> Optional[Dict]:
+            try:
+                api_url = f"https://api.github.com/repos/{repo_name}"
+                repo = await self._get_json(api_url, timeout=5, use_cache=True)
+                if repo and include_readme:
+                    repo = {**repo, "readme": await self.get_repository_readme(repo_name)}
+                return repo
+            except Exception as e:
+                print(f"⚠️ 获取 {repo_name} 详情失败: {e}")
+                return None
+
+        results = await asyncio.gather(*(fetch_repo(name) for name in repo_names))
+        return [repo for repo in results if repo]
+
+    async def get_repository_readme(
+        self,
+        repo_name: str,
+        ref: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Optional[str]:
+        """获取指定仓库的 README 文本内容（原始媒体类型流式读取）；如果未找到则返回 None"""
+        if not repo_name:
+            return None
+
+        api_url = f"https://api.github.com/repos/{repo_name}/readme"
+        params = {"ref": ref} if ref else None
+
+        try:
+            content = await self._get_raw(api_url, params=params, timeout=10, max_bytes=max_bytes)
+            return content.text if content else None
+        except httpx.HTTPError as e:
+            print(f"❌ 获取 README 失败: {e}")
+            return None
+
+    async def search_repositories(
+        self,
+        query: str,
+        limit: int = 30,
+        sort: str = "stars",
+        order: str = "desc"
+    ) -> List[Dict]:
+        """搜索 GitHub 仓库，参数含义同 GitHubClient.search_repositories"""
+        url = "https://api.github.com/search/repositories"
+        try:
+            return await self._paginate_search(
+                url, {"q": query, "sort": sort, "order": order}, limit
+            )
+        except httpx.HTTPError as e:
+            print(f"❌ GitHub 搜索失败: {e}")
+            return []
+
+    async def resolve_commit_sha(
+        self, repo_full_name: str, ref: Optional[str] = None
+    ) -> Optional[str]:
+        """将分支名 / tag 解析为 commit SHA，最多一次请求，参数含义同 GitHubClient.resolve_commit_sha"""
+        if ref and COMMIT_SHA_PATTERN.fullmatch(ref):
+            return ref
+
+        url = f"https://api.github.com/repos/{repo_full_name}/commits/{ref or 'HEAD'}"
+        content = await self._get_raw(url, timeout=10, accept=SHA_MEDIA_TYPE)
+        return content.text.strip() if content else None
+
+    async def get_repo_structure(
+        self, repo_full_name: str, branch: Optional[str] = None
+    ) -> Optional[List[Dict]]:
+        """使用 GitHub Git Trees API 递归获取整个仓库的文件列表（按 commit SHA 缓存）；失败时返回 None"""
+        if not repo_full_name:
+            return None
+
+        # 首先获取分支的 commit SHA，branch 为空时使用默认分支
+        try:
+            commit_sha = await self.resolve_commit_sha(repo_full_name, branch)
+            if commit_sha is None:
+                return None
+        except httpx.HTTPError as e:
+            print(f"❌ 获取分支信息失败 {repo_full_name}: {e}")
+            return None
+
+        try:
+            tree = await self._get_tree(repo_full_name, commit_sha, allow_truncated=True)
+        except httpx.HTTPError as e:
+            print(f"❌ 获取仓库结构失败 {repo_full_name}: {e}")
+            return None
+        if tree is None:
+            return None
+
+        # 只保留必要字段（path、type、size），减少 token 占用
+        return [
+            {"path": item["path"], "type": item["type"], "size": item["size"]}
+            for item in tree
+        ]
+
+    async def _get_tree(
+        self, repo_full_name: str, commit_sha: str, allow_truncated: bool = False
+    ) -> Optional[List[Dict]]:
+        """
+        获取 commit 的递归文件树（按 commit SHA 缓存，只缓存完整的文件树），参数含义同 GitHubClient._get_tree
+
+        Returns:
+            文件列表，含 blob SHA；文件树不存在（或被截断且 allow_truncated 为 False）时返回 None，
+            请求失败时抛出 httpx.HTTPError
+        """
+        tree_cache = get_tree_cache()
+        tree = await asyncio.to_thread(tree_cache.get, repo_full_name, commit_sha)
+        if tree is not None:
+            return tree
+
+        tree_url = f"https://api.github.com/repos/{repo_full_name}/git/trees/{commit_sha}"
+        parsed = parse_tree_response(await self._get_json(tree_url, params={"recursive": "1"}, timeout=30))
+        if parsed is None:
+            return None
+        tree, complete = parsed
+        if not complete:
+            print(f"⚠️ 文件树过大被 GitHub 截断，不写入缓存: {repo_full_name}@{commit_sha[:7]}")
+            return tree if allow_truncated else None
+        await asyncio.to_thread(tree_cache.set, repo_full_name, commit_sha, tree)
+        return tree
+
+    async def get_file_content(
+        self,
+        repo_full_name: str,
+        file_path: str,
+        ref: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_lines: Optional[int] = None,
+    ) -> Optional[str]:
+        """使用 GitHub Contents API 读取指定文件的内容；未找到或失败时返回 None"""
+        content = await self.read_file(repo_full_name, file_path, ref, max_bytes, max_lines)
+        return content.text if content else None
+
+    async def read_file(
+        self,
+        repo_full_name: str,
+        file_path: str,
+        ref: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_lines: Optional[int] = None,
+    ) -> Optional[RawContent]:
+        """流式读取文件内容，文件树已缓存时优先从本地 BlobStore 按 blob SHA 读取，参数含义同 GitHubClient.read_file"""
+        if not repo_full_name or not file_path:
+            return None
+        file_path = file_path.strip("/")
+
+        try:
+            content = await self._read_blob(repo_full_name, file_path, ref, max_bytes, max_lines)
+            if content is not None:
+                return content
+
+            api_url = f"https://api.github.com/repos/{repo_full_name}/contents/{file_path}"
+            params = {"ref": ref} if ref else None
+            return await self._get_raw(
+                api_url, params=params, timeout=10, max_bytes=max_bytes, max_lines=max_lines
+            )
+        except httpx.HTTPError as e:
+            print(f"❌ 获取文件内容失败 {repo_full_name}/{file_path}: {e}")
+            return None
+
+    async def _read_blob(
+        self,
+        repo_full_name: str,
+        file_path: str,
+        ref: Optional[str],
+        max_bytes: Optional[int],
+        max_lines: Optional[int],
+    ) -> Optional[RawContent]:
+        """按 blob SHA 读取文件内容；文件树未缓存或路径不在文件树中时返回 None"""
+        # 没有缓存过该仓库的文件树时，解析 commit SHA 只会多一次请求，直接回退到 Contents API
+        if not get_tree_cache().has_repo(repo_full_name):
+            return None
+        commit_sha = await self.resolve_commit_sha(repo_full_name, ref)
+        if commit_sha is None:
+            return None
+        # 只读取一个文件时不下载整棵文件树，只使用已缓存的完整文件树
+        tree = await asyncio.to_thread(get_tree_cache().get, repo_full_name, commit_sha)
+        blob_sha = find_blob_sha(tree, file_path) if tree is not None else None
+        if blob_sha is None:
+            return None
+
+        blob_store = get_blob_store()
+        text = await asyncio.to_thread(blob_store.get, blob_sha)
+        if text is not None:
+            return ContentBudget.apply(text, max_bytes, max_lines)
+
+        blob_url = f"https://api.github.com/repos/{repo_full_name}/git/blobs/{blob_sha}"
+        content = await self._get_raw(
+            blob_url, timeout=10, max_bytes=max_bytes, max_lines=max_lines, use_cache=False
+        )
+        if content is not None and not content.truncated:
+            await asyncio.to_thread(blob_store.put, blob_sha, content.text)
+        return content
+
+    async def search_code_in_repo(
+        self,
+        repo_full_name: str,
+        keywords: str,
+        limit: int = 10
+    ) -> List[Dict]:
+        """在指定仓库内搜索代码，参数含义同 GitHubClient.search_code_in_repo"""
+        if not repo_full_name or not keywords:
+            return []
+
+        url = "https://api.github.com/search/code"
+        actual_limit = min(limit, 100)
+
+        # 构建搜索查询：keywords + repo:owner/repo
+        params = {
+            "q": f"{keywords} repo:{repo_full_name}",
+            "per_page": actual_limit,
+        }
+
+        try:
+            data = await self._get_json(url, params=params, timeout=10) or {}
+            return format_code_search_items(
+                data.get("items", []), repo_full_name, actual_limit
+            )
+        except httpx.HTTPError as e:
+            print(f"❌ 代码搜索失败 {repo_full_name}: {e}")
+            return []
@@ -0,0 +1,293 @@
+"""
+本地代码搜索：下载一次仓库 tarball，在内存中建立三元组（trigram）倒排索引，
+代码搜索和文件读取都在本地完成，不受 GitHub 代码搜索约 10 次/分钟的限额约束
+"""
+
+import os
+import sys
+import tarfile
+import threading
+from array import array
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+import requests
+import urllib3
+
+from ..cache import LRUCache, git_blob_sha
+from ..resilience import DeadlineExceeded, current_deadline
+from .tree_cache import get_blob_store
+
+if TYPE_CHECKING:
+    from .github_client import GitHubClient
+
+
+# 超过该大小的文件不建立索引（通常是生成文件、数据文件）
+MAX_INDEXED_FILE_BYTES = 256 * 1024
+
+# 判断二进制文件时检查的前缀长度
+BINARY_SNIFF_BYTES = 8 * 1024
+
+# 倒排索引中每个 trigram 键的内存开销估计（字符串对象 + dict 槽位），用于计算索引大小
+POSTING_KEY_BYTES = 120
+
+
+def is_code_index_enabled() -> bool:
+    """是否启用本地代码索引，通过环境变量 GITHUB_CODE_INDEX 配置，默认 false"""
+    return os.getenv("GITHUB_CODE_INDEX", "false").lower() == "true"
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class RepoCodeIndex:
+    """单个 commit 的代码索引：文件内容 + trigram 倒排索引"""
+
+    def __init__(self, repo_full_name: str, commit_sha: str, files: Dict[str, str]):
+        """
+        Args:
+            repo_full_name: 仓库全名，格式 "owner/repo"
+            commit_sha: 索引对应的 commit SHA
+            files: 文件路径 -> 文件内容
+        """
+        self.repo_full_name = repo_full_name
+        self.commit_sha = commit_sha
+        self.paths = list(files)
+        self.files = files
+        self._lowered = [files[path].lower() for path in self.paths]
+        postings: Dict[str, Set[int]] = {}
+        for file_id, text in enumerate(self._lowered):
+            for trigram in _trigrams(text):
+                postings.setdefault(trigram, set()).add(file_id)
+        # 建立完成后把文件 ID 集合压缩为有序数组，内存占用远小于 Set[int]
+        self._postings: Dict[str, array] = {
+            trigram: array("I", sorted(file_ids)) for trigram, file_ids in postings.items()
+        }
+        # 索引大小 = 原文和小写副本 + 倒排索引（数组本身和每个 trigram 键的开销）
+        self.size = (
+            sum(len(text) for text in self._lowered) * 2
+            + sum(sys.getsizeof(file_ids) for file_ids in self._postings.values())
+            + len(self._postings) * POSTING_KEY_BYTES
+        )
+
+    def _candidates(self, term: str) -> Set[int]:
+        """通过倒排索引找出可能包含 term 的文件（短于 3 个字符的词需要全量扫描）"""
+        if len(term) < 3:
+            return set(range(len(self.paths)))
+        candidates: Optional[Set[int]] = None
+        # 从最稀有的 trigram 开始求交集
+        for trigram in sorted(_trigrams(term), key=lambda t: len(self._postings.get(t, ()))):
+            postings = self._postings.get(trigram)
+            if not postings:
+                return set()
+            candidates = set(postings) if candidates is None else candidates.intersection(postings)
+            if not candidates:
+                break
+        return candidates or set()
+
+    def search(self, keywords: str, limit: int = 10) -> List[Dict]:
+        """
+        搜索同时包含所有关键词（不区分大小写）的文件
+
+        Args:
+            keywords: 以空格分隔的关键词
+            limit: 返回结果数量限制
+
+        Returns:
+            与 format_code_search_items 一致的结果列表，按匹配次数降序
+        """
+        terms = [term.lower() for term in keywords.split() if term]
+        if not terms:
+            return []
+
+        file_ids: Optional[Set[int]] = None
+        for term in terms:
+            candidates = self._candidates(term)
+            file_ids = candidates if file_ids is None else file_ids & candidates
+        scored = []
+        for file_id in file_ids or ():
+            text = self._lowered[file_id]
+            path = self.paths[file_id].lower()
+            counts = [text.count(term) + (5 if term in path else 0) for term in terms]
+            if all(counts):
+                scored.append((sum(counts), file_id))
+
+        scored.sort(key=lambda item: (-item[0], self.paths[item[1]]))
+        return [
+            {
+                "path": self.paths[file_id],
+                "name": self.paths[file_id].rsplit("/", 1)[-1],
+                "url": f"https://github.com/{self.repo_full_name}/blob/{self.commit_sha}/{self.paths[file_id]}",
+                "repository": self.repo_full_name,
+                "score": score,
+            }
+            for score, file_id in scored[:limit]
+        ]
+
+    def get_file(self, file_path: str) -> Optional[str]:
+        """读取文件内容；文件不存在或未被索引（二进制、过大）时返回 None"""
+        return self.files.get(file_path.strip("/"))
+
+
+def build_repo_code_index(
+    client: "GitHubClient",
+    repo_full_name: str,
+    commit_sha: str,
+    max_total_bytes: int,
+) -> RepoCodeIndex:
+    """
+    流式下载并解压仓库 tarball，建立代码索引
+
+    文本文件同时按 git blob SHA 写入 BlobStore，之后的 get_file_content 也可以直接复用
+
+    Args:
+        client: 同步 GitHub 客户端（复用 token 池和限额调度）
+        repo_full_name: 仓库全名
+        commit_sha: commit SHA
+        max_total_bytes: 最多索引的文件总字节数，超出后停止读取
+
+    Raises:
+        requests.RequestException: 请求失败
+        urllib3.exceptions.HTTPError / OSError / EOFError / tarfile.TarError: 下载中途断开、超时或数据损坏
+        DeadlineExceeded: 下载过程中请求截止时间已到（tarball 中的每个成员都会检查一次）
+    """
+    response = client.open_repo_tarball(repo_full_name, commit_sha)
+    deadline = current_deadline()
+    blob_store = get_blob_store()
+    files: Dict[str, str] = {}
+    total_bytes = 0
+    with response:
+        # 流式模式（r|gz）边下载边解压，不需要把整个 tarball 写入磁盘
+        with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+            for member in archive:
+                # 单次读取的超时只限制一次 socket 读取，下载总时长需要单独对照截止时间
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceeded(f"下载 {repo_full_name} tarball 时请求截止时间已到")
+                if not member.isfile() or member.size > MAX_INDEXED_FILE_BYTES:
+                    continue
+                if total_bytes + member.size > max_total_bytes:
+                    print(f"⚠️ {repo_full_name} 超过索引上限，只索引了部分文件")
+                    break
+                extracted = archive.extractfile(member)
+                if extracted is None:
+                    continue
+                data = extracted.read()
+                if b"\0" in data[:BINARY_SNIFF_BYTES]:
+                    continue
+                try:
+                    text = data.decode("utf-8")
+                except UnicodeDecodeError:
+                    continue
+                # tarball 中的路径带有 "owner-repo-sha/" 前缀
+                path = member.name.split("/", 1)[-1]
+                files[path] = text
+                total_bytes += member.size
+                blob_store.put(git_blob_sha(data), text)
+
+    print(f"🗂️ 已为 {repo_full_name}@{commit_sha[:7]} 建立本地代码索引（{len(files)} 个文件）")
+    return RepoCodeIndex(repo_full_name, commit_sha, files)
+
+
+# 从 response.raw 流式读取 tarball 时，网络错误以 urllib3 / socket 异常的形式抛出，
+# 不会被包装为 requests 的异常
+BUILD_ERRORS = (
+    requests.exceptions.RequestException,
+    urllib3.exceptions.HTTPError,
+    OSError,
+    EOFError,
+    tarfile.TarError,
+)
+
+
+class _BuildLock:
+    """同一仓库建立索引的锁，记录持有和等待它的调用者数量，最后一个调用者离开时才移除"""
+
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+_indexes: Optional[LRUCache] = None
+# 最近建立失败的仓库，短时间内不再重复下载 tarball，直接回退到 GitHub API
+_failed_builds: Optional[LRUCache] = None
+_build_locks: Dict[str, _BuildLock] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_repo_code_index(
+    client: "GitHubClient", repo_full_name: str, ref: Optional[str] = None
+) -> Optional[RepoCodeIndex]:
+    """
+    获取仓库的本地代码索引，不存在时下载 tarball 建立（同一仓库并发调用只建立一次）
+
+    可通过环境变量配置：
+    - GITHUB_CODE_INDEX: 是否启用，默认 false；未启用时返回 None
+    - GITHUB_CODE_INDEX_MAX_MB: 单个仓库最多索引的文件总大小（MB），默认 32
+    - GITHUB_CODE_INDEX_CACHE_MB: 内存中保留的索引总大小（MB），默认 512
+    - GITHUB_CODE_INDEX_FAILURE_TTL: 建立失败后多久内不再重试（秒），默认 60
+
+    Returns:
+        RepoCodeIndex；未启用或建立失败时返回 None（调用方回退到 GitHub API）
+    """
+    global _indexes, _failed_builds
+    if not is_code_index_enabled() or not repo_full_name:
+        return None
+
+    try:
+        commit_sha = client.resolve_commit_sha(repo_full_name, ref)
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ 解析 {repo_full_name} 的 commit 失败: {e}")
+        return None
+    if commit_sha is None:
+        return None
+
+    key = f"{repo_full_name.lower()}@{commit_sha}"
+    with _indexes_lock:
+        if _indexes is None:
+            _indexes = LRUCache(
+                max_entries=64,
+                max_bytes=int(float(os.getenv("GITHUB_CODE_INDEX_CACHE_MB", "512")) * 1024 * 1024),
+                sizeof=lambda index: index.size,
+            )
+            _failed_builds = LRUCache(
+                max_entries=256, ttl=float(os.getenv("GITHUB_CODE_INDEX_FAILURE_TTL", "60"))
+            )
+        if _failed_builds.get(key) is not None:
+            return None
+        build_lock = _build_locks.get(key)
+        if build_lock is None:
+            build_lock = _build_locks[key] = _BuildLock()
+        build_lock.users += 1
+
+    try:
+        with build_lock.lock:
+            index = _indexes.get(key)
+            if index is None:
+                # 等待锁期间其他线程可能已经建立失败
+                if _failed_builds.get(key) is not None:
+                    return None
+                try:
+                    index = build_repo_code_index(
+                        client,
+                        repo_full_name,
+                        commit_sha,
+                        max_total_bytes=int(float(os.getenv("GITHUB_CODE_INDEX_MAX_MB", "32")) * 1024 * 1024),
+                    )
+                except DeadlineExceeded as e:
+                    # 只是本次请求的时间用完了，不记为建立失败，之后的请求仍可重新建立
+                    print(f"⚠️ 建立 {repo_full_name} 本地代码索引超时: {e}")
+                    return None
+                except BUILD_ERRORS as e:
+                    print(f"⚠️ 建立 {repo_full_name} 本地代码索引失败: {e}")
+                    _failed_builds.set(key, True)
+                    return None
+                _indexes.set(key, index)
+        return index
+    finally:
+        with _indexes_lock:
+            # 还有调用者在等待这把锁时不能移除，否则之后到达的调用者会拿到新锁并重复建立
+            build_lock.users -= 1
+            if build_lock.users == 0:
+                _build_locks.pop(key, None)
@@ -1,29 +1,625 @@
+import copy
+import math
+import os
+import re
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+from typing import Any, List, Dict, NamedTuple, Optional, Tuple
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from ..cache import SingleFlight, make_flight_key
+from ..resilience import (
+    NO_RETRY,
+    CircuitOpenError,
+    DeadlineExceeded,
+    RetryPolicy,
+    current_deadline,
+    deadline_scope,
+    get_circuit_breaker,
+    is_server_error,
+    remaining_timeout,
+    retry_call,
+)
+from .graphql import (
+    DEFAULT_BATCH_SIZE,
+    GRAPHQL_URL,
+    build_repositories_query,
+    parse_repositories_response,
+)
+from .rate_limiter import classify_request
+from .response_cache import ResponseCache, get_response_cache
+from .token_pool import TokenPool, get_token_pool, load_github_tokens
+from .session_pool import get_shared_session
+from .tree_cache import get_blob_store, get_tree_cache
+
+
+def build_headers(token: Optional[str] = None) -> Dict[str, str]:
+    """构建 GitHub REST API 请求头"""
+    # https://docs.github.com/en/rest/using-the-rest-api/getting-started-with-the-rest-api
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+
+    # 如果提供了 token，使用 Bearer 认证
+    # https://docs.github.com/en/rest/authentication/authenticating-to-the-rest-api
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+# GitHub 暂时性故障（连接失败、超时、5xx）的重试策略
+GITHUB_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=4.0)
+
+
+# 合并相同的并发 GET 请求（多个线程同时请求同一资源时只发送一次）
+_http_flight = SingleFlight()
+
+
+# GitHub 搜索 API 限制：per_page 最大 100，总结果最多 1000
+MAX_PER_PAGE = 100
+MAX_SEARCH_RESULTS = 1000
+
+
+def get_page_concurrency() -> int:
+    """搜索结果翻页的最大并发数，可通过环境变量 GITHUB_PAGE_CONCURRENCY 配置，默认 4"""
+    return max(1, int(os.getenv("GITHUB_PAGE_CONCURRENCY", "4")))
+
+
+def plan_search_pages(total_count: int, limit: int, per_page: int) -> List[int]:
+    """
+    根据第一页返回的 total_count 计算还需要请求的页码（不含第一页）
+    
+    Args:
+        total_count: 搜索结果总数
+        limit: 需要的结果数量
+        per_page: 每页数量
+    """
+    wanted = min(total_count, limit, MAX_SEARCH_RESULTS)
+    last_page = min(math.ceil(wanted / per_page), MAX_SEARCH_RESULTS // per_page)
+    return list(range(2, last_page + 1))
+
+
+# Contents API 的原始内容媒体类型：直接返回文件字节，省去 JSON 包装和 base64 编码（约 1/3 体积）
+RAW_MEDIA_TYPE = "application/vnd.github.raw+json"
+
+# commits API 的 sha 媒体类型：只返回 commit SHA 文本
+SHA_MEDIA_TYPE = "application/vnd.github.sha"
+
+COMMIT_SHA_PATTERN = re.compile(r"[0-9a-f]{40}")
+
+# 流式读取原始内容时每次读取的字节数
+RAW_CHUNK_SIZE = 16 * 1024
+
+
+class RawContent(NamedTuple):
+    """原始文件内容；truncated 表示读取预算用完，内容不完整"""
+
+    text: str
+    truncated: bool = False
+
+
+class ContentBudget:
+    """流式读取文件时的字节数 / 行数预算，预算用完后调用方停止读取剩余内容"""
+
+    def __init__(self, max_bytes: Optional[int] = None, max_lines: Optional[int] = None):
+        """
+        Args:
+            max_bytes: 最多读取的字节数（None 表示不限制）
+            max_lines: 最多读取的行数（None 表示不限制）
+        """
+        self.max_bytes = max_bytes
+        self.max_lines = max_lines
+        self.truncated = False
+        self._buffer = bytearray()
+        self._lines = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        """追加一块数据，返回是否还需要继续读取"""
+        if not chunk:
+            return not self.truncated
+        if self.max_lines is not None and self._lines >= self.max_lines:
+            # 行数已满，还有后续数据说明内容被截断
+            self.truncated = True
+            return False
+
+        if self.max_lines is not None:
+            start = 0
+            while True:
+                newline = chunk.find(b"\n", start)
+                if newline == -1:
+                    break
+                self._lines += 1
+                if self._lines >= self.max_lines:
+                    self.truncated = newline + 1 < len(chunk)
+                    chunk = chunk[:newline]
+                    break
+                start = newline + 1
+
+        self._buffer.extend(chunk)
+        if self.max_bytes is not None and len(self._buffer) > self.max_bytes:
+            del self._buffer[self.max_bytes:]
+            self.truncated = True
+        return not self.truncated
+
+    def result(self) -> RawContent:
+        # 按字节截断可能切开多字节字符，忽略不完整的字符
+        return RawContent(bytes(self._buffer).decode("utf-8", errors="ignore"), self.truncated)
+
+    @classmethod
+    def apply(
+        cls, text: str, max_bytes: Optional[int] = None, max_lines: Optional[int] = None
+    ) -> RawContent:
+        """对已完整读取的文本应用同样的预算"""
+        budget = cls(max_bytes, max_lines)
+        budget.feed(text.encode("utf-8"))
+        return budget.result()
+
+
+def _make_soup(html_text: str) -> BeautifulSoup:
+    """使用 lxml 解析 HTML（比 html.parser 快数倍），未安装时回退到 html.parser"""
+    try:
+        return BeautifulSoup(html_text, "lxml")
+    except FeatureNotFound:
+        return BeautifulSoup(html_text, "html.parser")
+
+
+def _parse_count(text: Optional[str]) -> int:
+    """解析 trending 页面中的数字，如 "12,345" / "1,024 stars today" """
+    match = re.search(r"[\d,]+", text or "")
+    return int(match.group().replace(",", "")) if match else 0
+
+
+def parse_trending_html(html_text: str, limit: int) -> List[Dict]:
+    """
+    从 trending 页面 HTML 中提取完整的项目卡片信息，无需再请求 REST API
+
+    Args:
+        html_text: trending 页面 HTML
+        limit: 返回项目数量限制
+
+    Returns:
+        与 REST API 字段一致的仓库信息列表（仅包含页面上可见的字段），
+        额外包含 "stars_today"（统计周期内新增的 star 数）
+    """
+    soup = _make_soup(html_text)
+    repos = []
+    for card in soup.select("article.Box-row")[:limit]:
+        a_tag = card.select_one("h2 a")
+        if not a_tag:
+            continue
+        full_name = a_tag.get("href", "").strip().strip("/")
+        owner, _, name = full_name.partition("/")
+
+        description = card.select_one("p")
+        language = card.select_one('[itemprop="programmingLanguage"]')
+        stars = card.select_one('a[href$="/stargazers"]')
+        forks = card.select_one('a[href$="/forks"]')
+        stars_today = card.select_one("span.float-sm-right")
+
+        repos.append({
+            "full_name": full_name,
+            "name": name,
+            "owner": {"login": owner},
+            "html_url": f"https://github.com/{full_name}",
+            "description": description.get_text(strip=True) if description else None,
+            "language": language.get_text(strip=True) if language else None,
+            "stargazers_count": _parse_count(stars.get_text() if stars else None),
+            "forks_count": _parse_count(forks.get_text() if forks else None),
+            "stars_today": _parse_count(stars_today.get_text() if stars_today else None),
+            "topics": [],
+        })
+    return repos
+
+
+def parse_tree_response(tree_data: Any) -> Optional[Tuple[List[Dict], bool]]:
+    """
+    解析 Git Trees API 的响应
+
+    Returns:
+        (文件列表, 是否完整)，文件列表每项包含 path, type, size, sha；
+        响应不是有效的文件树（如 404、空响应）时返回 None
+    """
+    if not isinstance(tree_data, dict) or not isinstance(tree_data.get("tree"), list):
+        return None
+    tree = [
+        {
+            "path": item.get("path", ""),
+            "type": item.get("type", ""),
+            "size": item.get("size", 0),
+            "sha": item.get("sha"),  # blob SHA，用于内容寻址读取文件
+        }
+        for item in tree_data["tree"]
+    ]
+    # 文件数过多时 GitHub 只返回部分文件树，并设置 truncated
+    return tree, not tree_data.get("truncated", False)
+
+
+def find_blob_sha(tree: List[Dict], file_path: str) -> Optional[str]:
+    """在文件树中查找文件对应的 blob SHA"""
+    for item in tree:
+        if item["path"] == file_path and item["type"] == "blob":
+            return item.get("sha")
+    return None
+
+
+def merge_trending_details(cards: List[Dict], details: List[Dict]) -> List[Dict]:
+    """用 API 返回的仓库详情补全 trending 卡片，保留卡片顺序和 stars_today；API 未返回的仓库保留卡片数据"""
+    by_name = {repo["full_name"].lower(): repo for repo in details}
+    return [
+        {**card, **by_name.get(card["full_name"].lower(), {}), "stars_today": card["stars_today"]}
+        for card in cards
+    ]
+
+
+def format_code_search_items(
+    items: List[Dict], repo_full_name: str, limit: int
+) -> List[Dict]:
+    """格式化代码搜索结果，提取关键信息"""
+    # 注意：GitHub Code Search API 返回的 items 中，repository 可能是简化的对象
+    results = []
+    for item in items[:limit]:
+        # 处理 repository 字段（可能是对象或字符串）
+        repo_info = item.get("repository", {})
+        if isinstance(repo_info, dict):
+            repo_full = repo_info.get("full_name", repo_full_name)
+        else:
+            repo_full = repo_full_name
+
+        results.append({
+            "path": item.get("path", ""),
+            "name": item.get("name", ""),
+            "url": item.get("html_url", ""),
+            "repository": repo_full,
+            "score": item.get("score", 0),
+        })
+    return results
 
 
 class GitHubClient:
     """GitHub API 客户端，用于获取 trending 项目和其他 GitHub 数据"""
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        cache: Optional[ResponseCache] = None,
+        tokens: Optional[List[str]] = None,
+    ):
         """
         初始化 GitHub 客户端
         
         Args:
             token: GitHub Personal Access Token (可选，用于提高 API 限制)
+            session: 自定义 requests.Session（可选，默认使用进程内共享的连接池）
+            cache: 条件请求缓存（可选，默认使用进程内共享的 ResponseCache）
+            tokens: 多个 token 组成的 token 池（可选，提供时忽略 token 参数），
+                请求会路由到剩余额度最多的 token
         """
-        # https://docs.github.com/en/rest/using-the-rest-api/getting-started-with-the-rest-api
-        self.headers = {
-            "Accept": "application/vnd.github+json",
-            "X-GitHub-Api-Version": "2022-11-28",
-        }
+        # 认证头按请求从 token 池中选择后再添加
+        self.headers = build_headers()
+        self._session = session
+        self._cache = cache
+        self.token_pool: TokenPool = get_token_pool(tokens or [token])
+
+    @property
+    def session(self) -> requests.Session:
+        """发送请求使用的 Session，默认复用进程内共享的连接池"""
+        return self._session or get_shared_session()
+
+    @property
+    def cache(self) -> ResponseCache:
+        """条件请求缓存，默认复用进程内共享的 ResponseCache"""
+        return self._cache or get_response_cache()
+
+    def get_rate_limit_budget(self, api_class: Optional[str] = None) -> Dict[str, Any]:
+        """
+        获取当前 API 额度，供调用方在额度紧张时降级
+        
+        Args:
+            api_class: "core" / "search" / "code_search" / "graphql"，为 None 时返回全部
+        
+        Returns:
+            token 池中所有 token 的额度汇总
+        """
+        return self.token_pool.budget(api_class)
+
+    def _get_json(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = False,
+    ) -> Optional[Any]:
+        """
+        发送 GET 请求并返回解析后的 JSON，参数含义见 _request_json
+
+        相同的并发 GET 请求（同一组 token、URL、参数、超时和缓存选项）只发送一次，
+        其余调用者等待并得到结果的副本，等待不超过请求剩余时间（见 SingleFlight）
+        """
+        key = make_flight_key(id(self.token_pool), "GET", url, params, timeout, use_cache)
+        try:
+            return _http_flight.do(
+                key,
+                lambda: self._request_json("GET", url, params=params, timeout=timeout, use_cache=use_cache),
+            )
+        except DeadlineExceeded as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+
+    def _request_json(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        json_body: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = False,
+        idempotent: Optional[bool] = None,
+    ) -> Optional[Any]:
+        """
+        发送请求并返回解析后的 JSON
+        
+        Args:
+            method: HTTP 方法
+            url: 请求地址
+            params: 查询参数
+            json_body: JSON 请求体（用于 GraphQL 等 POST 请求）
+            timeout: 超时时间（秒）
+            use_cache: 是否使用 ETag 条件请求缓存（304 响应不消耗 API 限额，仅适用于 GET）
+            idempotent: 是否可以安全重试，默认只有 GET 请求可以重试（GraphQL 查询也可以）
+        
+        Returns:
+            JSON 数据；404 时返回 None，其余错误抛出 requests.RequestException
+        
+        额度调度和限流重试见 _send
+        """
+        headers = dict(self.headers)
+        cache_key = None
+        cached = None
+        if use_cache:
+            cache_key = ResponseCache.make_key(url, params, headers.get("Accept"))
+            cached = self.cache.get(cache_key)
+            headers.update(ResponseCache.conditional_headers(cached))
+
+        response = self._send(
+            method, url, headers, params=params, json_body=json_body, timeout=timeout, idempotent=idempotent
+        )
+
+        if response.status_code == 304 and cached is not None:
+            self.cache.record_hit()
+            # 调用方可能会修改返回的 JSON，返回副本以免改动缓存中的内容
+            return copy.deepcopy(cached["body"])
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        data = response.json()
+
+        if use_cache:
+            self.cache.record_miss()
+            self.cache.store(
+                cache_key,
+                data,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return data
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        params: Optional[Dict] = None,
+        json_body: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+        idempotent: Optional[bool] = None,
+    ) -> requests.Response:
+        """
+        发送请求并处理额度调度和限流重试，返回最终的响应（不检查状态码）
+
+        请求前从 token 池中选择该 API 类别剩余额度最多的 token，并向其限额调度器
+        预约额度，额度不足时排队等待；收到限流响应时隔离该 token，切换到其他
+        token 或按 Retry-After / X-RateLimit-Reset 等待后重试。
+        设置了请求截止时间时，排队等待和单次请求的超时都不超过剩余时间。
+
+        Args:
+            headers: 请求头（Authorization 由所选 token 决定）
+            timeout: 超时时间（秒），会被截断到请求剩余时间
+            stream: 是否流式读取响应体（调用方负责关闭响应）
+            idempotent: 是否可以安全重试，默认只有 GET / HEAD 请求可以重试
+
+        Raises:
+            requests.exceptions.Timeout: 请求截止时间已到
+        """
+        if idempotent is None:
+            idempotent = method in ("GET", "HEAD")
+        api_class = classify_request(url)
+        max_retries = self.token_pool.max_retries
+        for attempt in range(max_retries + 1):
+            try:
+                request_timeout = remaining_timeout(timeout)
+            except DeadlineExceeded as e:
+                raise requests.exceptions.Timeout(str(e)) from e
+            token, limiter = self.token_pool.select(api_class)
+            max_wait = request_timeout if current_deadline() is not None else None
+            if not limiter.acquire(api_class, max_wait):
+                raise requests.exceptions.RequestException(
+                    f"GitHub {api_class} API 额度已耗尽，等待时间超过上限"
+                )
+            request_headers = {**build_headers(token), **headers}
+            try:
+                # 连接失败、超时和 5xx 按退避策略重试（仅幂等请求），GitHub 持续故障时熔断
+                response = retry_call(
+                    lambda: self.session.request(
+                        method,
+                        url,
+                        params=params,
+                        json=json_body,
+                        headers=request_headers,
+                        timeout=remaining_timeout(timeout),
+                        stream=stream,
+                    ),
+                    policy=GITHUB_RETRY_POLICY if idempotent else NO_RETRY,
+                    breaker=get_circuit_breaker("github"),
+                    retry_if_result=lambda r: is_server_error(r.status_code),
+                    discard=lambda r: r.close(),
+                )
+            except CircuitOpenError as e:
+                raise requests.exceptions.ConnectionError(str(e)) from e
+            except DeadlineExceeded as e:
+                raise requests.exceptions.Timeout(str(e)) from e
+            retry_after = limiter.update(
+                api_class,
+                response.status_code,
+                response.headers,
+                response.text if response.status_code in (403, 429) else "",
+            )
+            retry_after = self.token_pool.report(
+                token, response.status_code, response.headers, retry_after
+            )
+            if retry_after is None or attempt == max_retries:
+                return response
+            response.close()
+            if len(self.token_pool.tokens) > 1:
+                print(f"⏳ GitHub {api_class} API 触发限流，切换 token 重试")
+            else:
+                print(f"⏳ GitHub {api_class} API 触发限流，{retry_after:.0f}s 后重试")
+        return response
+
+    def _get_raw(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        max_lines: Optional[int] = None,
+        accept: str = RAW_MEDIA_TYPE,
+        use_cache: bool = True,
+    ) -> Optional[RawContent]:
+        """以原始媒体类型读取文件内容，相同的并发请求只发送一次，参数含义见 _fetch_raw"""
+        key = make_flight_key(id(self.token_pool), accept, url, params, max_bytes, max_lines, timeout, use_cache)
+        try:
+            return _http_flight.do(
+                key,
+                lambda: self._fetch_raw(url, params, timeout, max_bytes, max_lines, accept, use_cache),
+            )
+        except DeadlineExceeded as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+
+    def _fetch_raw(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        max_lines: Optional[int] = None,
+        accept: str = RAW_MEDIA_TYPE,
+        use_cache: bool = True,
+    ) -> Optional[RawContent]:
+        """
+        以原始媒体类型流式读取文件内容，读取预算用完后立即停止下载
+
+        完整读取的内容写入 ETag 缓存；被截断的内容不缓存，但已有缓存时仍会发送
+        条件请求，304 时对缓存内容应用同样的预算
+
+        Args:
+            url: Contents API / README API 地址
+            params: 查询参数
+            timeout: 超时时间（秒）
+            max_bytes: 最多读取的字节数（None 表示不限制）
+            max_lines: 最多读取的行数（None 表示不限制）
+            accept: 媒体类型，默认 RAW_MEDIA_TYPE
+            use_cache: 是否使用 ETag 条件请求缓存（内容寻址的地址不需要重新验证）
+
+        Returns:
+            RawContent；404 时返回 None，其余错误抛出 requests.RequestException
+        """
+        headers = {**self.headers, "Accept": accept}
+        cache_key = ResponseCache.make_key(url, params, accept)
+        cached = self.cache.get(cache_key) if use_cache else None
+        headers.update(ResponseCache.conditional_headers(cached))
+
+        response = self._send("GET", url, headers, params=params, timeout=timeout, stream=True)
+        with response:
+            if response.status_code == 304 and cached is not None:
+                self.cache.record_hit()
+                return ContentBudget.apply(cached["body"], max_bytes, max_lines)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+
+            budget = ContentBudget(max_bytes, max_lines)
+            for chunk in response.iter_content(chunk_size=RAW_CHUNK_SIZE):
+                if not budget.feed(chunk):
+                    break
+            content = budget.result()
+
+        if use_cache:
+            self.cache.record_miss()
+        if use_cache and not content.truncated:
+            self.cache.store(
+                cache_key,
+                content.text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return content
+
+    def _paginate_search(
+        self,
+        url: str,
+        base_params: Dict,
+        limit: int,
+        timeout: Optional[float] = None,
+    ) -> List[Dict]:
+        """
+        获取分页的搜索结果
+        
+        先请求第一页拿到 total_count，再在有限并发下同时请求剩余页面，结果按页码顺序合并。
+        单个后续页面失败只会丢失该页结果；第一页失败时抛出 requests.RequestException。
         
-        # 如果提供了 token，使用 Bearer 认证
-        # https://docs.github.com/en/rest/authentication/authenticating-to-the-rest-api
-        if token:
-            self.headers["Authorization"] = f"Bearer {token}"
+        Args:
+            url: 搜索 API 地址
+            base_params: 除分页参数外的查询参数
+            limit: 返回结果数量限制（最多 1000，受 GitHub API 限制）
+            timeout: 单页请求超时时间（秒），不指定时只受请求截止时间限制
+        """
+        actual_limit = min(limit, MAX_SEARCH_RESULTS)
+        if actual_limit <= 0:
+            return []
+        per_page = min(MAX_PER_PAGE, actual_limit)
+
+        first_page = self._get_json(
+            url, params={**base_params, "per_page": per_page, "page": 1}, timeout=timeout
+        ) or {}
+        all_items = list(first_page.get("items", []))
+        pages = plan_search_pages(first_page.get("total_count", 0), actual_limit, per_page)
+        if not pages:
+            return all_items[:actual_limit]
+
+        # 线程池中的线程不继承 contextvar，显式传递请求截止时间
+        deadline = current_deadline()
+
+        def fetch_page(page: int) -> List[Dict]:
+            try:
+                with deadline_scope(deadline):
+                    data = self._get_json(
+                        url, params={**base_params, "per_page": per_page, "page": page}, timeout=timeout
+                    ) or {}
+                return data.get("items", [])
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️ 获取第 {page} 页搜索结果失败: {e}")
+                return []
+
+        # executor.map 按提交顺序返回结果，保证合并后的顺序与页码一致
+        with ThreadPoolExecutor(max_workers=min(get_page_concurrency(), len(pages))) as executor:
+            for items in executor.map(fetch_page, pages):
+                all_items.extend(items)
+
+        return all_items[:actual_limit]
 
     def get_new_repositories(
         self,
@@ -50,102 +646,102 @@ class GitHubClient:
 
         url = "https://api.github.com/search/repositories"
         
-        # GitHub API 限制：per_page 最大 100，总结果最多 1000
-        max_per_page = 100
-        max_total_results = 1000
-        actual_limit = min(limit, max_total_results)
-        
-        all_items = []
-        page = 1
-        per_page = min(max_per_page, actual_limit)
-        
         try:
-            while len(all_items) < actual_limit:
-                # 计算当前页需要获取的数量
-                remaining = actual_limit - len(all_items)
-                current_per_page = min(per_page, remaining)
-                
-                params = {
-                    "q": query,
-                    "per_page": current_per_page,
-                    "page": page,
-                }
-                
-                response = requests.get(url, params=params, headers=self.headers)
-                response.raise_for_status()
-                data = response.json()
-                items = data.get("items", [])
-                
-                if not items:
-                    # 没有更多结果了
-                    break
-                
-                all_items.extend(items)
-                
-                # 如果当前页返回的数量少于请求的数量，说明已经是最后一页
-                if len(items) < current_per_page:
-                    break
-                
-                page += 1
-                
-                # 防止无限循环（最多10页，因为最多1000条结果）
-                if page > 10:
-                    break
-            
-            return all_items[:actual_limit]
-            
+            return self._paginate_search(url, {"q": query}, limit)
         except requests.exceptions.RequestException as e:
             print(f"❌ 获取GitHub项目失败: {e}")
             return []
 
     def get_trending_repositories(
-        self, since: str = "daily", limit: int = 25
+        self, since: str = "daily", limit: int = 25, enrich: bool = False
     ) -> List[Dict]:
         """从GitHub trending页面获取trending项目
 
         Args:
             since: 时间范围，可选 "daily", "weekly", "monthly"
             limit: 返回项目数量限制
+            enrich: 是否通过 API 补全页面上没有的字段（topics、创建/更新时间等）；
+                默认只解析页面，整个请求只需要一次 HTTP 调用
 
         Returns:
             项目详细信息列表
         """
         try:
             url = f"https://github.com/trending?since={since}"
-            res = requests.get(url, timeout=10)
+            res = retry_call(
+                lambda: self.session.get(url, timeout=10),
+                policy=GITHUB_RETRY_POLICY,
+                breaker=get_circuit_breaker("github"),
+                retry_if_result=lambda r: is_server_error(r.status_code),
+                discard=lambda r: r.close(),
+            )
             res.raise_for_status()
-            html_text = res.text
-            soup = BeautifulSoup(html_text, "html.parser")
-            repo_elements = soup.select("h2.h3.lh-condensed")
-            repo_names = []
-            for element in repo_elements[:limit]:
-                a_tag = element.find("a")
-                if a_tag:
-                    href = a_tag.get("href", "").strip()
-                    repo_name = (
-                        href[1:] if href.startswith("/") else href
-                    )  # 去掉开头的 "/"
-                    repo_names.append(repo_name)
-
-            # 通过API获取详细信息
-            repos = []
-            for repo_name in repo_names:
-                try:
-                    api_url = f"https://api.github.com/repos/{repo_name}"
-                    response = requests.get(
-                        api_url, headers=self.headers, timeout=5
-                    )
-                    if response.status_code == 200:
-                        repos.append(response.json())
-                except Exception as e:
-                    print(f"⚠️ 获取 {repo_name} 详情失败: {e}")
-                    continue
+            repos = parse_trending_html(res.text, limit)
+            if not enrich:
+                return repos
 
-            return repos
+            return merge_trending_details(repos, self.get_repositories_batch([r["full_name"] for r in repos]))
         except Exception as e:
             print(f"❌ 获取trending项目失败: {e}")
             return []
 
+    def get_repositories_batch(
+        self,
+        repo_names: List[str],
+        include_readme: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[Dict]:
+        """
+        使用 GraphQL 批量获取多个仓库的详细信息
+        
+        Args:
+            repo_names: 仓库全名列表，格式 "owner/repo"
+            include_readme: 是否同时获取 README 文本（写入 "readme" 字段）
+            batch_size: 单次 GraphQL 查询包含的仓库数
+        
+        Returns:
+            与 REST API 字段一致的仓库信息列表（保持输入顺序，跳过不存在的仓库）；
+            没有 token（GraphQL 不支持匿名访问）或 GraphQL 请求失败时回退到逐个 REST 请求
+        """
+        if not any(self.token_pool.tokens):
+            return self._get_repositories_rest(repo_names, include_readme)
+
+        repos = []
+        for start in range(0, len(repo_names), batch_size):
+            chunk = repo_names[start:start + batch_size]
+            try:
+                query = build_repositories_query(chunk, include_readme)
+                data = self._request_json(
+                    "POST", GRAPHQL_URL, json_body={"query": query}, timeout=30, idempotent=True
+                )
+                if not data or data.get("data") is None:
+                    raise requests.exceptions.RequestException(
+                        f"GraphQL 查询失败: {(data or {}).get('errors')}"
+                    )
+                repos.extend(repo for repo in parse_repositories_response(data, len(chunk)) if repo)
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️ GraphQL 批量获取失败，回退到 REST: {e}")
+                repos.extend(self._get_repositories_rest(chunk, include_readme))
+        return repos
+
+    def _get_repositories_rest(
+        self, repo_names: List[str], include_readme: bool = False
+    ) -> List[Dict]:
+        """逐个通过 REST API 获取仓库详细信息"""
+        repos = []
+        for repo_name in repo_names:
+            try:
+                api_url = f"https://api.github.com/repos/{repo_name}"
+                repo = self._get_json(api_url, timeout=5, use_cache=True)
+                if repo:
+                    if include_readme:
+                        repo = {**repo, "readme": self.get_repository_readme(repo_name)}
+                    repos.append(repo)
+            except Exception as e:
+                print(f"⚠️ 获取 {repo_name} 详情失败: {e}")
+                continue
+        return repos
+
     def get_repository_details(self, repo: Dict) -> Dict:
         """获取项目详细信息"""
         return {
@@ -159,10 +755,14 @@ class GitHubClient:
             "updated_at": repo["updated_at"],
             "size": repo.get("size", 0),
             "forks": repo.get("forks_count", 0),
+            "default_branch": repo.get("default_branch"),
         }
 
     def get_repository_readme(
-        self, repo_name: str, ref: Optional[str] = None
+        self,
+        repo_name: str,
+        ref: Optional[str] = None,
+        max_bytes: Optional[int] = None,
     ) -> Optional[str]:
         """
         获取指定仓库的 README 文本内容
@@ -170,6 +770,7 @@ class GitHubClient:
         Args:
             repo_name: 仓库全名，格式 "owner/repo"
             ref: 分支名或 commit sha（可选）
+            max_bytes: 最多读取的字节数（可选），超出部分不下载
 
         Returns:
             README 纯文本内容；如果未找到则返回 None
@@ -181,24 +782,9 @@ class GitHubClient:
         params = {"ref": ref} if ref else None
 
         try:
-            res = requests.get(api_url, headers=self.headers, params=params, timeout=10)
-            if res.status_code == 404:
-                return None
-            res.raise_for_status()
-            data = res.json()
-
-            # README content 默认 base64 编码
-            content = data.get("content")
-            encoding = data.get("encoding")
-            if not content:
-                return None
-
-            if encoding == "base64":
-                import base64
-
-                return base64.b64decode(content).decode("utf-8", errors="ignore")
-
-            return content
+            # 以原始媒体类型流式读取，省去 base64 解码
+            content = self._get_raw(api_url, params=params, timeout=10, max_bytes=max_bytes)
+            return content.text if content else None
         except requests.exceptions.RequestException as e:
             print(f"❌ 获取 README 失败: {e}")
             return None
@@ -224,62 +810,71 @@ class GitHubClient:
         """
         url = "https://api.github.com/search/repositories"
         
-        # GitHub API 限制：per_page 最大 100，总结果最多 1000
-        max_per_page = 100
-        max_total_results = 1000
-        actual_limit = min(limit, max_total_results)
-        
-        all_items = []
-        page = 1
-        per_page = min(max_per_page, actual_limit)
-        
         try:
-            while len(all_items) < actual_limit:
-                remaining = actual_limit - len(all_items)
-                current_per_page = min(per_page, remaining)
-                
-                params = {
-                    "q": query,
-                    "sort": sort,
-                    "order": order,
-                    "per_page": current_per_page,
-                    "page": page,
-                }
-                
-                response = requests.get(url, params=params, headers=self.headers)
-                response.raise_for_status()
-                data = response.json()
-                items = data.get("items", [])
-                
-                if not items:
-                    break
-                
-                all_items.extend(items)
-                
-                if len(items) < current_per_page:
-                    break
-                
-                page += 1
-                
-                # 防止无限循环
-                if page > 10:
-                    break
-            
-            return all_items[:actual_limit]
-            
+            return self._paginate_search(
+                url, {"q": query, "sort": sort, "order": order}, limit
+            )
         except requests.exceptions.RequestException as e:
             print(f"❌ GitHub 搜索失败: {e}")
             return []
 
+    def resolve_commit_sha(
+        self, repo_full_name: str, ref: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        将分支名 / tag 解析为 commit SHA，最多一次请求（304 时不消耗额度）
+
+        Args:
+            repo_full_name: 仓库全名，格式 "owner/repo"
+            ref: 分支名、tag 或 commit sha；为空时解析默认分支
+
+        Returns:
+            commit SHA；仓库或分支不存在时返回 None
+        """
+        if ref and COMMIT_SHA_PATTERN.fullmatch(ref):
+            return ref
+
+        # HEAD 指向默认分支；sha 媒体类型只返回 40 位 SHA 文本，不返回完整的 commit 信息
+        url = f"https://api.github.com/repos/{repo_full_name}/commits/{ref or 'HEAD'}"
+        content = self._get_raw(url, timeout=10, accept=SHA_MEDIA_TYPE)
+        return content.text.strip() if content else None
+
+    def open_repo_tarball(
+        self, repo_full_name: str, commit_sha: str, timeout: float = 60
+    ) -> requests.Response:
+        """
+        以流式方式打开 commit 的 tarball 下载（调用方负责关闭响应）
+
+        Args:
+            repo_full_name: 仓库全名，格式 "owner/repo"
+            commit_sha: commit SHA
+            timeout: 单次读取的超时时间（秒），会被截断到请求剩余时间；
+                下载总时长由调用方在读取过程中对照截止时间检查
+
+        Returns:
+            状态码为 2xx 的响应，其余状态抛出 requests.RequestException
+        """
+        url = f"https://api.github.com/repos/{repo_full_name}/tarball/{commit_sha}"
+        response = self._send("GET", url, dict(self.headers), timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            response.close()
+            raise
+        return response
+
     def get_repo_structure(
-        self, repo_full_name: str, branch: str = "main"
+        self, repo_full_name: str, branch: Optional[str] = None
     ) -> Optional[List[Dict]]:
         """
         使用 GitHub Git Trees API 递归获取整个仓库的文件列表
         
+        文件树按 commit SHA 缓存在本地，同一个 commit 的重复查询不发送请求
+        
         Args:
             repo_full_name: 仓库全名，格式 "owner/repo"
-            branch: 分支名，默认为 "main"
+            branch: 分支名或 commit sha（可选），建议直接传入搜索结果中的 default_branch；
+                为空时使用仓库的默认分支
         
         Returns:
             文件列表，每个文件包含 path, type, size 等信息；如果失败则返回 None
@@ -287,56 +882,71 @@ class GitHubClient:
         if not repo_full_name:
             return None
         
-        # 首先获取分支的 SHA
+        # 首先获取分支的 commit SHA
         try:
-            branch_url = f"https://api.github.com/repos/{repo_full_name}/branches/{branch}"
-            branch_res = requests.get(branch_url, headers=self.headers, timeout=10)
-            if branch_res.status_code == 404:
-                # 尝试其他常见分支名
-                for alt_branch in ["master", "develop"]:
-                    branch_res = requests.get(
-                        f"https://api.github.com/repos/{repo_full_name}/branches/{alt_branch}",
-                        headers=self.headers,
-                        timeout=10
-                    )
-                    if branch_res.status_code == 200:
-                        branch = alt_branch
-                        break
-                else:
-                    return None
-            
-            branch_res.raise_for_status()
-            branch_data = branch_res.json()
-            tree_sha = branch_data["commit"]["sha"]
+            commit_sha = self.resolve_commit_sha(repo_full_name, branch)
+            if commit_sha is None:
+                return None
         except requests.exceptions.RequestException as e:
             print(f"❌ 获取分支信息失败 {repo_full_name}: {e}")
             return None
         
-        # 获取递归的树结构
         try:
-            tree_url = f"https://api.github.com/repos/{repo_full_name}/git/trees/{tree_sha}"
-            params = {"recursive": "1"}
-            tree_res = requests.get(tree_url, headers=self.headers, params=params, timeout=30)
-            tree_res.raise_for_status()
-            tree_data = tree_res.json()
-            tree_items = tree_data.get("tree", [])
-            
-            # 优化返回数据，只保留必要字段（path 和 type），减少 token 占用
-            optimized_tree = []
-            for item in tree_items:
-                optimized_tree.append({
-                    "path": item.get("path", ""),
-                    "type": item.get("type", ""),
-                    "size": item.get("size", 0)  # 保留 size 可能有用
-                })
-            
-            return optimized_tree
+            tree = self._get_tree(repo_full_name, commit_sha, allow_truncated=True)
         except requests.exceptions.RequestException as e:
             print(f"❌ 获取仓库结构失败 {repo_full_name}: {e}")
             return None
+        if tree is None:
+            return None
+        
+        # 只保留必要字段（path、type、size），减少 token 占用
+        return [
+            {"path": item["path"], "type": item["type"], "size": item["size"]}
+            for item in tree
+        ]
+
+    def _get_tree(
+        self, repo_full_name: str, commit_sha: str, allow_truncated: bool = False
+    ) -> Optional[List[Dict]]:
+        """
+        获取 commit 的递归文件树（按 commit SHA 缓存）
+
+        commit 对应的文件树不会变化，缓存永不过期，因此只缓存完整的文件树：
+        不存在的 commit 和被 GitHub 截断的部分文件树都不写入缓存
+
+        Args:
+            repo_full_name: 仓库全名，格式 "owner/repo"
+            commit_sha: commit SHA
+            allow_truncated: 文件树被截断时是否返回部分文件树（不缓存），默认返回 None
+
+        Returns:
+            文件列表，每项包含 path, type, size, sha；文件树不存在时返回 None，
+            请求失败时抛出 requests.RequestException
+        """
+        tree_cache = get_tree_cache()
+        tree = tree_cache.get(repo_full_name, commit_sha)
+        if tree is not None:
+            return tree
+        
+        # Trees API 接受 commit SHA，会解析为对应的根目录树
+        tree_url = f"https://api.github.com/repos/{repo_full_name}/git/trees/{commit_sha}"
+        parsed = parse_tree_response(self._get_json(tree_url, params={"recursive": "1"}, timeout=30))
+        if parsed is None:
+            return None
+        tree, complete = parsed
+        if not complete:
+            print(f"⚠️ 文件树过大被 GitHub 截断，不写入缓存: {repo_full_name}@{commit_sha[:7]}")
+            return tree if allow_truncated else None
+        tree_cache.set(repo_full_name, commit_sha, tree)
+        return tree
 
     def get_file_content(
-        self, repo_full_name: str, file_path: str, ref: Optional[str] = None
+        self,
+        repo_full_name: str,
+        file_path: str,
+        ref: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_lines: Optional[int] = None,
     ) -> Optional[str]:
         """
         使用 GitHub Contents API 读取指定文件的内容
@@ -345,38 +955,87 @@ class GitHubClient:
             repo_full_name: 仓库全名，格式 "owner/repo"
             file_path: 文件路径（相对于仓库根目录）
             ref: 分支名或 commit sha（可选，默认为默认分支）
+            max_bytes: 最多读取的字节数（可选）
+            max_lines: 最多读取的行数（可选）
         
         Returns:
             文件内容（纯文本）；如果未找到或失败则返回 None
         """
+        content = self.read_file(repo_full_name, file_path, ref, max_bytes, max_lines)
+        return content.text if content else None
+
+    def read_file(
+        self,
+        repo_full_name: str,
+        file_path: str,
+        ref: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_lines: Optional[int] = None,
+    ) -> Optional[RawContent]:
+        """
+        流式读取文件内容，读取预算用完后停止下载剩余内容
+
+        文件树已经缓存时，通过文件树把路径映射为 blob SHA，优先从本地 BlobStore 读取；
+        同一个 blob（包括不同仓库、不同 commit 中的相同文件）只下载一次。文件树未缓存
+        （不为读取单个文件下载整棵文件树）或文件不在文件树中时回退到 Contents API。
+        参数含义同 get_file_content
+
+        Returns:
+            RawContent（truncated 表示内容被截断）；如果未找到或失败则返回 None
+        """
         if not repo_full_name or not file_path:
             return None
-        
-        api_url = f"https://api.github.com/repos/{repo_full_name}/contents/{file_path}"
-        params = {"ref": ref} if ref else None
+        file_path = file_path.strip("/")
         
         try:
-            res = requests.get(api_url, headers=self.headers, params=params, timeout=10)
-            if res.status_code == 404:
-                return None
-            res.raise_for_status()
-            data = res.json()
-            
-            # 文件内容默认 base64 编码
-            content = data.get("content")
-            encoding = data.get("encoding")
-            if not content:
-                return None
-            
-            if encoding == "base64":
-                import base64
-                return base64.b64decode(content).decode("utf-8", errors="ignore")
+            content = self._read_blob(repo_full_name, file_path, ref, max_bytes, max_lines)
+            if content is not None:
+                return content
             
-            return content
+            api_url = f"https://api.github.com/repos/{repo_full_name}/contents/{file_path}"
+            params = {"ref": ref} if ref else None
+            return self._get_raw(
+                api_url, params=params, timeout=10, max_bytes=max_bytes, max_lines=max_lines
+            )
         except requests.exceptions.RequestException as e:
             print(f"❌ 获取文件内容失败 {repo_full_name}/{file_path}: {e}")
             return None
 
+    def _read_blob(
+        self,
+        repo_full_name: str,
+        file_path: str,
+        ref: Optional[str],
+        max_bytes: Optional[int],
+        max_lines: Optional[int],
+    ) -> Optional[RawContent]:
+        """按 blob SHA 读取文件内容；文件树未缓存或路径不在文件树中时返回 None"""
+        # 没有缓存过该仓库的文件树时，解析 commit SHA 只会多一次请求，直接回退到 Contents API
+        if not get_tree_cache().has_repo(repo_full_name):
+            return None
+        commit_sha = self.resolve_commit_sha(repo_full_name, ref)
+        if commit_sha is None:
+            return None
+        # 大仓库的递归文件树有数 MB，只读取一个文件时不值得下载，只使用已缓存的完整文件树
+        tree = get_tree_cache().get(repo_full_name, commit_sha)
+        blob_sha = find_blob_sha(tree, file_path) if tree is not None else None
+        if blob_sha is None:
+            return None
+        
+        blob_store = get_blob_store()
+        text = blob_store.get(blob_sha)
+        if text is not None:
+            return ContentBudget.apply(text, max_bytes, max_lines)
+        
+        # blob 地址是内容寻址的，不需要 ETag 重新验证
+        blob_url = f"https://api.github.com/repos/{repo_full_name}/git/blobs/{blob_sha}"
+        content = self._get_raw(
+            blob_url, timeout=10, max_bytes=max_bytes, max_lines=max_lines, use_cache=False
+        )
+        if content is not None and not content.truncated:
+            blob_store.put(blob_sha, content.text)
+        return content
+
     def search_code_in_repo(
         self, 
         repo_full_name: str, 
@@ -413,33 +1072,37 @@ class GitHubClient:
                 "per_page": actual_limit,
             }
             
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(url, params=params, timeout=10) or {}
             items = data.get("items", [])
             
             # 格式化结果，提取关键信息
-            # 注意：GitHub Code Search API 返回的 items 中，repository 可能是简化的对象
-            results = []
-            for item in items[:actual_limit]:
-                # 处理 repository 字段（可能是对象或字符串）
-                repo_info = item.get("repository", {})
-                if isinstance(repo_info, dict):
-                    repo_full = repo_info.get("full_name", repo_full_name)
-                else:
-                    repo_full = repo_full_name
-                
-                results.append({
-                    "path": item.get("path", ""),
-                    "name": item.get("name", ""),
-                    "url": item.get("html_url", ""),
-                    "repository": repo_full,
-                    "score": item.get("score", 0),
-                })
-            
-            return results
-            
+            return format_code_search_items(items, repo_full_name, actual_limit)
         except requests.exceptions.RequestException as e:
             print(f"❌ 代码搜索失败 {repo_full_name}: {e}")
             return []
 
+
+# 进程内共享的 GitHubClient 注册表，按 token 组合复用客户端实例
+_clients: Dict[tuple, GitHubClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_github_client(
+    token: Optional[str] = None, tokens: Optional[List[str]] = None
+) -> GitHubClient:
+    """
+    获取进程内共享的 GitHubClient，所有实例复用同一个带连接池的 Session
+    
+    Args:
+        token: GitHub Personal Access Token
+        tokens: token 池（可选）；token 和 tokens 都未提供时，
+            读取环境变量 GITHUB_TOKENS（逗号分隔）或 GITHUB_TOKEN
+    """
+    tokens = tokens or ([token] if token else load_github_tokens())
+    key = tuple(tokens)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = GitHubClient(tokens=list(tokens))
+            _clients[key] = client
+        return client
@@ -0,0 +1,108 @@
+"""GitHub GraphQL 批量查询：一次请求获取多个仓库的元数据（可选包含 README）"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# 单次查询包含的仓库数，避免超出 GraphQL 查询复杂度和响应体积限制
+DEFAULT_BATCH_SIZE = 25
+
+REPOSITORY_FIELDS = """
+    nameWithOwner
+    name
+    description
+    url
+    owner { login }
+    stargazerCount
+    forkCount
+    primaryLanguage { name }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    createdAt
+    updatedAt
+    pushedAt
+    diskUsage
+    isArchived
+    defaultBranchRef { name }
+"""
+
+# README 文件名不固定，按常见文件名依次尝试，取第一个存在的
+README_EXPRESSIONS = ["HEAD:README.md", "HEAD:readme.md", "HEAD:README.rst", "HEAD:README"]
+
+
+def build_repositories_query(repo_names: List[str], include_readme: bool = False) -> str:
+    """
+    构建批量获取仓库信息的 GraphQL 查询，每个仓库使用一个别名 r0, r1, ...
+
+    Args:
+        repo_names: 仓库全名列表，格式 "owner/repo"
+        include_readme: 是否同时获取 README 文本
+    """
+    readme_fields = ""
+    if include_readme:
+        readme_fields = "\n".join(
+            f"    readme{i}: object(expression: {json.dumps(expr)}) {{ ... on Blob {{ text oid }} }}"
+            for i, expr in enumerate(README_EXPRESSIONS)
+        )
+
+    parts = []
+    for i, repo_name in enumerate(repo_names):
+        owner, _, name = repo_name.partition("/")
+        parts.append(
+            f"  r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{"
+            f"{REPOSITORY_FIELDS}{readme_fields}\n  }}"
+        )
+    return "query {\n" + "\n".join(parts) + "\n}"
+
+
+def map_repository_node(node: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    将 GraphQL 仓库节点转换为与 REST API `GET /repos/{owner}/{repo}` 一致的字段结构，
+    便于 ProjectService._convert_repo_to_project 等直接复用
+    """
+    repo = {
+        "full_name": node.get("nameWithOwner", ""),
+        "name": node.get("name", ""),
+        "description": node.get("description"),
+        "html_url": node.get("url", ""),
+        "owner": {"login": (node.get("owner") or {}).get("login", "")},
+        "stargazers_count": node.get("stargazerCount", 0),
+        "forks_count": node.get("forkCount", 0),
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "topics": [
+            topic_node["topic"]["name"]
+            for topic_node in (node.get("repositoryTopics") or {}).get("nodes", [])
+            if topic_node.get("topic")
+        ],
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "pushed_at": node.get("pushedAt"),
+        "size": node.get("diskUsage") or 0,
+        "archived": node.get("isArchived", False),
+        "default_branch": (node.get("defaultBranchRef") or {}).get("name"),
+    }
+
+    # 取第一个存在的 README
+    for i in range(len(README_EXPRESSIONS)):
+        blob = node.get(f"readme{i}")
+        if blob and blob.get("text") is not None:
+            repo["readme"] = blob["text"]
+            repo["readme_sha"] = blob.get("oid")
+            break
+    return repo
+
+
+def parse_repositories_response(
+    data: Optional[Dict[str, Any]], repo_count: int
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    解析批量查询结果，按输入顺序返回仓库信息；不存在或无权访问的仓库为 None
+
+    GraphQL 对单个仓库的错误会放在 errors 中并把对应别名置为 null，其余仓库照常返回
+    """
+    nodes = ((data or {}).get("data") or {})
+    return [
+        map_repository_node(nodes[f"r{i}"]) if nodes.get(f"r{i}") else None
+        for i in range(repo_count)
+    ]
@@ -1,34 +1,55 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime
-from .github_client import GitHubClient
+from .github_client import get_github_client
+from .async_github_client import AsyncGitHubClient
+from .trending_cache import TrendingSnapshotCache, get_trending_cache_settings
 from ..models import Project
 
 
+# trending 页面每页最多 25 个项目
+TRENDING_PAGE_SIZE = 25
+
+
 class ProjectService:
     """项目服务类，负责从 GitHub 获取并转换项目数据"""
 
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(
+        self,
+        github_token: Optional[str] = None,
+        github_tokens: Optional[List[str]] = None,
+    ):
         """
         初始化项目服务
         
         Args:
             github_token: GitHub Personal Access Token (可选)
+            github_tokens: 多个 token 组成的 token 池（可选，提供时忽略 github_token）
         """
-        self.github_client = GitHubClient(token=github_token)
+        tokens = github_tokens or [github_token]
+        self.github_client = get_github_client(tokens=tokens)
+        self.async_github_client = AsyncGitHubClient(tokens=tokens)
+        # trending 快照缓存，key 为 (since, enrich)
+        settings = get_trending_cache_settings()
+        self.trending_cache: TrendingSnapshotCache[Project] = TrendingSnapshotCache(
+            self._load_trending_snapshot,
+            ttl=settings["ttl"],
+            max_stale=settings["max_stale"],
+        )
 
-    def get_trending_projects(self, limit: int = 25) -> List[Project]:
+    def get_trending_projects(self, limit: int = 25, enrich: bool = False) -> List[Project]:
         """
         获取当日的 GitHub trending 项目
         
         Args:
             limit: 返回项目数量限制
+            enrich: 是否通过 GitHub API 补全 topics 等页面上没有的字段（默认只解析 trending 页面）
             
         Returns:
             Project 对象列表
         """
         # 从 GitHub trending 获取数据
         repos = self.github_client.get_trending_repositories(
-            since="daily", limit=limit
+            since="daily", limit=limit, enrich=enrich
         )
 
         projects = []
@@ -39,6 +60,28 @@ class ProjectService:
 
         return projects
 
+    async def aget_trending_projects(
+        self, limit: int = 25, enrich: bool = False, since: str = "daily"
+    ) -> List[Project]:
+        """
+        get_trending_projects 的异步版本，从快照缓存返回，不阻塞事件循环
+
+        Args:
+            limit: 返回项目数量限制
+            enrich: 是否通过 GitHub API 补全 topics 等字段
+            since: 时间范围，可选 "daily", "weekly", "monthly"
+        """
+        projects = await self.trending_cache.get((since, enrich))
+        return projects[:limit]
+
+    async def _load_trending_snapshot(self, key: Tuple[str, bool]) -> List[Project]:
+        """加载一份完整的 trending 快照"""
+        since, enrich = key
+        repos = await self.async_github_client.get_trending_repositories(
+            since=since, limit=TRENDING_PAGE_SIZE, enrich=enrich
+        )
+        return [self._convert_repo_to_project(repo) for repo in repos]
+
     def get_repository_readme(
         self, repo_name: str, ref: Optional[str] = None
     ) -> Optional[str]:
@@ -54,6 +97,12 @@ class ProjectService:
         """
         return self.github_client.get_repository_readme(repo_name, ref)
 
+    async def aget_repository_readme(
+        self, repo_name: str, ref: Optional[str] = None
+    ) -> Optional[str]:
+        """get_repository_readme 的异步版本，不阻塞事件循环"""
+        return await self.async_github_client.get_repository_readme(repo_name, ref)
+
     def _convert_repo_to_project(self, repo: Dict) -> Project:
         """
         将 GitHub 仓库数据转换为 Project 模型
@@ -78,7 +127,7 @@ class ProjectService:
         description = repo.get("description", "") or ""
 
         # 获取标签（topics + language）
-        tags = repo.get("topics", [])
+        tags = list(repo.get("topics", []))
         language = repo.get("language")
         if language and language not in tags:
             tags.append(language.lower())
@@ -171,4 +220,13 @@ class ProjectService:
         """
         repos = self.github_client.get_new_repositories(days, min_stars, language, limit)
         
-        return repos
\ No newline at end of file
+        return repos
+
+    async def aget_new_repositories(self, days, min_stars, language: Optional[str] = None, limit: Optional[int] = 1000) -> List[Dict]:
+        """get_new_repositories 的异步版本，不阻塞事件循环
+        
+        limit 为 None 或超过 1000 时，按创建时间分片爬取，返回完整结果
+        """
+        if limit is None or limit > 1000:
+            return await self.async_github_client.crawl_new_repositories(days, min_stars, language, limit)
+        return await self.async_github_client.get_new_repositories(days, min_stars, language, limit)
@@ -0,0 +1,249 @@
+import asyncio
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+
+# GitHub 各类 API 的限额：(请求数, 时间窗口秒数)
+# https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api
+AUTHENTICATED_LIMITS = {
+    "core": (5000, 3600),
+    "search": (30, 60),
+    "code_search": (10, 60),
+    "graphql": (5000, 3600),
+}
+UNAUTHENTICATED_LIMITS = {
+    "core": (60, 3600),
+    "search": (10, 60),
+    "code_search": (10, 60),
+    "graphql": (0, 3600),
+}
+
+# 没有 Retry-After 也没有重置时间的二级限流，官方建议至少等待 1 分钟
+SECONDARY_RATE_LIMIT_WAIT = 60.0
+
+
+def classify_request(url: str) -> str:
+    """根据请求地址判断所属的 API 类别（core / search / code_search / graphql）"""
+    if "/search/code" in url:
+        return "code_search"
+    if "/search/" in url:
+        return "search"
+    if url.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+class TokenBucket:
+    """单个 API 类别的令牌桶，结合响应头中的剩余额度和重置时间进行校准"""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.refill_rate = limit / window if limit else 0.0
+        self.tokens = float(limit)
+        self.updated_at = time.monotonic()
+        # 服务端报告的剩余额度和重置时间（epoch 秒）
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        # 限额耗尽或收到 Retry-After 时，在此时间点之前不发送请求（epoch 秒）
+        self.blocked_until = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(float(self.limit), self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def wait_time(self) -> float:
+        """不消耗令牌，计算下一个请求需要等待的秒数"""
+        self._refill()
+        wait = max(0.0, self.blocked_until - time.time())
+        if self.tokens < 1:
+            wait = max(wait, math.inf if not self.refill_rate else (1 - self.tokens) / self.refill_rate)
+        return wait
+
+    def reserve(self) -> float:
+        """预约一个令牌并返回需要等待的秒数；令牌可以透支，后来的请求依次排队"""
+        wait = self.wait_time()
+        self.tokens -= 1
+        return wait
+
+    def release(self) -> None:
+        """归还未使用的令牌（预约后决定放弃请求时调用）"""
+        self.tokens = min(float(self.limit), self.tokens + 1)
+
+
+class RateLimitScheduler:
+    """
+    GitHub API 限额调度器
+
+    为 core / search / code_search / graphql 各维护一个令牌桶，根据响应头
+    X-RateLimit-Remaining / X-RateLimit-Reset / Retry-After 校准，请求前预约令牌，
+    额度不足时排队等待，而不是直接失败。
+    """
+
+    def __init__(
+        self,
+        authenticated: bool = True,
+        max_wait: float = 60.0,
+        max_retries: int = 2,
+    ):
+        """
+        Args:
+            authenticated: 是否使用 token 认证（决定默认限额）
+            max_wait: 单个请求最多排队等待的秒数，超过时放弃请求
+            max_retries: 收到限流响应后的最大重试次数
+        """
+        limits = AUTHENTICATED_LIMITS if authenticated else UNAUTHENTICATED_LIMITS
+        self.buckets = {
+            api_class: TokenBucket(limit, window) for api_class, (limit, window) in limits.items()
+        }
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+
+    def reserve(self, api_class: str, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        为一次请求预约额度
+
+        Args:
+            max_wait: 本次请求最多等待的秒数（如请求剩余的时间预算），不超过 self.max_wait
+
+        Returns:
+            需要等待的秒数；超过最大等待时间时返回 None（不预约）
+        """
+        limit = self.max_wait if max_wait is None else min(self.max_wait, max_wait)
+        with self._lock:
+            bucket = self.buckets[api_class]
+            wait = bucket.reserve()
+            if wait > limit:
+                bucket.release()
+                return None
+            return wait
+
+    def acquire(self, api_class: str, max_wait: Optional[float] = None) -> bool:
+        """同步等待额度，返回是否获得额度"""
+        wait = self.reserve(api_class, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, api_class: str, max_wait: Optional[float] = None) -> bool:
+        """异步等待额度，返回是否获得额度"""
+        wait = self.reserve(api_class, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    @staticmethod
+    def is_rate_limited(status_code: int, headers: Mapping[str, str], body: str = "") -> bool:
+        """判断响应是否为限流（一级或二级限流）"""
+        if status_code not in (403, 429):
+            return False
+        return (
+            "Retry-After" in headers
+            or headers.get("X-RateLimit-Remaining") == "0"
+            or "rate limit" in body.lower()
+        )
+
+    def update(
+        self,
+        api_class: str,
+        status_code: int,
+        headers: Mapping[str, str],
+        body: str = "",
+    ) -> Optional[float]:
+        """
+        根据响应头校准令牌桶
+
+        Returns:
+            如果响应是限流，返回建议的重试等待秒数；否则返回 None
+        """
+        # 以服务端报告的资源类别为准
+        api_class = headers.get("X-RateLimit-Resource", api_class)
+        if api_class not in self.buckets:
+            return None
+        now = time.time()
+        with self._lock:
+            bucket = self.buckets[api_class]
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset = headers.get("X-RateLimit-Reset")
+            limit = headers.get("X-RateLimit-Limit")
+            if limit and limit.isdigit() and int(limit) != bucket.limit:
+                bucket.limit = int(limit)
+                bucket.refill_rate = bucket.limit / bucket.window
+            if reset and reset.isdigit():
+                bucket.reset_at = float(reset)
+            if remaining and remaining.isdigit():
+                bucket.remaining = int(remaining)
+                bucket._refill()
+                bucket.tokens = min(bucket.tokens, float(bucket.remaining))
+                if bucket.remaining == 0 and bucket.reset_at:
+                    bucket.blocked_until = max(bucket.blocked_until, bucket.reset_at)
+
+            if not self.is_rate_limited(status_code, headers, body):
+                return None
+
+            retry_after = headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                wait = float(retry_after)
+            elif remaining == "0" and bucket.reset_at:
+                wait = max(0.0, bucket.reset_at - now)
+            else:
+                wait = SECONDARY_RATE_LIMIT_WAIT
+            bucket.blocked_until = max(bucket.blocked_until, now + wait)
+            return wait
+
+    def budget(self, api_class: Optional[str] = None) -> Dict[str, Any]:
+        """
+        返回当前额度，供图节点根据剩余额度降级
+
+        Args:
+            api_class: API 类别；为 None 时返回所有类别
+
+        Returns:
+            {"remaining": 可立即使用的请求数, "limit": 限额, "reset_at": 重置时间, "wait": 下一个请求需要等待的秒数}
+        """
+        if api_class is None:
+            return {name: self.budget(name) for name in self.buckets}
+        with self._lock:
+            bucket = self.buckets[api_class]
+            wait = bucket.wait_time()
+            remaining = max(0, int(bucket.tokens)) if wait == 0 else 0
+            # 服务端报告的剩余额度只在当前窗口内有效
+            if bucket.remaining is not None and (bucket.reset_at is None or bucket.reset_at > time.time()):
+                remaining = min(remaining, bucket.remaining)
+            return {
+                "remaining": remaining,
+                "limit": bucket.limit,
+                "reset_at": bucket.reset_at,
+                "wait": round(wait, 2) if wait != math.inf else None,
+            }
+
+
+_schedulers: Dict[Optional[str], RateLimitScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_rate_limiter(token: Optional[str] = None) -> RateLimitScheduler:
+    """
+    获取 token 对应的共享调度器（同一 token 的同步、异步客户端共享额度）
+
+    可通过环境变量配置：
+    - GITHUB_RATE_LIMIT_MAX_WAIT: 单个请求最多排队等待的秒数，默认 60
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(token)
+        if scheduler is None:
+            scheduler = RateLimitScheduler(
+                authenticated=bool(token),
+                max_wait=float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "60")),
+            )
+            _schedulers[token] = scheduler
+        return scheduler
@@ -0,0 +1,131 @@
+import copy
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from ..cache import LRUCache, SQLiteCache, get_cache_dir
+
+
+class ResponseCache:
+    """
+    GitHub REST 响应的条件请求缓存
+
+    保存响应的 ETag / Last-Modified 和解码后的 body，再次请求时带上
+    If-None-Match / If-Modified-Since，GitHub 返回 304 时直接复用缓存内容。
+    304 响应不计入 GitHub API 限额。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        persist: bool = False,
+    ):
+        """
+        Args:
+            max_entries: 内存中最多缓存的响应数
+            max_bytes: 内存中缓存响应的最大总字节数
+            persist: 是否同时持久化到磁盘（SQLite），进程重启后仍可复用
+        """
+        self._memory = LRUCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            sizeof=lambda entry: entry["size"],
+        )
+        self._disk = (
+            SQLiteCache(get_cache_dir() / "github_responses.sqlite3", max_entries=max_entries * 4)
+            if persist
+            else None
+        )
+        self._lock = threading.Lock()
+        self.hits = 0  # 304 命中，复用缓存内容
+        self.misses = 0  # 无缓存或内容已变化，下载完整响应
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None, accept: Optional[str] = None) -> str:
+        """根据 URL、查询参数和 Accept 头生成缓存键"""
+        query = json.dumps(params or {}, sort_keys=True, default=str)
+        return f"{accept or ''} {url} {query}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存条目（内存优先，未命中时回落到磁盘并回填内存）"""
+        entry = self._memory.get(key)
+        if entry is None and self._disk is not None:
+            entry = self._disk.get(key)
+            if entry is not None:
+                self._memory.set(key, entry)
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """根据缓存条目生成条件请求头"""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(
+        self,
+        key: str,
+        body: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """保存响应（保存副本，调用方之后修改 body 不影响缓存）；没有 ETag / Last-Modified 的响应无法重新验证，不缓存"""
+        if not etag and not last_modified:
+            return
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": copy.deepcopy(body),
+            "size": len(json.dumps(body, ensure_ascii=False, default=str)),
+        }
+        self._memory.set(key, entry)
+        if self._disk is not None:
+            self._disk.set(key, entry)
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """返回命中统计"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    获取进程内共享的 ResponseCache
+
+    可通过环境变量配置：
+    - GITHUB_CACHE_MAX_ENTRIES: 内存中最多缓存的响应数，默认 2048
+    - GITHUB_CACHE_MAX_MB: 内存缓存上限（MB），默认 64
+    - GITHUB_CACHE_PERSIST: 是否持久化到磁盘，默认 false
+    """
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                max_entries=int(os.getenv("GITHUB_CACHE_MAX_ENTRIES", "2048")),
+                max_bytes=int(float(os.getenv("GITHUB_CACHE_MAX_MB", "64")) * 1024 * 1024),
+                persist=os.getenv("GITHUB_CACHE_PERSIST", "false").lower() == "true",
+            )
+        return _response_cache
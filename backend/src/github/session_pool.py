@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class PooledSession(requests.Session):
+    """带连接池配置和空闲回收的 requests.Session，供所有同步 GitHubClient 共享"""
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        pool_block: bool = True,
+        idle_timeout: Optional[float] = 60.0,
+    ):
+        """
+        Args:
+            pool_connections: 缓存的 host 连接池数量
+            pool_maxsize: 每个 host 的最大连接数
+            pool_block: 连接数达到上限时是否阻塞等待（而不是临时新建连接）
+            idle_timeout: 空闲超过该秒数后回收所有连接，None 表示不回收
+        """
+        super().__init__()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+        self.idle_timeout = idle_timeout
+        self._last_used = time.monotonic()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _evict_idle_connections(self) -> None:
+        """空闲时间过长时关闭池中的连接，避免复用已被服务端断开的 keep-alive 连接"""
+        now = time.monotonic()
+        if (
+            self.idle_timeout
+            and self._in_flight == 0
+            and now - self._last_used > self.idle_timeout
+        ):
+            for adapter in self.adapters.values():
+                # HTTPAdapter.close() 会清空 PoolManager，之后按需重建连接
+                adapter.close()
+        self._last_used = now
+
+    def request(self, *args, **kwargs) -> requests.Response:
+        with self._lock:
+            self._evict_idle_connections()
+            self._in_flight += 1
+        try:
+            return super().request(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._last_used = time.monotonic()
+
+
+_shared_session: Optional[PooledSession] = None
+_session_lock = threading.Lock()
+
+
+def get_shared_session() -> PooledSession:
+    """
+    获取进程内共享的 PooledSession
+
+    连接池参数可通过环境变量配置：
+    - GITHUB_POOL_CONNECTIONS: 缓存的 host 连接池数量，默认 10
+    - GITHUB_POOL_MAXSIZE: 每个 host 的最大连接数，默认 32
+    - GITHUB_POOL_BLOCK: 达到上限时是否阻塞等待，默认 true
+    - GITHUB_POOL_IDLE_TIMEOUT: 空闲回收时间（秒），默认 60，0 表示不回收
+    """
+    global _shared_session
+    with _session_lock:
+        if _shared_session is None:
+            idle_timeout = float(os.getenv("GITHUB_POOL_IDLE_TIMEOUT", "60"))
+            _shared_session = PooledSession(
+                pool_connections=int(os.getenv("GITHUB_POOL_CONNECTIONS", "10")),
+                pool_maxsize=int(os.getenv("GITHUB_POOL_MAXSIZE", "32")),
+                pool_block=os.getenv("GITHUB_POOL_BLOCK", "true").lower() == "true",
+                idle_timeout=idle_timeout or None,
+            )
+        return _shared_session
+
+
+def close_shared_session() -> None:
+    """关闭共享的 PooledSession（应用关闭时调用）"""
+    global _shared_session
+    with _session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+        _shared_session = None
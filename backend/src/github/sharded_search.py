@@ -0,0 +1,167 @@
+"""
+按创建时间（必要时再按 star 数）分片的仓库搜索，突破 GitHub 搜索单个查询最多返回 1000 条结果的限制
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
+
+from ..cache import LRUCache
+from .github_client import MAX_SEARCH_RESULTS
+
+if TYPE_CHECKING:
+    from .async_github_client import AsyncGitHubClient
+
+
+SEARCH_URL = "https://api.github.com/search/repositories"
+
+# 时间范围小于该值后不再按时间切分，改为按 star 数切分
+MIN_TIME_SPAN = timedelta(hours=1)
+
+# total_count 探测结果缓存，避免重复规划时浪费搜索额度
+_probe_cache = LRUCache(max_entries=4096, ttl=600)
+
+
+class SearchShard(NamedTuple):
+    """一个搜索分片：创建时间区间 [created_from, created_to] 和 star 区间 [stars_min, stars_max]"""
+
+    created_from: datetime
+    created_to: datetime
+    stars_min: int
+    stars_max: Optional[int] = None  # None 表示没有上限
+    language: Optional[str] = None
+
+    def to_query(self) -> str:
+        """转换为 GitHub 搜索语法"""
+        fmt = "%Y-%m-%dT%H:%M:%SZ"
+        stars = (
+            f"stars:>={self.stars_min}"
+            if self.stars_max is None
+            else f"stars:{self.stars_min}..{self.stars_max}"
+        )
+        query = f"created:{self.created_from.strftime(fmt)}..{self.created_to.strftime(fmt)} {stars}"
+        if self.language:
+            query += f" language:{self.language}"
+        return query
+
+    def split(self) -> Optional[List["SearchShard"]]:
+        """一分为二：优先按创建时间切分，时间范围足够小后按 star 数切分；无法再切分时返回 None"""
+        span = self.created_to - self.created_from
+        if span >= MIN_TIME_SPAN:
+            mid = self.created_from + span / 2
+            mid = mid.replace(microsecond=0)
+            return [
+                self._replace(created_to=mid),
+                self._replace(created_from=mid + timedelta(seconds=1)),
+            ]
+
+        if self.stars_max is None:
+            mid = max(self.stars_min * 2, self.stars_min + 1)
+            return [
+                self._replace(stars_max=mid - 1),
+                self._replace(stars_min=mid),
+            ]
+        if self.stars_max > self.stars_min:
+            mid = (self.stars_min + self.stars_max) // 2
+            return [
+                self._replace(stars_max=mid),
+                self._replace(stars_min=mid + 1),
+            ]
+        return None
+
+
+class ShardedSearchCrawler:
+    """
+    分片爬取搜索结果
+
+    递归切分时间 / star 范围，直到每个分片的 total_count 都不超过 1000，
+    然后并发爬取所有分片，并按 full_name 去重
+    """
+
+    def __init__(self, client: "AsyncGitHubClient", concurrency: Optional[int] = None):
+        """
+        Args:
+            client: 异步 GitHub 客户端
+            concurrency: 同时进行的搜索请求数，默认读取环境变量 GITHUB_SHARD_CONCURRENCY（默认 4）
+        """
+        self.client = client
+        self._semaphore = asyncio.Semaphore(
+            concurrency or int(os.getenv("GITHUB_SHARD_CONCURRENCY", "4"))
+        )
+
+    async def probe(self, shard: SearchShard) -> int:
+        """探测分片的结果总数（per_page=1，结果缓存 10 分钟）"""
+        query = shard.to_query()
+        total = _probe_cache.get(query)
+        if total is None:
+            async with self._semaphore:
+                data = await self.client._get_json(
+                    SEARCH_URL, params={"q": query, "per_page": 1}
+                ) or {}
+            total = data.get("total_count", 0)
+            _probe_cache.set(query, total)
+        return total
+
+    async def plan(self, shard: SearchShard) -> List[SearchShard]:
+        """递归切分分片，返回结果数都不超过 1000 的分片列表（空分片会被丢弃）"""
+        total = await self.probe(shard)
+        if total == 0:
+            return []
+        if total <= MAX_SEARCH_RESULTS:
+            return [shard]
+
+        children = shard.split()
+        if children is None:
+            print(f"⚠️ 分片无法继续切分，结果将被截断: {shard.to_query()} ({total})")
+            return [shard]
+
+        plans = await asyncio.gather(*(self.plan(child) for child in children))
+        return [s for plan in plans for s in plan]
+
+    async def fetch(self, shard: SearchShard) -> List[Dict]:
+        """爬取单个分片的全部结果"""
+        async with self._semaphore:
+            # 分片内部翻页本身也是并发的，这里只限制同时进行的分片数
+            return await self.client._paginate_search(
+                SEARCH_URL, {"q": shard.to_query()}, MAX_SEARCH_RESULTS
+            )
+
+    async def crawl(self, root: SearchShard, limit: Optional[int] = None) -> List[Dict]:
+        """
+        爬取根分片范围内的所有仓库
+
+        Args:
+            root: 覆盖整个查询范围的根分片
+            limit: 返回数量上限（可选），为 None 时返回全部
+
+        Returns:
+            按 full_name 去重、按 star 数降序排列的仓库列表
+        """
+        shards = await self.plan(root)
+        print(f"🧩 查询被切分为 {len(shards)} 个分片")
+        results = await asyncio.gather(*(self.fetch(shard) for shard in shards))
+
+        unique: Dict[str, Dict] = {}
+        for items in results:
+            for repo in items:
+                full_name = repo.get("full_name")
+                if full_name and full_name not in unique:
+                    unique[full_name] = repo
+
+        repos = sorted(unique.values(), key=lambda r: r.get("stargazers_count", 0), reverse=True)
+        return repos[:limit] if limit else repos
+
+
+def build_new_repositories_shard(
+    days: int, min_stars: int, language: Optional[str] = None
+) -> SearchShard:
+    """构建覆盖最近 days 天、star 数不低于 min_stars 的根分片"""
+    # 结束时间取到下一个整点，同一小时内的查询切分结果一致，可以复用 total_count 探测缓存
+    end = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    return SearchShard(
+        created_from=end - timedelta(days=days),
+        created_to=end,
+        stars_min=min_stars,
+        language=language,
+    )
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .rate_limiter import RateLimitScheduler, get_rate_limiter
+
+
+# token 认证失败（401）时的隔离时间（秒）
+INVALID_TOKEN_QUARANTINE = 3600.0
+
+
+def load_github_tokens() -> List[str]:
+    """
+    从环境变量读取 GitHub token 列表
+
+    优先读取逗号分隔的 GITHUB_TOKENS，未配置时回落到单个 GITHUB_TOKEN
+    """
+    tokens = [t.strip() for t in os.getenv("GITHUB_TOKENS", "").split(",") if t.strip()]
+    if not tokens and os.getenv("GITHUB_TOKEN"):
+        tokens = [os.getenv("GITHUB_TOKEN")]
+    return tokens
+
+
+class TokenPool:
+    """
+    GitHub token 池
+
+    每个 token 有独立的限额调度器；每次请求路由到该 API 类别剩余额度最多的 token，
+    额度耗尽或被限流的 token 暂时隔离，直到额度恢复。
+    """
+
+    def __init__(self, tokens: Sequence[Optional[str]]):
+        """
+        Args:
+            tokens: token 列表；为空时使用匿名访问
+        """
+        self.tokens: List[Optional[str]] = list(dict.fromkeys(tokens)) or [None]
+        self._quarantined_until: Dict[Optional[str], float] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, token: Optional[str]) -> RateLimitScheduler:
+        """token 对应的限额调度器（与单 token 客户端共享）"""
+        return get_rate_limiter(token)
+
+    def select(self, api_class: str) -> Tuple[Optional[str], RateLimitScheduler]:
+        """选择该 API 类别下剩余额度最多、且未被隔离的 token"""
+        now = time.time()
+        with self._lock:
+            available = [t for t in self.tokens if self._quarantined_until.get(t, 0) <= now]
+            if not available:
+                # 全部被隔离时，选择最早解除隔离的 token，由调度器负责排队等待
+                available = [min(self.tokens, key=lambda t: self._quarantined_until.get(t, 0))]
+
+        def score(token: Optional[str]):
+            budget = self.limiter(token).budget(api_class)
+            wait = budget["wait"] if budget["wait"] is not None else float("inf")
+            return (-wait, budget["remaining"])
+
+        token = max(available, key=score) if len(available) > 1 else available[0]
+        return token, self.limiter(token)
+
+    def quarantine(self, token: Optional[str], seconds: float) -> None:
+        """暂时隔离 token"""
+        if len(self.tokens) <= 1:
+            return
+        with self._lock:
+            until = time.time() + seconds
+            self._quarantined_until[token] = max(self._quarantined_until.get(token, 0), until)
+        print(f"⚠️ GitHub token ...{(token or 'anonymous')[-4:]} 暂时隔离 {seconds:.0f}s")
+
+    def report(
+        self,
+        token: Optional[str],
+        status_code: int,
+        headers: Mapping[str, str],
+        retry_after: Optional[float],
+    ) -> Optional[float]:
+        """
+        根据响应更新 token 的隔离状态
+
+        Args:
+            retry_after: 调度器判断的限流等待秒数（非限流响应为 None）
+
+        Returns:
+            需要重试时返回等待秒数（有其他可用 token 时会直接切换），否则返回 None
+        """
+        if status_code == 401 and len(self.tokens) > 1:
+            self.quarantine(token, INVALID_TOKEN_QUARANTINE)
+            return 0.0
+        if retry_after is not None:
+            self.quarantine(token, retry_after)
+            return retry_after
+        reset = headers.get("X-RateLimit-Reset")
+        if headers.get("X-RateLimit-Remaining") == "0" and reset and reset.isdigit():
+            # 额度已用完，在重置之前不再路由请求到该 token
+            self.quarantine(token, max(0.0, float(reset) - time.time()))
+        return None
+
+    @property
+    def max_retries(self) -> int:
+        """限流重试次数：至少可以把每个 token 都尝试一遍"""
+        return max(len(self.tokens), self.limiter(self.tokens[0]).max_retries)
+
+    def budget(self, api_class: Optional[str] = None) -> Dict[str, Any]:
+        """
+        汇总所有 token 的额度
+
+        Returns:
+            格式同 RateLimitScheduler.budget，remaining / limit 为各 token 之和，wait 取最小值
+        """
+        if api_class is None:
+            return {name: self.budget(name) for name in self.limiter(self.tokens[0]).buckets}
+        now = time.time()
+        budgets = []
+        for token in self.tokens:
+            budget = self.limiter(token).budget(api_class)
+            if self._quarantined_until.get(token, 0) > now:
+                budget = {**budget, "remaining": 0}
+            budgets.append(budget)
+        waits = [b["wait"] for b in budgets if b["wait"] is not None]
+        return {
+            "remaining": sum(b["remaining"] for b in budgets),
+            "limit": sum(b["limit"] for b in budgets),
+            "reset_at": min((b["reset_at"] for b in budgets if b["reset_at"]), default=None),
+            "wait": min(waits) if waits else None,
+            "tokens": len(self.tokens),
+        }
+
+
+_pools: Dict[Tuple[Optional[str], ...], TokenPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_token_pool(tokens: Sequence[Optional[str]]) -> TokenPool:
+    """获取共享的 TokenPool（同一组 token 的同步、异步客户端共享隔离状态）"""
+    key = tuple(dict.fromkeys(tokens)) or (None,)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = TokenPool(key)
+            _pools[key] = pool
+        return pool
@@ -0,0 +1,93 @@
+"""按 git 对象 SHA 索引的缓存：commit 对应的文件树、blob 对应的文件内容"""
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+from ..cache import BlobStore, LRUCache, SQLiteCache, get_cache_dir
+
+
+class TreeCache:
+    """
+    仓库文件树缓存，按 commit SHA 索引
+
+    同一个 commit 的文件树永远不会变化，因此缓存不需要过期或重新验证；
+    内存 LRU 在前，SQLite 持久化在后，进程重启后仍可复用
+    """
+
+    def __init__(self, max_entries: int = 256, persist_entries: int = 4096):
+        """
+        Args:
+            max_entries: 内存中最多缓存的文件树数
+            persist_entries: 磁盘中最多缓存的文件树数
+        """
+        self._memory = LRUCache(max_entries=max_entries)
+        self._disk = SQLiteCache(get_cache_dir() / "repo_trees.sqlite3", max_entries=persist_entries)
+        # 本进程中读写过文件树的仓库，用于在解析 commit SHA 之前判断是否值得走 blob 路径
+        self._repos = LRUCache(max_entries=max_entries)
+
+    @staticmethod
+    def make_key(repo_full_name: str, sha: str) -> str:
+        return f"{repo_full_name.lower()}@{sha}"
+
+    def get(self, repo_full_name: str, sha: str) -> Optional[List[Dict]]:
+        """读取文件树（内存优先，未命中时回落到磁盘并回填内存）"""
+        key = self.make_key(repo_full_name, sha)
+        tree = self._memory.get(key)
+        if tree is None:
+            tree = self._disk.get(key)
+            if tree is not None:
+                self._memory.set(key, tree)
+        if tree is not None:
+            self._repos.set(repo_full_name.lower(), True)
+        return tree
+
+    def has_repo(self, repo_full_name: str) -> bool:
+        """本进程中是否读写过该仓库的文件树（不发送请求，也不查询磁盘）"""
+        return self._repos.get(repo_full_name.lower()) is not None
+
+    def set(self, repo_full_name: str, sha: str, tree: List[Dict]) -> None:
+        key = self.make_key(repo_full_name, sha)
+        self._memory.set(key, tree)
+        self._disk.set(key, tree)
+        self._repos.set(repo_full_name.lower(), True)
+
+
+_tree_cache: Optional[TreeCache] = None
+_tree_cache_lock = threading.Lock()
+
+
+def get_tree_cache() -> TreeCache:
+    """
+    获取进程内共享的 TreeCache
+
+    可通过环境变量配置：
+    - GITHUB_TREE_CACHE_MAX_ENTRIES: 内存中最多缓存的文件树数，默认 256
+    """
+    global _tree_cache
+    with _tree_cache_lock:
+        if _tree_cache is None:
+            max_entries = int(os.getenv("GITHUB_TREE_CACHE_MAX_ENTRIES", "256"))
+            _tree_cache = TreeCache(max_entries=max_entries, persist_entries=max_entries * 16)
+        return _tree_cache
+
+
+_blob_store: Optional[BlobStore] = None
+_blob_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """
+    获取进程内共享的 BlobStore，文件保存在缓存目录的 blobs/ 下
+
+    可通过环境变量配置：
+    - GITHUB_BLOB_CACHE_MAX_MB: 内存中缓存文件内容的上限（MB），默认 32
+    """
+    global _blob_store
+    with _blob_store_lock:
+        if _blob_store is None:
+            _blob_store = BlobStore(
+                get_cache_dir() / "blobs",
+                max_memory_bytes=int(float(os.getenv("GITHUB_BLOB_CACHE_MAX_MB", "32")) * 1024 * 1024),
+            )
+        return _blob_store
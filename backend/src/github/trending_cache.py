@@ -0,0 +1,153 @@
+"""
+trending 快照缓存：按 since（daily / weekly / monthly）缓存 trending 项目列表，
+过期后先返回旧快照再在后台刷新（stale-while-revalidate），后台任务在过期前主动刷新
+"""
+
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Snapshot(Generic[T]):
+    __slots__ = ("value", "fetched_at")
+
+    def __init__(self, value: List[T], fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+
+
+class TrendingSnapshotCache(Generic[T]):
+    """
+    带 TTL 的快照缓存
+
+    - 快照未过期：直接返回内存中的快照
+    - 快照已过期但未超过 max_stale：返回旧快照，同时在后台刷新
+    - 没有快照或快照过旧：等待加载（同一个 key 的并发请求只加载一次）
+    - 后台刷新任务在快照过期前主动刷新所有已加载过的 key，页面请求不需要等待 GitHub
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Hashable], Awaitable[List[T]]],
+        ttl: float = 1800.0,
+        max_stale: float = 86400.0,
+        refresh_ahead: float = 0.8,
+    ):
+        """
+        Args:
+            loader: 加载快照的协程函数，参数为 key；返回空列表视为加载失败，保留旧快照
+            ttl: 快照有效期（秒）
+            max_stale: 过期快照最多还能返回多久（秒），超过后请求会等待重新加载
+            refresh_ahead: 后台任务在快照存在 ttl * refresh_ahead 秒后刷新
+        """
+        self.loader = loader
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.refresh_ahead = refresh_ahead
+        self._snapshots: Dict[Hashable, _Snapshot[T]] = {}
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """快照已存在的秒数，没有快照时返回 None"""
+        snapshot = self._snapshots.get(key)
+        return time.monotonic() - snapshot.fetched_at if snapshot else None
+
+    async def get(self, key: Hashable) -> List[T]:
+        """获取快照，参见类说明中的过期策略"""
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None:
+            age = time.monotonic() - snapshot.fetched_at
+            if age < self.ttl:
+                return snapshot.value
+            if age < self.ttl + self.max_stale:
+                self._schedule_refresh(key)
+                return snapshot.value
+
+        # 刷新任务由所有等待者共享，某个请求被取消（如客户端断开）时不能取消其他请求的加载
+        refreshed = await asyncio.shield(self._schedule_refresh(key))
+        if refreshed is not None:
+            return refreshed.value
+        # 加载失败时，即使快照过旧也比返回空列表好
+        return snapshot.value if snapshot is not None else []
+
+    def _schedule_refresh(self, key: Hashable) -> "asyncio.Task[Optional[_Snapshot[T]]]":
+        """启动（或复用进行中的）刷新任务"""
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh(key))
+            self._inflight[key] = task
+        return task
+
+    async def _refresh(self, key: Hashable) -> Optional[_Snapshot[T]]:
+        try:
+            value = await self.loader(key)
+        except Exception as e:
+            print(f"⚠️ 刷新 trending 快照失败 ({key}): {e}")
+            value = []
+        finally:
+            self._inflight.pop(key, None)
+
+        if not value:
+            return None
+        snapshot = _Snapshot(value, time.monotonic())
+        self._snapshots[key] = snapshot
+        return snapshot
+
+    async def refresh_due(self) -> None:
+        """刷新所有即将过期的快照"""
+        threshold = self.ttl * self.refresh_ahead
+        due = [key for key in self._snapshots if self.age(key) >= threshold]
+        if due:
+            await asyncio.gather(*(self._schedule_refresh(key) for key in due))
+
+    def start(self, warm_keys: List[Hashable] = (), interval: float = 60.0) -> None:
+        """
+        启动后台刷新任务
+
+        Args:
+            warm_keys: 启动时预先加载的 key
+            interval: 检查快照是否需要刷新的间隔（秒）
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+
+        async def run():
+            for key in warm_keys:
+                self._schedule_refresh(key)
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.refresh_due()
+                except Exception as e:
+                    print(f"⚠️ trending 快照后台刷新出错: {e}")
+
+        self._refresh_task = asyncio.create_task(run())
+
+    async def stop(self) -> None:
+        """停止后台刷新任务"""
+        tasks = [t for t in [self._refresh_task, *self._inflight.values()] if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refresh_task = None
+        self._inflight.clear()
+
+
+def get_trending_cache_settings() -> Dict[str, float]:
+    """
+    读取快照缓存配置
+
+    可通过环境变量配置：
+    - TRENDING_CACHE_TTL: 快照有效期（秒），默认 1800
+    - TRENDING_CACHE_MAX_STALE: 过期快照最多还能返回多久（秒），默认 86400
+    - TRENDING_CACHE_REFRESH_INTERVAL: 后台检查间隔（秒），默认 60
+    """
+    return {
+        "ttl": float(os.getenv("TRENDING_CACHE_TTL", "1800")),
+        "max_stale": float(os.getenv("TRENDING_CACHE_MAX_STALE", "86400")),
+        "interval": float(os.getenv("TRENDING_CACHE_REFRESH_INTERVAL", "60")),
+    }
@@ -0,0 +1,30 @@
+"""LLM 相关的共享组件：响应缓存、复用的模型实例、token 计数、README 预处理"""
+
+from .cache import LRULLMCache, SQLiteLLMCache, get_llm_cache
+from .models import close_llm_http_clients, get_chat_model, get_llm_http_clients
+from .readme import (
+    PLANNING_README_TOKENS,
+    SUMMARY_README_TOKENS,
+    VALIDATION_README_TOKENS,
+    normalize_readme,
+    prepare_readme,
+    readme_settings_tag,
+)
+from .tokens import count_tokens, truncate_to_tokens
+
+__all__ = [
+    "LRULLMCache",
+    "PLANNING_README_TOKENS",
+    "SQLiteLLMCache",
+    "SUMMARY_README_TOKENS",
+    "VALIDATION_README_TOKENS",
+    "close_llm_http_clients",
+    "count_tokens",
+    "get_chat_model",
+    "get_llm_cache",
+    "get_llm_http_clients",
+    "normalize_readme",
+    "prepare_readme",
+    "readme_settings_tag",
+    "truncate_to_tokens",
+]
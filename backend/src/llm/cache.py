@@ -0,0 +1,164 @@
+"""
+LLM 响应缓存：所有节点都以 temperature=0 调用模型，相同的输入可以直接复用之前的输出
+
+实现 LangChain 的 BaseCache 接口，通过 init_chat_model(cache=...) 接入；
+LangChain 生成的 llm_string 已经包含模型、供应商参数、绑定的工具和结构化输出 schema，
+prompt 是序列化后的完整消息列表，二者一起作为缓存 key
+"""
+
+import hashlib
+import json
+import os
+import threading
+import warnings
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumpd, load
+from langchain_core.outputs import Generation
+
+from ..cache import LRUCache, SQLiteCache, get_cache_dir
+
+
+# 不影响模型输出的构造参数：超时由请求截止时间推导，每次调用都不同，不能参与缓存 key
+VOLATILE_MODEL_PARAMS = ("request_timeout", "timeout", "default_request_timeout", "max_retries")
+
+
+def normalize_llm_string(llm_string: str) -> str:
+    """去掉 llm_string 中不影响模型输出的参数（如超时、重试次数）"""
+    model_part, sep, call_part = llm_string.partition("---")
+    try:
+        model = json.loads(model_part)
+    except ValueError:
+        return llm_string
+    kwargs = model.get("kwargs") if isinstance(model, dict) else None
+    if isinstance(kwargs, dict):
+        for name in VOLATILE_MODEL_PARAMS:
+            kwargs.pop(name, None)
+    return json.dumps(model, sort_keys=True) + sep + call_part
+
+
+def make_llm_cache_key(prompt: str, llm_string: str) -> str:
+    """prompt 可能包含完整的 README，使用摘要作为 key"""
+    return hashlib.sha256(f"{normalize_llm_string(llm_string)}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+def _serialize(generations: Sequence[Generation]) -> list:
+    return [dumpd(generation) for generation in generations]
+
+
+def _deserialize(data: list) -> Optional[RETURN_VAL_TYPE]:
+    try:
+        with warnings.catch_warnings():
+            # load 在 langchain_core 中仍标记为 beta
+            warnings.simplefilter("ignore")
+            # 只传入所有受支持的 langchain_core 版本都有的参数，默认只允许加载 langchain 命名空间下的类
+            return [load(item) for item in data]
+    except (ValueError, KeyError, ImportError):
+        # 其它 langchain_core 版本写入的数据无法解析时视为未命中；
+        # 调用方式本身的错误（如 TypeError）直接抛出，不能伪装成未命中
+        return None
+
+
+class LRULLMCache(BaseCache):
+    """进程内存 LRU 缓存"""
+
+    def __init__(self, max_entries: int = 2048):
+        """
+        Args:
+            max_entries: 最多缓存的响应数
+        """
+        self._cache = LRUCache(max_entries=max_entries)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        return self._cache.get(make_llm_cache_key(prompt, llm_string))
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self._cache.set(make_llm_cache_key(prompt, llm_string), list(return_val))
+
+    def clear(self, **kwargs: Any) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+class SQLiteLLMCache(BaseCache):
+    """SQLite 持久化缓存，前面有一层内存 LRU，进程重启后仍可复用"""
+
+    def __init__(
+        self,
+        ttl: Optional[float] = 7 * 86400,
+        max_entries: Optional[int] = 20000,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+        memory_entries: int = 512,
+    ):
+        """
+        Args:
+            ttl: 响应的有效期（秒）
+            max_entries: 磁盘中最多缓存的响应数
+            max_bytes: 磁盘中压缩后的最大总字节数
+            memory_entries: 内存中最多缓存的响应数
+        """
+        self._memory = LRUCache(max_entries=memory_entries, ttl=ttl)
+        self._disk = SQLiteCache(
+            get_cache_dir() / "llm_responses.sqlite3",
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl=ttl,
+        )
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = make_llm_cache_key(prompt, llm_string)
+        generations = self._memory.get(key)
+        if generations is None:
+            data = self._disk.get(key)
+            generations = _deserialize(data) if data is not None else None
+            if generations is not None:
+                self._memory.set(key, generations)
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = make_llm_cache_key(prompt, llm_string)
+        self._memory.set(key, list(return_val))
+        self._disk.set(key, _serialize(return_val))
+
+    def clear(self, **kwargs: Any) -> None:
+        self._memory.clear()
+        self._disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._disk.stats()
+
+
+_llm_cache: Optional[BaseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[BaseCache]:
+    """
+    获取进程内共享的 LLM 响应缓存
+
+    可通过环境变量配置：
+    - LLM_CACHE: 缓存后端，sqlite（默认）/ memory / none
+    - LLM_CACHE_TTL: 响应有效期（秒），默认 604800（7 天），仅 sqlite
+    - LLM_CACHE_MAX_ENTRIES: 最多缓存的响应数，默认 20000
+
+    Returns:
+        BaseCache；LLM_CACHE=none 时返回 None
+    """
+    global _llm_cache
+    backend = os.getenv("LLM_CACHE", "sqlite").lower()
+    if backend == "none":
+        return None
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+            if backend == "memory":
+                _llm_cache = LRULLMCache(max_entries=max_entries)
+            else:
+                _llm_cache = SQLiteLLMCache(
+                    ttl=float(os.getenv("LLM_CACHE_TTL", str(7 * 86400))),
+                    max_entries=max_entries,
+                )
+        return _llm_cache
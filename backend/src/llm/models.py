@@ -0,0 +1,138 @@
+"""
+共享的模型实例工厂：按 (供应商, 模型, temperature, 缓存, 超时档位, 结构化输出 schema / 绑定的工具)
+复用模型实例，OpenAI 兼容的供应商共用同一组连接池，避免每次节点调用都重新创建客户端、重新握手
+"""
+
+import os
+import threading
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+import httpx
+from langchain.chat_models import init_chat_model
+
+from ..resilience import DeadlineExceeded
+from .cache import get_llm_cache
+
+# 使用 openai SDK 的供应商，可以传入共享的 httpx 客户端
+OPENAI_COMPATIBLE_PROVIDERS = ("openai", "deepseek", "azure_openai")
+
+# 超时档位（秒）：请求截止时间推导出的超时向下取整到档位，避免每个不同的超时值都创建一个模型实例
+TIMEOUT_BUCKETS = (1, 2, 3, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300)
+
+
+def timeout_bucket(timeout: Optional[float]) -> Optional[float]:
+    """
+    把超时时间取整到不超过它的最大档位，保证模型调用不会超过请求剩余时间
+
+    Args:
+        timeout: 超时时间（秒），None 表示不限制
+
+    Raises:
+        DeadlineExceeded: 超时时间小于最小档位，剩余时间已不够一次模型调用
+    """
+    if timeout is None:
+        return None
+    fitting = [bucket for bucket in TIMEOUT_BUCKETS if bucket <= timeout]
+    if not fitting:
+        raise DeadlineExceeded(f"剩余时间 {timeout:.2f}s 不足以调用模型")
+    return float(fitting[-1])
+
+
+_http_clients: Optional[Tuple[httpx.Client, httpx.AsyncClient]] = None
+_models: Dict[Hashable, Any] = {}
+_lock = threading.Lock()
+
+
+def get_llm_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    获取模型调用共享的 httpx 客户端（同步、异步各一个）
+
+    可通过环境变量配置：
+    - LLM_HTTP_MAX_CONNECTIONS: 最大连接数，默认 50
+    - LLM_HTTP_MAX_KEEPALIVE: 最多保持的空闲连接数，默认 20
+    - LLM_HTTP_KEEPALIVE_EXPIRY: 空闲连接保持时间（秒），默认 60
+    """
+    global _http_clients
+    with _lock:
+        if _http_clients is None:
+            limits = httpx.Limits(
+                max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "50")),
+                max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20")),
+                keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "60")),
+            )
+            # 单次请求的超时由 openai SDK 按模型实例的 timeout 设置
+            _http_clients = (httpx.Client(limits=limits), httpx.AsyncClient(limits=limits))
+        return _http_clients
+
+
+def get_chat_model(
+    model: Optional[str],
+    provider: Optional[str] = None,
+    temperature: float = 0,
+    cache: bool = True,
+    timeout: Optional[float] = None,
+    schema: Optional[type] = None,
+    tools: Optional[Sequence[Any]] = None,
+    tool_choice: Optional[str] = None,
+) -> Any:
+    """
+    获取复用的模型实例
+
+    Args:
+        model: 模型名称
+        provider: 模型供应商，None 时由 init_chat_model 根据模型名称推断
+        temperature: 采样温度
+        cache: 是否使用 LLM 响应缓存
+        timeout: 调用超时（秒），会取整到 TIMEOUT_BUCKETS 中的档位；
+            模型实例不在 SDK 内部重试（max_retries=0），重试由调用方的 invoke_with_retry 负责
+        schema: 结构化输出的 schema（with_structured_output）
+        tools: 绑定的工具（bind_tools），与 schema 互斥
+        tool_choice: 绑定工具时的 tool_choice，如 "none" 表示禁止调用工具
+
+    Returns:
+        模型实例，或绑定了 schema / 工具的 Runnable
+    """
+    timeout = timeout_bucket(timeout)
+    tool_names = tuple(getattr(tool, "name", repr(tool)) for tool in tools) if tools else None
+    key = (provider, model, temperature, cache, timeout, schema, tool_names, tool_choice)
+    with _lock:
+        runnable = _models.get(key)
+    if runnable is not None:
+        return runnable
+
+    if schema is not None or tools:
+        base = get_chat_model(model, provider, temperature, cache, timeout)
+        if schema is not None:
+            runnable = base.with_structured_output(schema)
+        else:
+            runnable = base.bind_tools(tools, tool_choice=tool_choice)
+    else:
+        kwargs: Dict[str, Any] = {}
+        if provider in OPENAI_COMPATIBLE_PROVIDERS:
+            kwargs["http_client"], kwargs["http_async_client"] = get_llm_http_clients()
+        runnable = init_chat_model(
+            model=model,
+            model_provider=provider,
+            temperature=temperature,
+            timeout=timeout,
+            # 重试由 invoke_with_retry 负责，每次尝试按剩余时间重新推导超时；SDK 自身的重试会让调用次数成倍增加
+            max_retries=0,
+            cache=get_llm_cache() if cache else False,
+            **kwargs,
+        )
+
+    with _lock:
+        # 并发创建时保留先写入的实例
+        return _models.setdefault(key, runnable)
+
+
+async def close_llm_http_clients() -> None:
+    """关闭共享的 httpx 客户端（应用关闭时调用）"""
+    global _http_clients
+    with _lock:
+        clients, _http_clients = _http_clients, None
+        _models.clear()
+    if clients is not None:
+        sync_client, async_client = clients
+        sync_client.close()
+        await async_client.aclose()
@@ -0,0 +1,173 @@
+"""
+README 预处理：去掉徽章、图片、HTML 等对模型没有信息量的内容，折叠链接、截短大段代码，
+再按每个提示词的 token 预算截断；结果按 README 的 git blob SHA 缓存，同一个 README 只处理一次
+"""
+
+import html
+import os
+import re
+from typing import List, Optional
+
+from ..cache import LRUCache, git_blob_sha
+from .tokens import count_tokens, truncate_to_tokens
+
+# 各提示词中 README 的 token 预算：项目验证、ReAct 的思考和生成搜索查询、最终总结
+VALIDATION_README_TOKENS = int(os.getenv("README_VALIDATION_TOKENS", "4000"))
+PLANNING_README_TOKENS = int(os.getenv("README_PLANNING_TOKENS", "2000"))
+SUMMARY_README_TOKENS = int(os.getenv("README_SUMMARY_TOKENS", "8000"))
+
+# 代码块最多保留的行数
+CODE_BLOCK_MAX_LINES = int(os.getenv("README_CODE_BLOCK_MAX_LINES", "20"))
+
+TRUNCATED_NOTICE = "\n\n……（README 过长，以下内容已省略）"
+
+# README 清理规则的版本，修改 normalize_readme 的清理规则时递增
+NORMALIZATION_VERSION = "1"
+
+# 标题匹配时整节删除：贡献者头像墙、star 曲线、赞助商列表等
+NOISE_SECTION_RE = re.compile(
+    r"^(?:(?:contributors?|contributing|star history|stargazers|sponsors?|backers?|acknowledge?ments?)\b"
+    r"|贡献者|致谢|赞助|star 历史)",
+    re.IGNORECASE,
+)
+
+_FENCE_RE = re.compile(r"^( {0,3})(`{3,}|~{3,})[^\n]*\n.*?^ {0,3}\2[`~]*[ \t]*$", re.MULTILINE | re.DOTALL)
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_HTML_MEDIA_RE = re.compile(r"<(picture|svg|video|audio)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_HTML_IMG_RE = re.compile(r"<(img|source)\b[^>]*>", re.IGNORECASE)
+_HTML_BREAK_RE = re.compile(r"<(br|/p|/div|/h[1-6]|/li|/tr)\s*/?>", re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r"</?[a-zA-Z][a-zA-Z0-9-]*(\s[^<>]*)?/?>")
+# 链接中的图片（徽章通常是这种形式）、普通图片、引用式图片
+_LINKED_IMAGE_RE = re.compile(r"\[\s*!\[[^\]]*\]\([^)]*\)\s*\]\([^)]*\)")
+_IMAGE_RE = re.compile(r"!\[[^\]]*\](\([^)]*\)|\[[^\]]*\])")
+_LINK_RE = re.compile(r"\[([^\]]+)\]\([^)]*\)")
+_REF_LINK_RE = re.compile(r"\[([^\]]+)\]\[[^\]]*\]")
+_REF_DEFINITION_RE = re.compile(r"^ {0,3}\[[^\]]+\]:\s*\S+.*$", re.MULTILINE)
+_AUTOLINK_RE = re.compile(r"<(https?://[^>\s]+)>")
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+
+
+def _cap_code_block(block: str, max_lines: int) -> str:
+    """代码块只保留前 max_lines 行，并注明省略的行数"""
+    lines = block.split("\n")
+    # 首行是开始的围栏，末行是结束的围栏
+    body = lines[1:-1]
+    if len(body) <= max_lines:
+        return block
+    omitted = len(body) - max_lines
+    return "\n".join([lines[0], *body[:max_lines], f"# ……（省略 {omitted} 行）", lines[-1]])
+
+
+def _strip_markup(text: str) -> str:
+    """去掉代码块之外的 HTML、图片和徽章，把链接折叠为链接文字"""
+    text = _HTML_COMMENT_RE.sub("", text)
+    text = _HTML_MEDIA_RE.sub("", text)
+    text = _HTML_IMG_RE.sub("", text)
+    text = _HTML_BREAK_RE.sub("\n", text)
+    text = _HTML_TAG_RE.sub("", text)
+    text = _LINKED_IMAGE_RE.sub("", text)
+    text = _IMAGE_RE.sub("", text)
+    text = _LINK_RE.sub(r"\1", text)
+    text = _REF_LINK_RE.sub(r"\1", text)
+    text = _REF_DEFINITION_RE.sub("", text)
+    text = _AUTOLINK_RE.sub(r"\1", text)
+    return html.unescape(text)
+
+
+def _drop_noise_sections(lines: List[str]) -> List[str]:
+    """删除标题匹配 NOISE_SECTION_RE 的整节（直到出现同级或更高级的标题）"""
+    kept = []
+    skip_level: Optional[int] = None
+    for line in lines:
+        heading = _HEADING_RE.match(line)
+        if heading:
+            level = len(heading.group(1))
+            if skip_level is not None and level > skip_level:
+                continue
+            skip_level = level if NOISE_SECTION_RE.match(heading.group(2).strip()) else None
+        if skip_level is None:
+            kept.append(line)
+    return kept
+
+
+def normalize_readme(readme: str, code_block_max_lines: int = CODE_BLOCK_MAX_LINES) -> str:
+    """
+    清理 README 中对模型没有信息量的内容
+
+    Args:
+        readme: 原始 README 文本（Markdown / HTML 混排）
+        code_block_max_lines: 代码块最多保留的行数
+
+    Returns:
+        清理后的文本
+    """
+    if not readme:
+        return ""
+    readme = readme.replace("\r\n", "\n")
+
+    # 代码块内容原样保留（只截短），其余部分清理标记
+    parts = []
+    position = 0
+    for match in _FENCE_RE.finditer(readme):
+        parts.append(_strip_markup(readme[position:match.start()]))
+        parts.append(_cap_code_block(match.group(0), code_block_max_lines))
+        position = match.end()
+    parts.append(_strip_markup(readme[position:]))
+
+    lines = _drop_noise_sections("".join(parts).split("\n"))
+    cleaned = []
+    for line in lines:
+        line = line.rstrip()
+        # 只剩分隔符的行（如删除徽章后剩下的 "|"、"·"）
+        if line and not re.search(r"[^\s|·•,.\-–—/]", line):
+            line = ""
+        if line or (cleaned and cleaned[-1]):
+            cleaned.append(line)
+    return "\n".join(cleaned).strip()
+
+
+def readme_settings_tag(*max_tokens: int) -> str:
+    """
+    README 预处理设置的标识：清理规则版本、代码块行数上限和 token 预算
+
+    缓存了基于处理后 README 的结果（总结、验证结论）时，把它加入缓存 key，
+    预算或清理规则变化后旧结果自动失效
+
+    Args:
+        max_tokens: 结果所用提示词的 README token 预算
+    """
+    return ":".join(["readme", NORMALIZATION_VERSION, str(CODE_BLOCK_MAX_LINES), *map(str, max_tokens)])
+
+
+# 键为 README SHA（清理结果）或 (README SHA, 预算)（截断结果）
+_prepared = LRUCache(max_entries=1024, max_bytes=64 * 1024 * 1024)
+
+
+def prepare_readme(readme: Optional[str], max_tokens: int) -> str:
+    """
+    README 放入提示词前的预处理：清理标记后按 token 预算截断，结果按 (README SHA, 预算) 缓存
+
+    Args:
+        readme: 原始 README 文本
+        max_tokens: README 在提示词中的 token 预算
+
+    Returns:
+        处理后的 README；被截断时末尾附带省略说明
+    """
+    if not readme:
+        return ""
+    key = (git_blob_sha(readme.encode("utf-8")), max_tokens)
+    prepared = _prepared.get(key)
+    if prepared is not None:
+        return prepared
+
+    normalized = _prepared.get(key[0])
+    if normalized is None:
+        normalized = normalize_readme(readme)
+        _prepared.set(key[0], normalized)
+    if count_tokens(normalized) > max_tokens:
+        prepared = truncate_to_tokens(normalized, max_tokens - count_tokens(TRUNCATED_NOTICE)).rstrip() + TRUNCATED_NOTICE
+    else:
+        prepared = normalized
+    _prepared.set(key, prepared)
+    return prepared
@@ -0,0 +1,71 @@
+"""
+token 计数与截断：优先使用 tiktoken，编码文件无法加载（如离线环境）时退回到按字符估算
+"""
+
+import os
+import threading
+from typing import Any, Optional
+
+_encoding: Optional[Any] = None
+_encoding_failed = False
+_encoding_lock = threading.Lock()
+
+
+def get_encoding() -> Optional[Any]:
+    """
+    获取 tiktoken 编码，加载失败时返回 None（只尝试一次）
+
+    可通过环境变量配置：
+    - LLM_TOKENIZER_ENCODING: tiktoken 编码名称，默认 o200k_base
+    """
+    global _encoding, _encoding_failed
+    with _encoding_lock:
+        if _encoding is None and not _encoding_failed:
+            try:
+                import tiktoken
+
+                _encoding = tiktoken.get_encoding(os.getenv("LLM_TOKENIZER_ENCODING", "o200k_base"))
+            except Exception as e:
+                _encoding_failed = True
+                print(f"⚠️ 无法加载 tiktoken 编码，改为按字符估算 token 数: {e}")
+        return _encoding
+
+
+def _char_cost(char: str) -> float:
+    """估算单个字符的 token 数：中日韩字符约 1 个 token，其他字符约 4 个一个 token"""
+    return 1.0 if "⺀" <= char <= "鿿" or "가" <= char <= "힯" else 0.25
+
+
+def count_tokens(text: str) -> int:
+    """计算文本的 token 数"""
+    if not text:
+        return 0
+    encoding = get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return int(sum(_char_cost(char) for char in text)) + 1
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    把文本截断到不超过 max_tokens 个 token
+
+    Args:
+        text: 原始文本
+        max_tokens: token 上限
+    """
+    if not text or max_tokens <= 0:
+        return ""
+    encoding = get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens])
+
+    cost = 1.0
+    for index, char in enumerate(text):
+        cost += _char_cost(char)
+        if cost > max_tokens:
+            return text[:index]
+    return text
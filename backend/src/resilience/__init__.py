@@ -0,0 +1,43 @@
+"""容错组件：指数退避重试、熔断器、请求截止时间"""
+
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from .deadline import (
+    Deadline,
+    DeadlineExceeded,
+    current_deadline,
+    deadline_scope,
+    get_deadline,
+    remaining_timeout,
+    request_deadline,
+)
+from .retry import (
+    NO_RETRY,
+    RetryPolicy,
+    ainvoke_with_retry,
+    aretry_call,
+    invoke_with_retry,
+    is_server_error,
+    is_transient_error,
+    retry_call,
+)
+
+__all__ = [
+    "NO_RETRY",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "Deadline",
+    "DeadlineExceeded",
+    "RetryPolicy",
+    "ainvoke_with_retry",
+    "aretry_call",
+    "current_deadline",
+    "deadline_scope",
+    "get_circuit_breaker",
+    "get_deadline",
+    "invoke_with_retry",
+    "is_server_error",
+    "is_transient_error",
+    "remaining_timeout",
+    "request_deadline",
+    "retry_call",
+]
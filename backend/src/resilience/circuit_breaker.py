@@ -0,0 +1,104 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """熔断器处于打开状态，调用被直接拒绝"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} 暂时不可用（熔断中），{retry_in:.0f}s 后重试")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    熔断器
+
+    - closed：正常调用，连续失败达到阈值后打开
+    - open：直接拒绝调用（快速失败），不占用线程等待注定失败的请求；recovery_timeout 后进入 half-open
+    - half-open：只放行一个试探调用，成功则关闭，失败则重新打开
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Args:
+            name: 依赖名称（用于日志）
+            failure_threshold: 连续失败多少次后打开
+            recovery_timeout: 打开后多少秒进入 half-open 试探
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """调用前检查，熔断中时抛出 CircuitOpenError"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if self.state == self.OPEN and elapsed >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            raise CircuitOpenError(self.name, max(0.0, self.recovery_timeout - elapsed))
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"✅ {self.name} 已恢复，熔断器关闭")
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def release(self) -> None:
+        """调用结果不能说明依赖是否可用（如因请求截止时间中止）时，只释放 half-open 的试探名额"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"⚡ {self.name} 连续失败 {self._failures} 次，熔断 {self.recovery_timeout:.0f}s")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    获取依赖对应的共享熔断器（如 "github"、"tavily"、"llm"）
+
+    可通过环境变量配置：
+    - CIRCUIT_BREAKER_FAILURE_THRESHOLD: 连续失败多少次后熔断，默认 5
+    - CIRCUIT_BREAKER_RECOVERY_TIMEOUT: 熔断持续秒数，默认 30
+    """
+    with _breakers_lock:
+        breaker: Optional[CircuitBreaker] = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_threshold=int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")),
+                recovery_timeout=float(os.getenv("CIRCUIT_BREAKER_RECOVERY_TIMEOUT", "30")),
+            )
+            _breakers[name] = breaker
+        return breaker
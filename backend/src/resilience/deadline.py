@@ -0,0 +1,120 @@
+"""
+请求级截止时间：由 API 请求设置，经 LangGraph config 和 contextvar 传递到每个节点、
+工具和 HTTP 调用，下游的超时都从剩余时间中推导
+"""
+
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """请求的截止时间已到"""
+
+
+class Deadline:
+    """基于 time.monotonic() 的绝对截止时间"""
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, expires_at: float):
+        """
+        Args:
+            expires_at: 截止时刻（time.monotonic() 时钟）
+        """
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """创建 seconds 秒后到期的截止时间"""
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """剩余秒数（已过期时为 0）"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def running_out(self, reserve: float = 0.0) -> bool:
+        """剩余时间是否已不足 reserve 秒（用于预留生成最终结果的时间）"""
+        return self.remaining() <= reserve
+
+    def timeout(self, default: Optional[float] = None) -> float:
+        """
+        推导下游调用的超时时间：不超过 default，也不超过剩余时间
+
+        Raises:
+            DeadlineExceeded: 截止时间已到
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("请求截止时间已到")
+        return remaining if default is None else min(default, remaining)
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.1f}s)"
+
+
+_current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """当前上下文的截止时间，没有设置时返回 None"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """在 with 块内设置当前上下文的截止时间（asyncio Task 和 LangGraph 节点会继承）"""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def get_deadline(config: Optional[Mapping[str, Any]] = None) -> Optional[Deadline]:
+    """
+    读取截止时间：优先使用 LangGraph config 中的 configurable.deadline，其次是当前上下文
+
+    Args:
+        config: LangGraph 传给节点的 RunnableConfig
+    """
+    if config:
+        deadline = (config.get("configurable") or {}).get("deadline")
+        if isinstance(deadline, Deadline):
+            return deadline
+    return current_deadline()
+
+
+def remaining_timeout(default: Optional[float] = None) -> Optional[float]:
+    """
+    根据当前上下文的截止时间推导超时时间；没有截止时间时返回 default
+
+    Raises:
+        DeadlineExceeded: 截止时间已到
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return default
+    return deadline.timeout(default)
+
+
+def request_deadline(seconds: Optional[float] = None) -> Deadline:
+    """
+    为一个 API 请求创建截止时间
+
+    Args:
+        seconds: 请求指定的时间预算（秒）；未指定时使用环境变量 REQUEST_DEADLINE_SECONDS，默认 120，
+            并且不超过 REQUEST_DEADLINE_MAX_SECONDS（默认 300）
+    """
+    max_seconds = float(os.getenv("REQUEST_DEADLINE_MAX_SECONDS", "300"))
+    if seconds is None or seconds <= 0:
+        seconds = float(os.getenv("REQUEST_DEADLINE_SECONDS", "120"))
+    return Deadline.after(min(seconds, max_seconds))
@@ -0,0 +1,205 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, NamedTuple, Optional, TypeVar
+
+import httpx
+import requests
+
+from .circuit_breaker import CircuitBreaker, get_circuit_breaker
+from .deadline import DeadlineExceeded, current_deadline
+
+T = TypeVar("T")
+
+
+class RetryPolicy(NamedTuple):
+    """重试策略：指数退避 + 全抖动（full jitter）"""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def delay(self, attempt: int) -> float:
+        """第 attempt 次（从 0 开始）失败后的等待秒数，在 [0, min(max_delay, base_delay * 2^attempt)] 内随机"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+# 非幂等调用不重试
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def _fits_deadline(delay: float) -> bool:
+    """等待 delay 秒后是否还在请求截止时间之内（没有截止时间时总是 True）"""
+    deadline = current_deadline()
+    return deadline is None or delay < deadline.remaining()
+
+
+def _deadline_reached(error: BaseException) -> bool:
+    """异常是否由请求截止时间到达引起"""
+    if isinstance(error, DeadlineExceeded):
+        return True
+    deadline = current_deadline()
+    return deadline is not None and deadline.expired and is_transient_error(error)
+
+
+def is_server_error(status_code: Optional[int]) -> bool:
+    """5xx 响应视为暂时性故障"""
+    return status_code is not None and status_code >= 500
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    判断异常是否为暂时性故障（可以重试、计入熔断）
+
+    连接失败、超时、5xx、429 视为暂时性故障；4xx（参数错误、认证失败等）重试也不会成功
+    """
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(error, (httpx.TransportError, TimeoutError, ConnectionError)):
+        return True
+    response = getattr(error, "response", None)
+    status_code = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if isinstance(status_code, int):
+        return is_server_error(status_code) or status_code == 429
+    # SDK 自定义的连接 / 超时异常（如 openai.APIConnectionError、APITimeoutError）
+    name = type(error).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+def retry_call(
+    fn: Callable[[], T],
+    policy: RetryPolicy = RetryPolicy(),
+    breaker: Optional[CircuitBreaker] = None,
+    retry_if_result: Optional[Callable[[T], bool]] = None,
+    discard: Optional[Callable[[T], Any]] = None,
+) -> T:
+    """
+    调用 fn，暂时性故障时按退避策略重试，并向熔断器报告结果
+
+    Args:
+        fn: 实际调用
+        policy: 重试策略；非幂等调用应使用 NO_RETRY
+        breaker: 熔断器（可选），熔断中时直接抛出 CircuitOpenError
+        retry_if_result: 判断返回值是否为暂时性故障（如 5xx 响应）
+        discard: 放弃一个需要重试的返回值前调用（如关闭响应）
+
+    Returns:
+        fn 的返回值；重试次数用完时返回最后一次的返回值或抛出最后一次的异常
+    """
+    for attempt in range(policy.max_attempts):
+        last_attempt = attempt == policy.max_attempts - 1
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = fn()
+        except Exception as e:
+            transient = is_transient_error(e)
+            if _deadline_reached(e):
+                # 请求自身的时间预算用完导致的超时不代表依赖故障，不计入熔断也不重试
+                if breaker is not None:
+                    breaker.release()
+                raise
+            if breaker is not None:
+                # 非暂时性错误（如 4xx）说明依赖本身可用，不计入熔断
+                if transient:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            delay = policy.delay(attempt)
+            if not transient or last_attempt or not _fits_deadline(delay):
+                raise
+            print(f"🔁 {breaker.name if breaker else '调用'}失败，{delay:.1f}s 后重试: {e}")
+            time.sleep(delay)
+            continue
+
+        if retry_if_result is not None and retry_if_result(result):
+            if breaker is not None:
+                breaker.record_failure()
+            delay = policy.delay(attempt)
+            if last_attempt or not _fits_deadline(delay):
+                return result
+            if discard is not None:
+                discard(result)
+            print(f"🔁 {breaker.name if breaker else '调用'}返回暂时性错误，{delay:.1f}s 后重试")
+            time.sleep(delay)
+            continue
+
+        if breaker is not None:
+            breaker.record_success()
+        return result
+    raise ValueError("policy.max_attempts 必须大于 0")
+
+
+async def aretry_call(
+    fn: Callable[[], Awaitable[T]],
+    policy: RetryPolicy = RetryPolicy(),
+    breaker: Optional[CircuitBreaker] = None,
+    retry_if_result: Optional[Callable[[T], bool]] = None,
+    discard: Optional[Callable[[T], Awaitable[Any]]] = None,
+) -> T:
+    """retry_call 的异步版本，fn 和 discard 为协程函数"""
+    for attempt in range(policy.max_attempts):
+        last_attempt = attempt == policy.max_attempts - 1
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = await fn()
+        except Exception as e:
+            transient = is_transient_error(e)
+            if _deadline_reached(e):
+                # 请求自身的时间预算用完导致的超时不代表依赖故障，不计入熔断也不重试
+                if breaker is not None:
+                    breaker.release()
+                raise
+            if breaker is not None:
+                # 非暂时性错误（如 4xx）说明依赖本身可用，不计入熔断
+                if transient:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            delay = policy.delay(attempt)
+            if not transient or last_attempt or not _fits_deadline(delay):
+                raise
+            print(f"🔁 {breaker.name if breaker else '调用'}失败，{delay:.1f}s 后重试: {e}")
+            await asyncio.sleep(delay)
+            continue
+
+        if retry_if_result is not None and retry_if_result(result):
+            if breaker is not None:
+                breaker.record_failure()
+            delay = policy.delay(attempt)
+            if last_attempt or not _fits_deadline(delay):
+                return result
+            if discard is not None:
+                await discard(result)
+            print(f"🔁 {breaker.name if breaker else '调用'}返回暂时性错误，{delay:.1f}s 后重试")
+            await asyncio.sleep(delay)
+            continue
+
+        if breaker is not None:
+            breaker.record_success()
+        return result
+    raise ValueError("policy.max_attempts 必须大于 0")
+
+
+def invoke_with_retry(
+    get_runnable: Callable[[], Any], input: Any, dependency: str = "llm", policy: RetryPolicy = RetryPolicy()
+) -> Any:
+    """
+    调用 LangChain Runnable（LLM、结构化输出等），暂时性故障时重试，依赖不可用时熔断
+
+    Args:
+        get_runnable: 返回具有 invoke 方法的对象的函数，每次尝试都会重新调用，
+            以便按请求剩余时间重新推导本次调用的超时（如 lambda: get_llm(schema=...)）
+        input: 调用参数
+        dependency: 熔断器名称
+        policy: 重试策略
+    """
+    return retry_call(lambda: get_runnable().invoke(input), policy, get_circuit_breaker(dependency))
+
+
+async def ainvoke_with_retry(
+    get_runnable: Callable[[], Any], input: Any, dependency: str = "llm", policy: RetryPolicy = RetryPolicy()
+) -> Any:
+    """invoke_with_retry 的异步版本"""
+    return await aretry_call(lambda: get_runnable().ainvoke(input), policy, get_circuit_breaker(dependency))
@@ -5,8 +5,10 @@ from .nodes import (
     generate_search_queries,
     generate_validate_criteria,
     search_github,
+    prefilter_projects,
     to_validate_projects,
     validate_project,
+    validate_projects_batch,
     validate_project_pro,
     should_continue,
     execute_tools,
@@ -24,8 +26,10 @@ def build_graph():
     graph.add_node("generate_search_queries", generate_search_queries)
     graph.add_node("search_github", search_github)
     graph.add_node("generate_validate_criteria", generate_validate_criteria)
+    graph.add_node("prefilter_projects", prefilter_projects)
     graph.add_node("to_validate_projects", to_validate_projects)
     graph.add_node("validate_project", validate_project)
+    graph.add_node("validate_projects_batch", validate_projects_batch)
     
     # 并行启动
     graph.add_edge(START, "generate_search_queries")
@@ -35,11 +39,13 @@ def build_graph():
     graph.add_edge("generate_search_queries", "search_github")
     
     # 汇聚
-    graph.add_edge("search_github", "to_validate_projects")
+    graph.add_edge("search_github", "prefilter_projects")
+    graph.add_edge("prefilter_projects", "to_validate_projects")
     graph.add_edge("generate_validate_criteria", "to_validate_projects")
     
     # 结束
     graph.add_edge("validate_project", END)
+    graph.add_edge("validate_projects_batch", END)
     
     return graph.compile()
 
@@ -79,6 +85,7 @@ def build_graph_pro():
     graph.add_node("generate_search_queries", generate_search_queries)
     graph.add_node("search_github", search_github)
     graph.add_node("generate_validate_criteria", generate_validate_criteria)
+    graph.add_node("prefilter_projects", prefilter_projects)
     graph.add_node("to_validate_projects_pro", to_validate_projects_pro)
     graph.add_node("validate_project_pro_wrapper", validate_project_pro_wrapper)
     
@@ -90,7 +97,8 @@ def build_graph_pro():
     graph.add_edge("generate_search_queries", "search_github")
     
     # 汇聚
-    graph.add_edge("search_github", "to_validate_projects_pro")
+    graph.add_edge("search_github", "prefilter_projects")
+    graph.add_edge("prefilter_projects", "to_validate_projects_pro")
     graph.add_edge("generate_validate_criteria", "to_validate_projects_pro")
     
     # 结束
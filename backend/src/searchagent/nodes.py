@@ -1,16 +1,31 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from langgraph.types import Command, Send
-from langchain.chat_models import init_chat_model
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
-from src.searchagent.schemas import SearchQueryList, ValidateCriteriaList, ProjectValidation
+from langchain_core.runnables import RunnableConfig
+from typing import Callable, Dict, List, Optional, Tuple
+from src.searchagent.schemas import SearchQueryList, ValidateCriteriaList, ProjectValidation, ProjectValidationBatch
 from .prompts import (
+    PROMPT_VERSION,
     generate_search_queries_prompt,
     validate_criteria_prompt,
     validate_project_prompt,
+    validate_projects_batch_prompt,
     validate_project_pro_prompt
 )
-from .state import OverallState, ProjectValidationState, ProjectValidationProState
-from src.github.github_client import GitHubClient
+from .state import OverallState, ProjectValidationState, ProjectValidationBatchState, ProjectValidationProState
+from .prefilter import get_prefilter_config, rank_repositories
+from .verdict_cache import get_verdict_cache
+from src.github.github_client import get_github_client
+from src.cache import SingleFlight, git_blob_sha, make_flight_key
+from src.llm import (
+    VALIDATION_README_TOKENS,
+    count_tokens,
+    get_chat_model,
+    prepare_readme,
+    readme_settings_tag,
+)
+from src.resilience import Deadline, deadline_scope, get_deadline, invoke_with_retry, remaining_timeout
 from langgraph.graph import END
 from .tools import validation_tools
 
@@ -18,29 +33,77 @@ from .tools import validation_tools
 MODEL_NAME = os.getenv("MODEL_NAME")
 MODEL_PROVIDER = os.getenv("MODEL_PROVIDER") or None
 
-def get_llm():
-    return init_chat_model(model=MODEL_NAME, model_provider=MODEL_PROVIDER, temperature=0)
+# 不同搜索会话同时验证同一个仓库（相同用户输入和验证标准）时只执行一次
+_validation_flight = SingleFlight()
+
+# 请求剩余时间不足该秒数时，验证不再调用工具，直接基于已有信息做出判断
+FINAL_ANSWER_RESERVE_SECONDS = float(os.getenv("VALIDATION_FINAL_RESERVE_SECONDS", "10"))
+
+# 批量验证：一次 LLM 调用验证多个项目
+BATCH_TOKEN_BUDGET = int(os.getenv("VALIDATION_BATCH_TOKEN_BUDGET", "12000"))
+BATCH_MAX_SIZE = int(os.getenv("VALIDATION_BATCH_MAX_SIZE", "8"))
+BATCH_README_TOKENS = int(os.getenv("VALIDATION_BATCH_README_TOKENS", "1500"))
+BATCH_README_CONCURRENCY = 8
+
+
+def is_validation_batch_enabled() -> bool:
+    """是否启用批量验证，通过环境变量 VALIDATION_BATCH 配置，默认 false"""
+    return os.getenv("VALIDATION_BATCH", "false").lower() == "true"
+
+def get_llm(
+    cache: bool = True,
+    schema: Optional[type] = None,
+    tools: Optional[list] = None,
+    tool_choice: Optional[str] = None,
+):
+    """
+    获取复用的模型实例，调用超时不超过请求剩余时间
+
+    Args:
+        cache: 是否使用 LLM 响应缓存（结果已有更高层缓存的节点可以关闭）
+        schema: 结构化输出的 schema
+        tools: 绑定的工具
+        tool_choice: 绑定工具时的 tool_choice，"none" 表示保留工具定义但禁止调用
+    """
+    return get_chat_model(
+        MODEL_NAME,
+        MODEL_PROVIDER,
+        temperature=0,
+        cache=cache,
+        timeout=remaining_timeout(),
+        schema=schema,
+        tools=tools,
+        tool_choice=tool_choice,
+    )
 
 def generate_search_queries(state: OverallState) -> OverallState:
     """生成搜索查询"""
     messages = generate_search_queries_prompt.format_messages(
         user_input=state['user_input']
     )
-    llm = get_llm()
-    response = llm.with_structured_output(SearchQueryList).invoke(messages)
+    response = invoke_with_retry(lambda: get_llm(schema=SearchQueryList), messages)
     print(f"🔍 Generated search queries: {response.query}")
     return {'search_queries': response.query}
 
 
-def search_github(state: OverallState) -> OverallState:
-    """根据搜索查询在 GitHub 上搜索项目"""
-    github_token = os.getenv("GITHUB_TOKEN")
-    github_client = GitHubClient(token=github_token)
+def search_github(state: OverallState, config: RunnableConfig) -> OverallState:
+    """根据搜索查询在 GitHub 上搜索项目（请求时间用完时只返回已完成查询的结果）"""
+    github_client = get_github_client()
+    deadline = get_deadline(config)
     
     search_queries = state.get('search_queries', [])
     all_results = []
     
+    # 搜索额度不足时只执行部分查询，避免排队过久或触发二级限流
+    budget = github_client.get_rate_limit_budget("search")
+    if budget["remaining"] < len(search_queries):
+        print(f"⚠️ GitHub 搜索额度剩余 {budget['remaining']}，本次只执行部分查询")
+        search_queries = search_queries[:max(1, budget["remaining"])]
+    
     for query in search_queries:
+        if deadline is not None and deadline.expired:
+            print("⏱️ 请求时间已用完，跳过剩余的搜索查询")
+            break
         print(f"🔍 Searching GitHub with query: {query}")
         results = github_client.search_repositories(
             query=query,
@@ -63,16 +126,83 @@ def search_github(state: OverallState) -> OverallState:
     print(f"✅ Total unique repositories found: {len(unique_results)}")
     return {'github_results': unique_results}
 
+def prefilter_projects(state: OverallState) -> OverallState:
+    """词法预筛选：按 BM25 + star / 更新时间先验排序，只保留最相关的项目交给 LLM 验证"""
+    github_results = state.get('github_results', [])
+    if not github_results:
+        return {'prefilter_pruned': 0}
+    
+    top_n, min_score = get_prefilter_config()
+    query_texts = [state.get('user_input', ''), *state.get('search_queries', []), *state.get('validate_criteria', [])]
+    kept, scores = rank_repositories(github_results, query_texts, top_n, min_score)
+    pruned = len(github_results) - len(kept)
+    
+    print(f"🧹 预筛选保留 {len(kept)}/{len(github_results)} 个项目，过滤 {pruned} 个")
+    for repo, score in zip(kept, scores):
+        print(f"   {score:.3f} {repo.get('full_name', '')}")
+    return {'github_results': kept, 'prefilter_pruned': pruned}
+
 def generate_validate_criteria(state: OverallState) -> OverallState:
     """生成验证标准"""
-    llm = get_llm()
     messages = validate_criteria_prompt.format_messages(
         user_input=state['user_input'],
     )
-    response = llm.with_structured_output(ValidateCriteriaList).invoke(messages)
+    response = invoke_with_retry(lambda: get_llm(schema=ValidateCriteriaList), messages)
     print(f"🔍 Generated validate criteria: {response.validate_criteria}")
     return {'validate_criteria': response.validate_criteria}
 
+def _format_criteria(validate_criteria: List[str]) -> str:
+    """格式化验证标准为带序号的字符串"""
+    return '\n'.join([f"{i+1}. {criterion}" for i, criterion in enumerate(validate_criteria)])
+
+
+def _format_batch_project(repo: dict, readme_content: str) -> str:
+    """格式化批量验证中的单个项目"""
+    full_name = repo.get('full_name', '')
+    return (
+        f"### {full_name}\n"
+        f"- 项目名称: {repo.get('name', full_name)}\n"
+        f"- 项目描述: {repo.get('description', '') or ''}\n"
+        f"- README:\n{readme_content or ''}\n"
+    )
+
+
+def plan_validation_batches(
+    repos: List[dict],
+    base_tokens: int,
+    budget: int = BATCH_TOKEN_BUDGET,
+    readme_tokens: int = BATCH_README_TOKENS,
+    max_size: int = BATCH_MAX_SIZE,
+) -> List[List[dict]]:
+    """
+    按 token 预算把项目分批：每个项目按名称、描述和截断后的 README 上限估算 token 数，
+    依次放入当前批次，超出预算或达到批次上限时开始新的批次
+
+    Args:
+        repos: 待验证的项目列表
+        base_tokens: 提示词（不含项目部分）的 token 数
+        budget: 单次调用的输入 token 预算
+        readme_tokens: 每个项目 README 的 token 上限
+        max_size: 每批最多的项目数
+
+    Returns:
+        批次列表，每批至少包含一个项目
+    """
+    batches: List[List[dict]] = []
+    batch: List[dict] = []
+    used = base_tokens
+    for repo in repos:
+        cost = count_tokens(_format_batch_project(repo, '')) + readme_tokens
+        if batch and (used + cost > budget or len(batch) >= max_size):
+            batches.append(batch)
+            batch, used = [], base_tokens
+        batch.append(repo)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
 def to_validate_projects(state: OverallState):
     """LangGraph condition function that dispatches projects for parallel validation."""
     github_results = state.get('github_results', [])
@@ -83,6 +213,26 @@ def to_validate_projects(state: OverallState):
         # 当没有结果时，返回 END 常量
         return Command(goto=END)
     
+    if is_validation_batch_enabled():
+        base_tokens = count_tokens(''.join(
+            message.content for message in validate_projects_batch_prompt.format_messages(
+                user_input=user_input,
+                validate_criteria=_format_criteria(validate_criteria),
+                project_count=0,
+                projects='',
+            )
+        ))
+        batches = plan_validation_batches(github_results, base_tokens)
+        print(f"📦 {len(github_results)} 个项目分为 {len(batches)} 批验证")
+        return Command(goto=[
+            Send("validate_projects_batch", {
+                "repos": batch,
+                "validate_criteria": validate_criteria,
+                "user_input": user_input
+            })
+            for batch in batches
+        ])
+    
     send_list = [
         Send("validate_project", {
             "repo": repo,
@@ -96,8 +246,84 @@ def to_validate_projects(state: OverallState):
     return Command(goto=send_list)
 
 
-def validate_project(state: ProjectValidationState) -> OverallState:
-    """处理单个项目的验证（由 Send 并行调用）"""
+def validation_flight_key(kind: str, state: ProjectValidationState) -> str:
+    """验证请求的规范化标识：仓库 + 验证标准 + 用户输入"""
+    return make_flight_key(
+        kind,
+        state['repo'].get('full_name', ''),
+        state.get('validate_criteria', []),
+        state.get('user_input', ''),
+    )
+
+
+def _repo_version(repo: dict) -> str:
+    """仓库版本：优先使用 pushed_at，没有时使用 README 的 git blob SHA"""
+    if repo.get('pushed_at'):
+        return repo['pushed_at']
+    readme = get_github_client().get_repository_readme(repo.get('full_name', '')) or ''
+    return f"readme:{git_blob_sha(readme.encode('utf-8'))}"
+
+
+def _verdict_output(repo: dict, is_validated: bool, cache_hit: bool) -> OverallState:
+    """把验证结论转换为节点输出：只返回通过验证的项目，并记录验证缓存的命中情况"""
+    return {
+        'validated_projects': [{**repo, "is_validated": True}] if is_validated else [],
+        'verdict_cache_hits': 1 if cache_hit else 0,
+        'verdict_cache_misses': 0 if cache_hit else 1,
+    }
+
+
+def _verdict_key(kind: str, repo: dict, validate_criteria: List[str]) -> str:
+    """验证结论缓存的 key；逐个验证和批量验证共用结论，两者的 README 预算都参与 key"""
+    return get_verdict_cache().make_key(
+        kind,
+        repo.get('full_name', ''),
+        _repo_version(repo),
+        validate_criteria,
+        f"{MODEL_PROVIDER}:{MODEL_NAME}:{PROMPT_VERSION}:"
+        f"{readme_settings_tag(VALIDATION_README_TOKENS, BATCH_README_TOKENS)}",
+    )
+
+
+def _cached_validation(
+    kind: str, state: ProjectValidationState, validate: Callable[[], Tuple[bool, bool]]
+) -> OverallState:
+    """
+    先查验证结论缓存，未命中时执行验证（相同的并发验证只执行一次）并写入缓存
+
+    Args:
+        kind: 验证方式（"validate" / "validate_pro"）
+        state: 单个项目的验证状态
+        validate: 实际执行验证的函数，返回 (是否通过, 结论是否可以缓存)；
+            验证失败或结论不可靠（如 LLM 不可用时的兜底判断）时不写入缓存
+    """
+    repo = state['repo']
+    full_name = repo.get('full_name', '')
+    verdict_cache = get_verdict_cache()
+    key = _verdict_key(kind, repo, state.get('validate_criteria', []))
+    is_validated = verdict_cache.get(key)
+    if is_validated is not None:
+        status_icon = "✅" if is_validated else "❌"
+        print(f"   ⚡ {status_icon} 命中验证缓存: {full_name}")
+        return _verdict_output(repo, is_validated, cache_hit=True)
+
+    is_validated, cacheable = _validation_flight.do(validation_flight_key(kind, state), validate)
+    if cacheable:
+        verdict_cache.set(key, is_validated)
+    return _verdict_output(repo, is_validated, cache_hit=False)
+
+
+def validate_project(state: ProjectValidationState, config: RunnableConfig) -> OverallState:
+    """处理单个项目的验证（由 Send 并行调用），优先复用缓存的验证结论，相同的并发验证只执行一次"""
+    deadline = get_deadline(config)
+    if deadline is not None and deadline.expired:
+        print(f"   ⏱️ 请求时间已用完，跳过验证: {state['repo'].get('full_name', '')}")
+        return {'validated_projects': []}
+    return _cached_validation("validate", state, lambda: _validate_project(state))
+
+
+def _validate_project(state: ProjectValidationState) -> Tuple[bool, bool]:
+    """验证单个项目是否符合验证标准，返回 (是否通过, 结论是否可以缓存)"""
     repo = state['repo']
     validate_criteria = state.get('validate_criteria', [])
     user_input = state.get('user_input', '')
@@ -107,17 +333,15 @@ def validate_project(state: ProjectValidationState) -> OverallState:
     project_description = repo.get('description', '') or ''
     print(f"🔍 Validating project: {state['repo']['full_name']}")
     
-    # 获取 README 内容
-    github_token = os.getenv("GITHUB_TOKEN")
-    github_client = GitHubClient(token=github_token)
-    readme_content = github_client.get_repository_readme(full_name)
+    # 获取 README 内容（清理标记并按 token 预算截断）
+    github_client = get_github_client()
+    readme_content = prepare_readme(github_client.get_repository_readme(full_name), VALIDATION_README_TOKENS)
     
     # 格式化验证标准为字符串
-    criteria_text = '\n'.join([f"{i+1}. {criterion}" for i, criterion in enumerate(validate_criteria)])
+    criteria_text = _format_criteria(validate_criteria)
     
-    # 使用 LLM 进行验证
+    # 使用 LLM 进行验证（验证结论已由 verdict_cache 缓存，不再写入 LLM 响应缓存）
     try:
-        llm = get_llm()
         messages = validate_project_prompt.format_messages(
             user_input=user_input,
             validate_criteria=criteria_text,
@@ -125,30 +349,123 @@ def validate_project(state: ProjectValidationState) -> OverallState:
             project_description=project_description,
             readme_content=readme_content
         )
-        response = llm.with_structured_output(ProjectValidation).invoke(messages)
+        response = invoke_with_retry(lambda: get_llm(cache=False, schema=ProjectValidation), messages)
         is_validated = response.is_validated
         
-        project_data = {
-            **repo,
-            "is_validated": is_validated
-        }
-        
         status_icon = "✅" if is_validated else "❌"
         print(f"   {status_icon} Validated: {full_name} - {'符合' if is_validated else '不符合'}")
-
-        # 只返回通过验证的项目
-        if is_validated:
-            return {'validated_projects': [project_data]}
-        else:
-            return {'validated_projects': []}
+        return is_validated, True
     except Exception as e:
         print(f"   ⚠️ 验证失败 {full_name}: {e}")
-        # 验证失败时，默认不通过
+        # 验证失败时，默认不通过（不写入缓存）
+        return False, False
+
+
+def validate_projects_batch(state: ProjectValidationBatchState, config: RunnableConfig) -> OverallState:
+    """
+    批量验证一批项目（由 Send 并行调用）：已缓存的结论直接复用，其余项目在一次 LLM 调用中验证；
+    批量结果解析失败或缺少某些项目时，这些项目退回到逐个验证
+    """
+    repos = state.get('repos', [])
+    validate_criteria = state.get('validate_criteria', [])
+    deadline = get_deadline(config)
+    if deadline is not None and deadline.expired:
+        print(f"   ⏱️ 请求时间已用完，跳过 {len(repos)} 个项目的验证")
         return {'validated_projects': []}
 
+    verdict_cache = get_verdict_cache()
+    validated_projects = []
+    hits = misses = 0
+    pending = []
+    for repo in repos:
+        key = _verdict_key("validate", repo, validate_criteria)
+        is_validated = verdict_cache.get(key)
+        if is_validated is None:
+            pending.append((repo, key))
+            continue
+        hits += 1
+        status_icon = "✅" if is_validated else "❌"
+        print(f"   ⚡ {status_icon} 命中验证缓存: {repo.get('full_name', '')}")
+        if is_validated:
+            validated_projects.append({**repo, "is_validated": True})
+
+    verdicts = _validate_projects_batch([repo for repo, _ in pending], state, deadline) if pending else {}
+    for repo, key in pending:
+        full_name = repo.get('full_name', '')
+        is_validated = verdicts.get(full_name.lower()) if verdicts is not None else None
+        if is_validated is None:
+            # 批量结果中没有该项目，退回到逐个验证
+            single_state = {
+                "repo": repo,
+                "validate_criteria": validate_criteria,
+                "user_input": state.get('user_input', ''),
+            }
+            output = _cached_validation("validate", single_state, lambda: _validate_project(single_state))
+            validated_projects.extend(output['validated_projects'])
+            hits += output['verdict_cache_hits']
+            misses += output['verdict_cache_misses']
+            continue
+        misses += 1
+        verdict_cache.set(key, is_validated)
+        if is_validated:
+            validated_projects.append({**repo, "is_validated": True})
 
-def validate_project_pro(state: ProjectValidationProState) -> ProjectValidationProState:
-    """升级版项目验证节点，支持工具调用"""
+    return {
+        'validated_projects': validated_projects,
+        'verdict_cache_hits': hits,
+        'verdict_cache_misses': misses,
+    }
+
+
+def _validate_projects_batch(
+    repos: List[dict], state: ProjectValidationBatchState, deadline: Optional[Deadline]
+) -> Optional[Dict[str, bool]]:
+    """
+    在一次 LLM 调用中验证多个项目
+
+    Returns:
+        {小写的 full_name: 是否通过}，只包含输入中的项目；调用或解析失败时返回 None
+    """
+    full_names = [repo.get('full_name', '') for repo in repos]
+    print(f"🔍 Validating {len(repos)} projects in batch: {', '.join(full_names)}")
+
+    # 线程池中的线程不继承 contextvar，显式传递请求截止时间
+    def fetch_readme(full_name: str) -> str:
+        with deadline_scope(deadline):
+            readme_content = get_github_client().get_repository_readme(full_name) or ''
+        return prepare_readme(readme_content, BATCH_README_TOKENS)
+
+    with ThreadPoolExecutor(max_workers=min(BATCH_README_CONCURRENCY, len(repos))) as executor:
+        readmes = list(executor.map(fetch_readme, full_names))
+
+    try:
+        messages = validate_projects_batch_prompt.format_messages(
+            user_input=state.get('user_input', ''),
+            validate_criteria=_format_criteria(state.get('validate_criteria', [])),
+            project_count=len(repos),
+            projects='\n'.join(_format_batch_project(repo, readme) for repo, readme in zip(repos, readmes)),
+        )
+        response = invoke_with_retry(lambda: get_llm(cache=False, schema=ProjectValidationBatch), messages)
+    except Exception as e:
+        print(f"   ⚠️ 批量验证失败，改为逐个验证: {e}")
+        return None
+
+    requested = {full_name.lower() for full_name in full_names}
+    verdicts = {}
+    for verdict in response.verdicts:
+        full_name = verdict.full_name.strip().lower()
+        if full_name in requested and full_name not in verdicts:
+            verdicts[full_name] = verdict.is_validated
+            status_icon = "✅" if verdict.is_validated else "❌"
+            print(f"   {status_icon} Validated (batch): {verdict.full_name} - {'符合' if verdict.is_validated else '不符合'}")
+    missing = len(requested) - len(verdicts)
+    if missing:
+        print(f"   ⚠️ 批量验证结果缺少 {missing} 个项目，改为逐个验证")
+    return verdicts
+
+
+def validate_project_pro(state: ProjectValidationProState, config: RunnableConfig) -> ProjectValidationProState:
+    """升级版项目验证节点，支持工具调用；请求剩余时间不足时不再调用工具，直接做出判断"""
     repo = state['repo']
     validate_criteria = state.get('validate_criteria', [])
     user_input = state.get('user_input', '')
@@ -162,12 +479,11 @@ def validate_project_pro(state: ProjectValidationProState) -> ProjectValidationP
     if iteration_count == 0:
         print(f"🔍 Validating project (pro): {full_name}")
     
-    # 获取 README 内容（仅在第一次迭代时）
+    # 获取 README 内容（仅在第一次迭代时，清理标记并按 token 预算截断）
     readme_content = ''
     if iteration_count == 0:
-        github_token = os.getenv("GITHUB_TOKEN")
-        github_client = GitHubClient(token=github_token)
-        readme_content = github_client.get_repository_readme(full_name)
+        github_client = get_github_client()
+        readme_content = prepare_readme(github_client.get_repository_readme(full_name), VALIDATION_README_TOKENS)
     
     # 格式化验证标准为字符串
     criteria_text = '\n'.join([f"{i+1}. {criterion}" for i, criterion in enumerate(validate_criteria)])
@@ -191,11 +507,19 @@ def validate_project_pro(state: ProjectValidationProState) -> ProjectValidationP
         all_messages = messages + [iteration_hint]
     
     # 绑定工具到 LLM
-    llm = get_llm()
-    llm_with_tools = llm.bind_tools(validation_tools)
+    deadline = get_deadline(config)
+    tool_choice = None
+    if deadline is not None and deadline.running_out(FINAL_ANSWER_RESERVE_SECONDS):
+        # 历史消息中有工具调用，仍需绑定工具；tool_choice="none" 让模型只能基于已有信息给出最终判断
+        tool_choice = "none"
+        all_messages = all_messages + [
+            HumanMessage(content="⏱️ 时间不足，请不要再调用工具，立即基于已有信息做出最终判断。")
+        ]
     
     # 调用 LLM
-    response = llm_with_tools.invoke(all_messages)
+    response = invoke_with_retry(
+        lambda: get_llm(cache=False, tools=validation_tools, tool_choice=tool_choice), all_messages
+    )
     
     # 由于 messages 使用 operator.add，只需要返回新增的消息
     # 第一次调用时返回初始消息 + response，后续调用时只返回 response
@@ -313,8 +637,17 @@ def to_validate_projects_pro(state: OverallState):
     return Command(goto=send_list)
 
 
-def validate_project_pro_wrapper(state: ProjectValidationProState) -> OverallState:
-    """包装节点：调用 validation_pro_graph 并返回 OverallState"""
+def validate_project_pro_wrapper(state: ProjectValidationProState, config: RunnableConfig) -> OverallState:
+    """包装节点：调用 validation_pro_graph 并返回 OverallState，优先复用缓存的验证结论，相同的并发验证只执行一次"""
+    deadline = get_deadline(config)
+    if deadline is not None and deadline.expired:
+        print(f"   ⏱️ 请求时间已用完，跳过验证: {state['repo'].get('full_name', '')}")
+        return {'validated_projects': []}
+    return _cached_validation("validate_pro", state, lambda: _validate_project_pro(state))
+
+
+def _validate_project_pro(state: ProjectValidationProState) -> Tuple[bool, bool]:
+    """运行 validation_pro_graph 验证单个项目，返回 (是否通过, 结论是否可以缓存)"""
     from .graph import validation_pro_graph
     
     # 运行 validation_pro_graph
@@ -327,6 +660,7 @@ def validate_project_pro_wrapper(state: ProjectValidationProState) -> OverallSta
     # 从最后一条 AI 消息中提取验证结果
     # 如果最后一条消息没有 tool_calls，说明已经做出最终判断
     is_validated = False
+    cacheable = False
     if messages:
         last_message = messages[-1]
         # 检查是否有 tool_calls，如果没有，说明已经完成验证
@@ -336,7 +670,6 @@ def validate_project_pro_wrapper(state: ProjectValidationProState) -> OverallSta
             if content:
                 # 使用结构化输出提取验证结果
                 try:
-                    llm = get_llm()
                     # 构建提取提示
                     extract_prompt = f"""请从以下消息中提取项目验证结果。消息内容：
 {content}
@@ -344,25 +677,18 @@ def validate_project_pro_wrapper(state: ProjectValidationProState) -> OverallSta
 请判断项目是否符合验证标准，返回 JSON 格式：
 {{"is_validated": true/false}}
 """
-                    response = llm.with_structured_output(ProjectValidation).invoke(extract_prompt)
+                    response = invoke_with_retry(lambda: get_llm(cache=False, schema=ProjectValidation), extract_prompt)
                     is_validated = response.is_validated
+                    cacheable = True
                 except Exception as e:
                     # 如果结构化输出失败，使用简单的文本匹配
                     print(f"   ⚠️ 结构化输出失败，使用文本匹配: {e}")
                     if '符合' in content or 'validated' in content.lower() or 'true' in content.lower() or '通过' in content:
                         is_validated = True
     
-    project_data = {
-        **repo,
-        "is_validated": is_validated
-    }
-    
     status_icon = "✅" if is_validated else "❌"
     print(f"   {status_icon} Validated (pro): {repo.get('full_name', '')} - {'符合' if is_validated else '不符合'}")
     
-    # 只返回通过验证的项目
-    if is_validated:
-        return {'validated_projects': [project_data]}
-    else:
-        return {'validated_projects': []}
+    # 文本匹配的兜底判断不可靠，不写入缓存
+    return is_validated, cacheable
 
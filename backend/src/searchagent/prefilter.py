@@ -0,0 +1,167 @@
+"""
+项目词法预筛选：在 LLM 验证之前，用 BM25 对仓库名称、描述和 topics 打分，
+结合 star 数和最近更新时间的先验排序，只把最相关的前 N 个项目交给 LLM 验证
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# BM25 参数
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 先验（star 数、最近更新时间）在总分中的权重，其余为 BM25 的权重
+PRIOR_WEIGHT = 0.2
+
+# 最近更新时间先验的半衰期（天）
+RECENCY_HALF_LIFE_DAYS = 365
+
+_WORD_RE = re.compile(r"[a-z0-9]+|[⺀-鿿가-힯]+")
+_CAMEL_RE = re.compile(r"([a-z0-9])([A-Z])")
+_CJK_RE = re.compile(r"[⺀-鿿가-힯]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    分词：英文按非字母数字切分（驼峰、kebab、snake 命名会拆开），中日韩文本按相邻两字切分
+
+    Args:
+        text: 原始文本
+    """
+    if not text:
+        return []
+    text = _CAMEL_RE.sub(r"\1 \2", text).lower()
+    tokens = []
+    for word in _WORD_RE.findall(text):
+        if _CJK_RE.match(word):
+            tokens.extend(word[i:i + 2] for i in range(max(1, len(word) - 1)))
+        elif len(word) > 1:
+            tokens.append(word)
+    return tokens
+
+
+def repo_document(repo: Dict[str, Any]) -> List[str]:
+    """仓库参与打分的文本：名称、描述、topics"""
+    name = repo.get('name') or repo.get('full_name', '').split('/')[-1]
+    topics = ' '.join(repo.get('topics') or [])
+    return tokenize(f"{name} {repo.get('description') or ''} {topics}")
+
+
+def bm25_scores(documents: List[List[str]], query: List[str]) -> List[float]:
+    """
+    计算每个文档对查询的 BM25 分数（IDF 基于当前候选集合）
+
+    Args:
+        documents: 分词后的文档列表
+        query: 分词后的查询（重复的词只计算一次）
+    """
+    if not documents:
+        return []
+    avg_length = sum(len(doc) for doc in documents) / len(documents) or 1.0
+    document_frequency = Counter(term for doc in documents for term in set(doc))
+    query_terms = set(query)
+    total = len(documents)
+
+    scores = []
+    for doc in documents:
+        term_frequency = Counter(doc)
+        score = 0.0
+        for term in query_terms:
+            tf = term_frequency.get(term, 0)
+            if not tf:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            score += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / avg_length))
+        scores.append(score)
+    return scores
+
+
+def _age_days(repo: Dict[str, Any], now: datetime) -> Optional[float]:
+    """仓库最近一次推送距今的天数，没有时间信息时返回 None"""
+    timestamp = repo.get('pushed_at') or repo.get('updated_at')
+    if not timestamp:
+        return None
+    try:
+        pushed_at = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return max(0.0, (now - pushed_at).total_seconds() / 86400)
+
+
+def prior_score(repo: Dict[str, Any], max_stars: int, now: datetime) -> float:
+    """
+    仓库的先验分数（0~1）：star 数（对数归一化）和最近更新时间（指数衰减）各占一半
+
+    Args:
+        repo: GitHub 仓库数据
+        max_stars: 候选集合中最多的 star 数
+        now: 当前时间
+    """
+    stars = repo.get('stargazers_count') or 0
+    star_prior = math.log1p(stars) / math.log1p(max_stars) if max_stars > 0 else 0.0
+    age_days = _age_days(repo, now)
+    recency_prior = 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS) if age_days is not None else 0.0
+    return (star_prior + recency_prior) / 2
+
+
+def rank_repositories(
+    repos: List[Dict[str, Any]],
+    query_texts: List[str],
+    top_n: int,
+    min_score: float,
+    now: Optional[datetime] = None,
+) -> Tuple[List[Dict[str, Any]], List[float]]:
+    """
+    按 BM25 + 先验的综合分数排序，保留词法分数不低于 min_score 的前 top_n 个项目
+
+    BM25 分数按候选集合中的最高分归一化到 0~1，阈值只作用于词法分数，先验只影响排序；
+    所有候选都与查询没有共同的词时
+    （例如查询全是中文而仓库描述是英文），词法分数没有区分度，不按 min_score 过滤，只按先验取前 top_n 个
+
+    Args:
+        repos: 候选仓库列表
+        query_texts: 查询文本（用户输入、搜索查询、验证标准）
+        top_n: 最多保留的项目数，<= 0 表示不限制
+        min_score: 归一化 BM25 分数的阈值
+        now: 当前时间，默认使用当前 UTC 时间
+
+    Returns:
+        (保留的仓库列表, 对应的综合分数)，按分数从高到低排序
+    """
+    if not repos:
+        return [], []
+    now = now or datetime.now(timezone.utc)
+    query = [token for text in query_texts for token in tokenize(text)]
+    lexical = bm25_scores([repo_document(repo) for repo in repos], query)
+    max_lexical = max(lexical)
+    max_stars = max(repo.get('stargazers_count') or 0 for repo in repos)
+
+    scored = []
+    for repo, score in zip(repos, lexical):
+        normalized = score / max_lexical if max_lexical > 0 else 0.0
+        total = (1 - PRIOR_WEIGHT) * normalized + PRIOR_WEIGHT * prior_score(repo, max_stars, now)
+        if max_lexical == 0 or normalized >= min_score:
+            scored.append((total, repo))
+    # 排序是稳定的，同分时保持 GitHub 搜索结果原来的顺序
+    scored.sort(key=lambda item: item[0], reverse=True)
+
+    if top_n > 0:
+        scored = scored[:top_n]
+    return [repo for _, repo in scored], [round(score, 4) for score, _ in scored]
+
+
+def get_prefilter_config() -> Tuple[int, float]:
+    """
+    获取预筛选配置
+
+    可通过环境变量配置：
+    - PREFILTER_TOP_N: 最多交给 LLM 验证的项目数，默认 20，<= 0 表示不限制
+    - PREFILTER_MIN_SCORE: 归一化 BM25 分数的阈值（0~1，相对于候选中的最高分），默认 0.1；
+      大于 0 时与查询没有任何共同词的项目都会被过滤
+    """
+    return int(os.getenv("PREFILTER_TOP_N", "20")), float(os.getenv("PREFILTER_MIN_SCORE", "0.1"))
@@ -1,5 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate
 
+# 提示词版本：修改验证相关的提示词时递增，使已缓存的验证结论失效
+PROMPT_VERSION = "1"
 
 # TODO: generate_search_queries_prompt这里输出要多几个字段，比如language
 generate_search_queries_prompt = ChatPromptTemplate.from_messages([
@@ -128,6 +130,46 @@ validate_project_prompt = ChatPromptTemplate.from_messages([
 """)
 ])
 
+validate_projects_batch_prompt = ChatPromptTemplate.from_messages([
+    ("system", """
+    你是一个项目评估专家，负责判断多个 GitHub 项目是否分别符合用户需求。
+
+**核心任务:**
+根据验证标准，逐个评估给定的每个 GitHub 项目是否符合要求。
+
+**评估流程:**
+1. **理解验证标准**: 仔细阅读每条验证标准，理解其含义
+2. **逐个阅读项目信息**: 每个项目以 `### owner/repo` 开头，包含名称、描述、README 等信息
+3. **逐项检查**: 针对每个项目的每条验证标准，检查项目是否满足，如果不确定，则倾向于判定为不符合
+4. **综合判断**: 项目满足所有验证标准时判定为符合；否则判定为不符合
+
+**重要提示:**
+- 每个项目独立判断，不要互相比较，也不要因为其他项目而影响判断
+- 尽量严格地判断项目是否符合要求，不要轻易判定为符合
+- 必须为每个输入项目都给出一条结果，`full_name` 与输入中的项目全名完全一致
+
+**输出格式要求:**
+你必须严格按照以下 JSON 格式输出结果：
+
+```json
+{{
+    "verdicts": [
+        {{"full_name": "owner/repo", "is_validated": true/false}}
+    ]
+}}
+```
+"""),
+    ("user", """用户需求: {user_input}
+
+验证标准:
+{validate_criteria}
+
+待评估的项目（共 {project_count} 个）:
+
+{projects}
+""")
+])
+
 validate_project_pro_prompt = ChatPromptTemplate.from_messages([
     ("system", """
 你是一个项目评估专家，负责判断 GitHub 项目是否符合用户需求。你可以使用工具来获取项目的详细信息。
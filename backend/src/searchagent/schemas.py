@@ -5,6 +5,17 @@ class ProjectValidation(BaseModel):
     is_validated: bool = Field(description="项目是否符合验证标准")
 
 
+class ProjectVerdict(BaseModel):
+    """批量验证中单个项目的验证结果"""
+    full_name: str = Field(description="项目全名，格式 owner/repo，必须与输入中的项目全名完全一致")
+    is_validated: bool = Field(description="项目是否符合验证标准")
+
+
+class ProjectValidationBatch(BaseModel):
+    """批量项目验证结果"""
+    verdicts: list[ProjectVerdict] = Field(description="每个输入项目的验证结果，每个项目一条")
+
+
 class SearchQueryList(BaseModel):
     query: list[str] = Field(
         description="用于github搜索的搜索查询列表"
@@ -5,8 +5,11 @@ class OverallState(TypedDict):
     user_input: str
     search_queries: List[str]
     validate_criteria: List[str]
-    github_results: List[Dict[str, Any]]  # GitHub 搜索的原始结果
+    github_results: List[Dict[str, Any]]  # GitHub 搜索的结果（预筛选后只保留交给 LLM 验证的项目）
+    prefilter_pruned: int  # 预筛选过滤掉的项目数
     validated_projects: Annotated[List[Dict[str, Any]], operator.add]  # 经过验证的项目，支持增量添加
+    verdict_cache_hits: Annotated[int, operator.add]  # 命中验证缓存、跳过 LLM 的项目数
+    verdict_cache_misses: Annotated[int, operator.add]  # 实际执行验证的项目数
 
 class ProjectValidationState(TypedDict):
     """单个项目验证的状态"""
@@ -14,6 +17,12 @@ class ProjectValidationState(TypedDict):
     validate_criteria: List[str]  # 验证标准列表
     user_input: str  # 用户输入
 
+class ProjectValidationBatchState(TypedDict):
+    """批量项目验证的状态"""
+    repos: List[Dict[str, Any]]  # 一批项目的数据
+    validate_criteria: List[str]  # 验证标准列表
+    user_input: str  # 用户输入
+
 class ProjectValidationProState(TypedDict):
     """升级版项目验证的状态（支持工具调用）"""
     repo: Dict[str, Any]  # 单个项目的数据
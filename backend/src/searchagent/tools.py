@@ -1,9 +1,14 @@
 """
 升级版验证流程的工具函数
 """
-import os
 from langchain_core.tools import tool
-from src.github.github_client import GitHubClient
+from src.github.code_index import get_repo_code_index
+from src.github.github_client import ContentBudget, get_github_client
+
+
+# get_file_content 工具单次最多读取的原始字节数和行数
+READ_MAX_BYTES = 32 * 1024
+READ_MAX_LINES = 600
 
 
 @tool
@@ -18,16 +23,26 @@ def get_file_content(repo_full_name: str, file_path: str) -> str:
     Returns:
         文件内容的字符串表示（已优化，去除无关内容）
     """
-    github_token = os.getenv("GITHUB_TOKEN")
-    github_client = GitHubClient(token=github_token)
-    content = github_client.get_file_content(repo_full_name, file_path)
+    github_client = get_github_client()
+    # 启用本地代码索引时直接从索引读取，否则只流式读取需要的部分：
+    # 过滤注释和空行后最多保留 200 行、8000 字符，预留足够的原始行数和字节数，超出部分不下载
+    code_index = get_repo_code_index(github_client, repo_full_name)
+    indexed_text = code_index.get_file(file_path) if code_index else None
+    if indexed_text is not None:
+        raw = ContentBudget.apply(indexed_text, READ_MAX_BYTES, READ_MAX_LINES)
+    else:
+        raw = github_client.read_file(
+            repo_full_name, file_path, max_bytes=READ_MAX_BYTES, max_lines=READ_MAX_LINES
+        )
     
-    if not content:
+    if not raw or not raw.text:
         return f"无法读取文件 {repo_full_name}/{file_path} 的内容（文件不存在或无法访问）"
     
+    content = raw.text
     # 对于大文件，只返回关键部分
     max_length = 8000  # 增加一些长度，但仍有上限
     original_length = len(content)
+    truncated = raw.truncated  # 文件超出读取预算，只读取了开头部分
     
     # 如果是代码文件，尝试提取关键部分（去除注释和空行）
     if file_path.endswith(('.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.go', '.rs')):
@@ -44,13 +59,16 @@ def get_file_content(repo_full_name: str, file_path: str) -> str:
         # 如果过滤后仍然太长，只取前一部分
         if len(filtered_lines) > 200:
             filtered_lines = filtered_lines[:200]
-            content = '\n'.join(filtered_lines) + f"\n\n...(文件内容已截断，原始行数: {len(lines)} 行)"
-        else:
-            content = '\n'.join(filtered_lines)
+            truncated = True
+        content = '\n'.join(filtered_lines)
     
     # 最终长度限制
     if len(content) > max_length:
-        content = content[:max_length] + f"\n\n...(文件内容已截断，原始长度: {original_length} 字符)"
+        content = content[:max_length]
+        truncated = True
+    
+    if truncated:
+        content += f"\n\n...(文件内容已截断，已读取 {original_length} 字符{'，文件还有更多内容未读取' if raw.truncated else ''})"
     
     return f"文件 {file_path} 的内容:\n\n{content}"
 
@@ -72,11 +90,24 @@ def search_code_in_repo(repo_full_name: str, keyword: str) -> str:
     Returns:
         搜索结果，包含匹配的文件路径和相关信息。如果找到相关文件，可以使用 get_file_content 读取具体内容。
     """
-    github_token = os.getenv("GITHUB_TOKEN")
-    github_client = GitHubClient(token=github_token)
+    github_client = get_github_client()
     
-    results = github_client.search_code_in_repo(repo_full_name, keyword, limit=10)
+    # 启用本地代码索引时在本地搜索，不消耗代码搜索额度
+    code_index = get_repo_code_index(github_client, repo_full_name)
+    if code_index is not None:
+        return format_code_search_results(repo_full_name, keyword, code_index.search(keyword, limit=10))
     
+    # 代码搜索额度耗尽且短时间内无法恢复时，直接提示模型基于已有信息判断，避免长时间排队
+    budget = github_client.get_rate_limit_budget("code_search")
+    if budget["remaining"] == 0 and (budget["wait"] is None or budget["wait"] > 10):
+        return f"代码搜索额度暂时耗尽，无法在仓库 {repo_full_name} 中搜索 '{keyword}'。\n建议：基于已有信息做出判断，或使用 get_file_content 读取已知文件。"
+    
+    results = github_client.search_code_in_repo(repo_full_name, keyword, limit=10)
+    return format_code_search_results(repo_full_name, keyword, results)
+
+
+def format_code_search_results(repo_full_name: str, keyword: str, results: list) -> str:
+    """将代码搜索结果格式化为工具输出"""
     if not results:
         return f"在仓库 {repo_full_name} 中未找到包含关键词 '{keyword}' 的代码。\n建议：尝试使用其他相关关键词，或者检查关键词拼写是否正确。"
     
@@ -0,0 +1,84 @@
+"""
+项目验证结果缓存：热门仓库会在很多次搜索中重复出现，相同的仓库版本、验证标准和模型
+直接复用之前的验证结论，不再获取 README、不再调用 LLM
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from ..cache import SQLiteCache, get_cache_dir, make_flight_key
+
+
+def normalize_criteria(criteria: List[str]) -> str:
+    """
+    验证标准的规范化哈希：忽略大小写、多余空白、末尾标点和顺序
+
+    Args:
+        criteria: 验证标准列表
+    """
+    normalized = sorted(
+        {re.sub(r"\s+", " ", c).strip().rstrip("。.;；").lower() for c in criteria if c and c.strip()}
+    )
+    return hashlib.sha1(json.dumps(normalized, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class VerdictCache:
+    """基于 SQLiteCache 的验证结论缓存，支持 TTL 和容量上限淘汰"""
+
+    def __init__(self, ttl: Optional[float] = 7 * 86400, max_entries: Optional[int] = 50000):
+        """
+        Args:
+            ttl: 验证结论的有效期（秒）
+            max_entries: 最多缓存的结论数
+        """
+        self._cache = SQLiteCache(get_cache_dir() / "verdicts.sqlite3", max_entries=max_entries, ttl=ttl)
+
+    @staticmethod
+    def make_key(kind: str, full_name: str, repo_version: str, criteria: List[str], model: str) -> str:
+        """
+        缓存 key：验证方式 + 仓库 + 仓库版本 + 规范化的验证标准 + 模型
+
+        Args:
+            kind: 验证方式（"validate" / "validate_pro"），两者的提示词和流程不同
+            full_name: 仓库全名
+            repo_version: 仓库版本（pushed_at 或 README 的 SHA），仓库更新后结论失效
+            criteria: 验证标准列表
+            model: 模型标识（含提示词版本和 README 预处理设置）
+        """
+        return make_flight_key(kind, full_name.lower(), repo_version, normalize_criteria(criteria), model)
+
+    def get(self, key: str) -> Optional[bool]:
+        """读取验证结论，未命中时返回 None"""
+        return self._cache.get(key)
+
+    def set(self, key: str, is_validated: bool) -> None:
+        self._cache.set(key, bool(is_validated))
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+_verdict_cache: Optional[VerdictCache] = None
+_verdict_cache_lock = threading.Lock()
+
+
+def get_verdict_cache() -> VerdictCache:
+    """
+    获取进程内共享的 VerdictCache
+
+    可通过环境变量配置：
+    - VERDICT_CACHE_TTL: 验证结论有效期（秒），默认 604800（7 天）
+    - VERDICT_CACHE_MAX_ENTRIES: 最多缓存的结论数，默认 50000
+    """
+    global _verdict_cache
+    with _verdict_cache_lock:
+        if _verdict_cache is None:
+            _verdict_cache = VerdictCache(
+                ttl=float(os.getenv("VERDICT_CACHE_TTL", str(7 * 86400))),
+                max_entries=int(os.getenv("VERDICT_CACHE_MAX_ENTRIES", "50000")),
+            )
+        return _verdict_cache
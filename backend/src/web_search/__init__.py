@@ -0,0 +1,10 @@
+"""网络搜索：带结果缓存、重试和熔断的 Tavily 搜索，供 agent 和 ReAct 工作流共用"""
+
+from .client import SearchResultCache, get_search_result_cache, normalize_query, tavily_search
+
+__all__ = [
+    "SearchResultCache",
+    "get_search_result_cache",
+    "normalize_query",
+    "tavily_search",
+]
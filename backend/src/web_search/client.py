@@ -0,0 +1,110 @@
+import os
+import re
+import threading
+from typing import Any, Dict, Optional
+
+from tavily import TavilyClient
+
+from ..cache import SQLiteCache, get_cache_dir, make_flight_key
+from ..resilience import get_circuit_breaker, remaining_timeout, retry_call
+
+
+def normalize_query(query: str) -> str:
+    """规范化搜索查询：忽略大小写和多余空白"""
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+class SearchResultCache:
+    """
+    搜索结果缓存，按规范化的查询和搜索参数索引
+
+    结果（包括 include_raw_content 返回的完整网页内容）以 zlib 压缩后存入 SQLite，
+    支持 TTL 和压缩后总字节数上限淘汰
+    """
+
+    def __init__(self, ttl: Optional[float] = 86400, max_bytes: Optional[int] = 256 * 1024 * 1024):
+        """
+        Args:
+            ttl: 搜索结果有效期（秒）
+            max_bytes: 压缩后的最大总字节数
+        """
+        self._cache = SQLiteCache(get_cache_dir() / "web_search.sqlite3", max_bytes=max_bytes, ttl=ttl)
+
+    @staticmethod
+    def make_key(query: str, params: Dict[str, Any]) -> str:
+        return make_flight_key("tavily", normalize_query(query), params)
+
+    def get(self, query: str, params: Dict[str, Any]) -> Optional[Dict]:
+        return self._cache.get(self.make_key(query, params))
+
+    def set(self, query: str, params: Dict[str, Any], result: Dict) -> None:
+        self._cache.set(self.make_key(query, params), result)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+_search_cache: Optional[SearchResultCache] = None
+_tavily_client: Optional[TavilyClient] = None
+_lock = threading.Lock()
+
+
+def get_search_result_cache() -> SearchResultCache:
+    """
+    获取进程内共享的 SearchResultCache
+
+    可通过环境变量配置：
+    - WEB_SEARCH_CACHE_TTL: 搜索结果有效期（秒），默认 86400
+    - WEB_SEARCH_CACHE_MAX_MB: 压缩后的最大总大小（MB），默认 256
+    """
+    global _search_cache
+    with _lock:
+        if _search_cache is None:
+            _search_cache = SearchResultCache(
+                ttl=float(os.getenv("WEB_SEARCH_CACHE_TTL", "86400")),
+                max_bytes=int(float(os.getenv("WEB_SEARCH_CACHE_MAX_MB", "256")) * 1024 * 1024),
+            )
+        return _search_cache
+
+
+def _get_tavily_client() -> TavilyClient:
+    global _tavily_client
+    with _lock:
+        if _tavily_client is None:
+            _tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+        return _tavily_client
+
+
+def tavily_search(query: str, use_cache: bool = True, **params: Any) -> Dict:
+    """
+    执行 Tavily 搜索，相同的查询和参数在有效期内直接返回缓存的结果
+
+    暂时性故障自动重试，Tavily 不可用时熔断；超时不超过请求剩余时间
+
+    Args:
+        query: 搜索查询
+        use_cache: 是否使用结果缓存
+        **params: 传给 TavilyClient.search 的其他参数（max_results、include_raw_content 等）
+
+    Returns:
+        Tavily 的响应，结果列表在 "results" 中
+
+    Raises:
+        Exception: 搜索失败（网络错误、熔断中等）
+    """
+    cache = get_search_result_cache() if use_cache else None
+    if cache is not None:
+        cached = cache.get(query, params)
+        if cached is not None:
+            print(f"   ⚡ 命中搜索缓存: {query}")
+            return cached
+
+    client = _get_tavily_client()
+    result = retry_call(
+        lambda: client.search(query=query, timeout=remaining_timeout(60), **params),
+        breaker=get_circuit_breaker("tavily"),
+    )
+    # 没有结果的响应可能是暂时性问题，不缓存
+    if cache is not None and result.get("results"):
+        cache.set(query, params, result)
+    return result
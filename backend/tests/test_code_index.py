@@ -0,0 +1,137 @@
+import io
+import tarfile
+import threading
+import time
+
+import pytest
+import urllib3
+
+from src.github import code_index
+from src.github.code_index import RepoCodeIndex, build_repo_code_index, get_repo_code_index
+from src.resilience import Deadline, DeadlineExceeded, deadline_scope
+
+
+FILES = {
+    "src/app.py": "def handle_request():\n    return render_template()\n",
+    "src/utils.py": "def render_template():\n    pass\n",
+    "README.md": "demo app",
+}
+
+
+def test_search_requires_every_keyword():
+    index = RepoCodeIndex("a/b", "0" * 40, dict(FILES))
+
+    assert [item["path"] for item in index.search("render_template")] == ["src/app.py", "src/utils.py"]
+    assert [item["path"] for item in index.search("render handle")] == ["src/app.py"]
+    assert index.search("missing_symbol") == []
+
+
+def test_size_includes_the_postings():
+    index = RepoCodeIndex("a/b", "0" * 40, dict(FILES))
+    text_bytes = sum(len(text) for text in FILES.values()) * 2
+
+    assert index.size > text_bytes * 2
+
+
+class FlakyRaw(io.RawIOBase):
+    """返回前几个字节后像断开的连接一样抛出 urllib3 的超时异常"""
+
+    def __init__(self, payload, fail_after):
+        self.payload = payload
+        self.fail_after = fail_after
+        self.position = 0
+
+    def read(self, size=-1):
+        if self.position >= self.fail_after:
+            raise urllib3.exceptions.ReadTimeoutError(None, "tarball", "Read timed out.")
+        end = self.fail_after if size < 0 else min(self.position + size, self.fail_after)
+        chunk = self.payload[self.position:end]
+        self.position = end
+        return chunk
+
+
+class FakeTarballClient:
+    def __init__(self, files, fail_after=None, gate=None):
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for path, text in files.items():
+                data = text.encode("utf-8")
+                info = tarfile.TarInfo(f"a-b-0000000/{path}")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        self.payload = buffer.getvalue()
+        self.fail_after = fail_after
+        self.gate = gate
+        self.downloads = 0
+
+    def resolve_commit_sha(self, repo_full_name, ref=None):
+        return "0" * 40
+
+    def open_repo_tarball(self, repo_full_name, commit_sha, timeout=60):
+        self.downloads += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        payload, fail_after = self.payload, self.fail_after
+
+        class Response:
+            raw = io.BytesIO(payload) if fail_after is None else FlakyRaw(payload, fail_after)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+        return Response()
+
+
+@pytest.fixture
+def index_state(tmp_path, monkeypatch):
+    monkeypatch.setenv("RADARZ_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("GITHUB_CODE_INDEX", "true")
+    monkeypatch.setattr(code_index, "_indexes", None)
+    monkeypatch.setattr(code_index, "_failed_builds", None)
+    monkeypatch.setattr(code_index, "_build_locks", {})
+    return code_index
+
+
+def test_build_strips_the_tarball_prefix(tmp_path, monkeypatch):
+    monkeypatch.setenv("RADARZ_CACHE_DIR", str(tmp_path))
+    index = build_repo_code_index(FakeTarballClient(FILES), "a/b", "0" * 40, max_total_bytes=1024)
+
+    assert index.get_file("src/utils.py") == FILES["src/utils.py"]
+
+
+def test_build_stops_when_the_deadline_expires(tmp_path, monkeypatch):
+    monkeypatch.setenv("RADARZ_CACHE_DIR", str(tmp_path))
+    with deadline_scope(Deadline.after(-1)):
+        with pytest.raises(DeadlineExceeded):
+            build_repo_code_index(FakeTarballClient(FILES), "a/b", "0" * 40, max_total_bytes=1024)
+
+
+def test_connection_lost_mid_download_falls_back_and_is_remembered(index_state):
+    client = FakeTarballClient(FILES, fail_after=20)
+
+    assert get_repo_code_index(client, "a/b") is None
+    assert get_repo_code_index(client, "a/b") is None
+    assert client.downloads == 1
+
+
+def test_concurrent_callers_build_the_index_once(index_state):
+    gate = threading.Event()
+    client = FakeTarballClient(FILES, gate=gate)
+    results = []
+    callers = [threading.Thread(target=lambda: results.append(get_repo_code_index(client, "a/b"))) for _ in range(3)]
+    for caller in callers:
+        caller.start()
+    key = "a/b@" + "0" * 40
+    # 等所有调用者都拿到同一把锁后再放行下载
+    while key not in index_state._build_locks or index_state._build_locks[key].users < 3:
+        time.sleep(0.001)
+    gate.set()
+    for caller in callers:
+        caller.join(5)
+
+    assert client.downloads == 1
+    assert len(results) == 3 and all(index is results[0] for index in results)
+    assert index_state._build_locks == {}
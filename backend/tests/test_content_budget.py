@@ -0,0 +1,36 @@
+from src.github.github_client import ContentBudget, RawContent
+
+
+def test_no_limits_keeps_everything():
+    assert ContentBudget.apply("a\nb\nc\n") == RawContent("a\nb\nc\n", False)
+
+
+def test_line_limit_cuts_at_the_last_allowed_line():
+    assert ContentBudget.apply("a\nb\nc\n", max_lines=2) == RawContent("a\nb", True)
+
+
+def test_line_limit_equal_to_content_is_not_truncated():
+    assert ContentBudget.apply("a\nb\n", max_lines=2) == RawContent("a\nb", False)
+
+
+def test_byte_limit():
+    assert ContentBudget.apply("abcdef", max_bytes=4) == RawContent("abcd", True)
+
+
+def test_byte_limit_drops_incomplete_characters():
+    # "中" 占 3 个字节，截断在第 4 个字节时只保留完整的字符
+    assert ContentBudget.apply("中文", max_bytes=4) == RawContent("中", True)
+
+
+def test_feed_stops_once_the_budget_is_used():
+    budget = ContentBudget(max_lines=2)
+    assert budget.feed(b"a\n") is True
+    assert budget.feed(b"b\nc\n") is False
+    assert budget.result() == RawContent("a\nb", True)
+
+
+def test_more_data_after_a_full_line_budget_marks_truncation():
+    budget = ContentBudget(max_lines=1)
+    assert budget.feed(b"a\n") is True
+    assert budget.feed(b"b") is False
+    assert budget.result().truncated
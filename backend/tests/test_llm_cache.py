@@ -0,0 +1,41 @@
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from src.llm.cache import SQLiteLLMCache, make_llm_cache_key
+
+
+LLM_STRING = '{"lc": 1, "kwargs": {"model": "demo", "timeout": 12.5}}---[("stop", None)]'
+
+
+def test_sqlite_cache_round_trip_after_restart(tmp_path, monkeypatch):
+    monkeypatch.setenv("RADARZ_CACHE_DIR", str(tmp_path))
+    generation = ChatGeneration(
+        message=AIMessage(
+            content="verdict",
+            tool_calls=[{"name": "ProjectValidation", "args": {"is_valid": True}, "id": "call-1"}],
+        )
+    )
+    SQLiteLLMCache().update("prompt", LLM_STRING, [generation])
+
+    # 新实例的内存层为空，命中必须来自 SQLite
+    cache = SQLiteLLMCache()
+    cached = cache.lookup("prompt", LLM_STRING)
+
+    assert cached is not None
+    assert cached[0].message.content == "verdict"
+    assert cached[0].message.tool_calls[0]["args"] == {"is_valid": True}
+    assert cache.stats()["hits"] == 1
+
+
+def test_sqlite_cache_misses_other_prompts(tmp_path, monkeypatch):
+    monkeypatch.setenv("RADARZ_CACHE_DIR", str(tmp_path))
+    cache = SQLiteLLMCache()
+    cache.update("prompt", LLM_STRING, [ChatGeneration(message=AIMessage(content="a"))])
+
+    assert cache.lookup("other prompt", LLM_STRING) is None
+
+
+def test_cache_key_ignores_timeouts():
+    other = LLM_STRING.replace("12.5", "3.0")
+
+    assert make_llm_cache_key("prompt", LLM_STRING) == make_llm_cache_key("prompt", other)
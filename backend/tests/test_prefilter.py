@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+from src.searchagent.prefilter import rank_repositories, tokenize
+
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def repo(name, description="", stars=0, pushed_at="2024-12-01T00:00:00Z", topics=None):
+    return {
+        "full_name": f"owner/{name}",
+        "name": name,
+        "description": description,
+        "stargazers_count": stars,
+        "pushed_at": pushed_at,
+        "topics": topics or [],
+    }
+
+
+def names(repos):
+    return [r["name"] for r in repos]
+
+
+def test_tokenize_splits_identifiers():
+    assert tokenize("FastAPI vector-search web_crawler") == ["fast", "api", "vector", "search", "web", "crawler"]
+
+
+def test_lexical_match_outranks_stars():
+    repos = [
+        repo("popular", "a web framework", stars=100000),
+        repo("vectordb", "vector database for similarity search", stars=10),
+    ]
+    ranked, scores = rank_repositories(repos, ["vector database"], top_n=0, min_score=0, now=NOW)
+    assert names(ranked) == ["vectordb", "popular"]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_min_score_filters_unrelated_repositories():
+    repos = [
+        repo("vectordb", "vector database"),
+        repo("unrelated", "image editor"),
+    ]
+    ranked, _ = rank_repositories(repos, ["vector database"], top_n=0, min_score=0.1, now=NOW)
+    assert names(ranked) == ["vectordb"]
+
+
+def test_top_n_keeps_the_best_matches():
+    repos = [repo(f"vector{i}", "vector " * (i + 1)) for i in range(5)]
+    ranked, scores = rank_repositories(repos, ["vector"], top_n=2, min_score=0, now=NOW)
+    assert len(ranked) == len(scores) == 2
+
+
+def test_prior_breaks_lexical_ties():
+    repos = [
+        repo("small", "vector database", stars=10),
+        repo("large", "vector database", stars=10000),
+    ]
+    ranked, _ = rank_repositories(repos, ["vector database"], top_n=0, min_score=0, now=NOW)
+    assert names(ranked) == ["large", "small"]
+
+
+def test_no_lexical_overlap_falls_back_to_prior():
+    repos = [
+        repo("stale", "something", stars=10, pushed_at="2015-01-01T00:00:00Z"),
+        repo("fresh", "else", stars=5000),
+    ]
+    ranked, _ = rank_repositories(repos, ["向量数据库"], top_n=0, min_score=0.5, now=NOW)
+    assert names(ranked) == ["fresh", "stale"]
+
+
+def test_empty_input():
+    assert rank_repositories([], ["anything"], top_n=10, min_score=0) == ([], [])
@@ -0,0 +1,46 @@
+import math
+
+import pytest
+
+from src.github.rate_limiter import TokenBucket
+
+
+def test_bucket_starts_full():
+    bucket = TokenBucket(limit=10, window=60)
+    assert bucket.wait_time() == 0
+
+
+def test_reservations_overdraw_and_queue():
+    bucket = TokenBucket(limit=2, window=60)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # 令牌用完后按补充速度排队：每 30 秒补充一个
+    assert bucket.reserve() == pytest.approx(30, abs=0.1)
+    assert bucket.reserve() == pytest.approx(60, abs=0.1)
+
+
+def test_refill_is_proportional_to_elapsed_time():
+    bucket = TokenBucket(limit=60, window=60)
+    bucket.tokens = 0
+    bucket.updated_at -= 10
+    bucket.wait_time()
+    assert bucket.tokens == pytest.approx(10, abs=0.1)
+
+
+def test_refill_never_exceeds_the_limit():
+    bucket = TokenBucket(limit=5, window=60)
+    bucket.updated_at -= 3600
+    bucket.wait_time()
+    assert bucket.tokens == 5
+
+
+def test_release_returns_a_token():
+    bucket = TokenBucket(limit=1, window=60)
+    bucket.reserve()
+    bucket.release()
+    assert bucket.wait_time() == 0
+
+
+def test_zero_limit_waits_forever():
+    bucket = TokenBucket(limit=0, window=60)
+    assert bucket.wait_time() == math.inf
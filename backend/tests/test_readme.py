@@ -0,0 +1,52 @@
+from src.llm import readme
+from src.llm.readme import normalize_readme, prepare_readme, readme_settings_tag
+from src.React import summary_cache
+from src.React.summary_cache import SummaryCache
+
+
+def test_badges_images_and_html_are_removed():
+    text = normalize_readme(
+        "# Demo\n"
+        "[![CI](https://ci/badge.svg)](https://ci) ![logo](logo.png)\n"
+        "<p align=\"center\"><img src=\"x.png\"></p>\n"
+        "A [fast](https://example.com) tool &amp; library.\n"
+    )
+
+    assert text == "# Demo\n\nA fast tool & library."
+
+
+def test_noise_sections_are_dropped_until_the_next_heading():
+    text = normalize_readme("# Demo\nintro\n## Contributors\nalice\n### Bots\nbot\n## Usage\nrun it\n")
+
+    assert text == "# Demo\nintro\n## Usage\nrun it"
+
+
+def test_code_blocks_keep_their_markup_and_are_capped():
+    block = "```html\n" + "\n".join(f"<b>{i}</b>" for i in range(5)) + "\n```"
+    text = normalize_readme(block, code_block_max_lines=2)
+
+    assert text == "```html\n<b>0</b>\n<b>1</b>\n# ……（省略 3 行）\n```"
+
+
+def test_prepare_readme_truncates_to_the_budget():
+    long_readme = "word " * 5000
+
+    prepared = prepare_readme(long_readme, 50)
+
+    assert prepared.endswith(readme.TRUNCATED_NOTICE)
+    assert prepare_readme("short", 50) == "short"
+
+
+def test_settings_tag_covers_every_budget_and_the_code_block_cap(monkeypatch):
+    tag = readme_settings_tag(4000, 1500)
+    assert tag != readme_settings_tag(4000, 2000)
+
+    monkeypatch.setattr(readme, "CODE_BLOCK_MAX_LINES", 40)
+    assert readme_settings_tag(4000, 1500) != tag
+
+
+def test_summary_key_changes_with_the_readme_budget(monkeypatch):
+    key = SummaryCache.make_key("owner/repo", "readme")
+
+    monkeypatch.setattr(summary_cache, "SUMMARY_README_TOKENS", 4000)
+    assert SummaryCache.make_key("owner/repo", "readme") != key
@@ -0,0 +1,71 @@
+from src.github.github_client import GitHubClient
+from src.github.response_cache import ResponseCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        pass
+
+
+def make_client(responses, sent_headers):
+    client = GitHubClient(cache=ResponseCache())
+
+    def send(method, url, headers, **kwargs):
+        sent_headers.append(dict(headers))
+        return responses.pop(0)
+
+    client._send = send
+    return client
+
+
+URL = "https://api.github.com/search/repositories"
+
+
+def test_revalidates_with_etag_and_serves_cached_body_on_304():
+    sent_headers = []
+    body = {"items": [{"full_name": "a/b", "topics": ["cli"]}]}
+    client = make_client(
+        [FakeResponse(200, body, {"ETag": '"v1"'}), FakeResponse(304)],
+        sent_headers,
+    )
+
+    assert client._get_json(URL, params={"q": "x"}, use_cache=True) == body
+    assert client._get_json(URL, params={"q": "x"}, use_cache=True) == body
+
+    assert "If-None-Match" not in sent_headers[0]
+    assert sent_headers[1]["If-None-Match"] == '"v1"'
+    assert client.cache.stats()["hits"] == 1
+
+
+def test_responses_without_validators_are_not_cached():
+    sent_headers = []
+    client = make_client(
+        [FakeResponse(200, {"n": 1}), FakeResponse(200, {"n": 2})],
+        sent_headers,
+    )
+
+    client._get_json(URL, use_cache=True)
+    assert client._get_json(URL, use_cache=True) == {"n": 2}
+    assert "If-None-Match" not in sent_headers[1]
+
+
+def test_callers_cannot_mutate_the_cached_body():
+    sent_headers = []
+    body = {"items": [{"topics": ["cli"]}]}
+    client = make_client(
+        [FakeResponse(200, body, {"ETag": '"v1"'}), FakeResponse(304), FakeResponse(304)],
+        sent_headers,
+    )
+
+    client._get_json(URL, use_cache=True)["items"][0]["topics"].append("python")
+    client._get_json(URL, use_cache=True)["items"][0]["topics"].append("python")
+
+    assert client._get_json(URL, use_cache=True) == {"items": [{"topics": ["cli"]}]}
@@ -0,0 +1,25 @@
+from src.resilience import RetryPolicy, invoke_with_retry
+
+
+class FlakyModel:
+    def __init__(self, failures):
+        self.failures = failures
+
+    def invoke(self, input):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("reset")
+        return f"ok: {input}"
+
+
+def test_invoke_with_retry_rebuilds_the_runnable_for_every_attempt():
+    model = FlakyModel(failures=2)
+    built = []
+
+    def get_runnable():
+        built.append(1)
+        return model
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    assert invoke_with_retry(get_runnable, "hi", dependency="test-retry", policy=policy) == "ok: hi"
+    assert len(built) == 3
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, timezone
+
+from src.github.sharded_search import MIN_TIME_SPAN, SearchShard
+
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_split_by_creation_time_first():
+    shard = SearchShard(START, START + timedelta(days=2), stars_min=100)
+    left, right = shard.split()
+    assert left.created_from == START
+    assert left.created_to == START + timedelta(days=1)
+    assert right.created_from == left.created_to + timedelta(seconds=1)
+    assert right.created_to == shard.created_to
+    assert left.stars_min == right.stars_min == 100
+
+
+def test_split_by_stars_when_the_time_span_is_small():
+    shard = SearchShard(START, START + MIN_TIME_SPAN - timedelta(seconds=1), stars_min=100)
+    low, high = shard.split()
+    assert (low.stars_min, low.stars_max) == (100, 199)
+    assert (high.stars_min, high.stars_max) == (200, None)
+    assert low.created_from == high.created_from == START
+
+
+def test_split_bounded_star_range_in_half():
+    shard = SearchShard(START, START + timedelta(minutes=10), stars_min=100, stars_max=200)
+    low, high = shard.split()
+    assert (low.stars_min, low.stars_max) == (100, 150)
+    assert (high.stars_min, high.stars_max) == (151, 200)
+
+
+def test_split_from_zero_stars():
+    shard = SearchShard(START, START + timedelta(minutes=10), stars_min=0)
+    low, high = shard.split()
+    assert (low.stars_min, low.stars_max) == (0, 0)
+    assert high.stars_min == 1
+
+
+def test_unsplittable_shard():
+    shard = SearchShard(START, START + timedelta(minutes=10), stars_min=5, stars_max=5)
+    assert shard.split() is None
+
+
+def test_to_query():
+    shard = SearchShard(START, START + timedelta(days=1), stars_min=10, stars_max=20, language="Python")
+    assert shard.to_query() == (
+        "created:2024-01-01T00:00:00Z..2024-01-02T00:00:00Z stars:10..20 language:Python"
+    )
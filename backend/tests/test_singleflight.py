@@ -0,0 +1,220 @@
+import asyncio
+import copy
+import threading
+import time
+
+import pytest
+
+from src.cache import AsyncSingleFlight, SingleFlight, singleflight
+from src.resilience import Deadline, DeadlineExceeded, deadline_scope
+
+
+def test_followers_share_the_leader_call():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"items": [1]}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", fetch)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("key", fetch))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    while flight.shared < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert flight.shared == 3
+    assert results == [{"items": [1]}] * 4
+
+
+def test_followers_get_a_copy_of_the_result():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    leader_result = {}
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        return {"items": [1]}
+
+    leader = threading.Thread(target=lambda: leader_result.update(flight.do("key", fetch)))
+    leader.start()
+    started.wait(5)
+    follower_result = {}
+    follower = threading.Thread(target=lambda: follower_result.update(flight.do("key", fetch)))
+    follower.start()
+    while flight.shared < 1:
+        time.sleep(0.001)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    follower_result["items"].append(2)
+    assert leader_result == {"items": [1]}
+
+
+def test_followers_receive_the_leader_error():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("key", fetch)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call)]
+    threads[0].start()
+    started.wait(5)
+    threads += [threading.Thread(target=call) for _ in range(2)]
+    for thread in threads[1:]:
+        thread.start()
+    while flight.shared < 2:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 3
+    assert all(str(e) == "boom" for e in errors)
+
+
+def test_follower_wait_is_bounded_by_the_deadline():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    leader = threading.Thread(target=lambda: flight.do("key", fetch))
+    leader.start()
+    started.wait(5)
+    try:
+        with deadline_scope(Deadline.after(0.05)):
+            with pytest.raises(DeadlineExceeded):
+                flight.do("key", fetch)
+    finally:
+        release.set()
+        leader.join(5)
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.shared == 0
+
+
+def test_async_followers_share_the_leader_call():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"items": [1]}
+
+    async def main():
+        return await asyncio.gather(*(flight.do("key", fetch) for _ in range(4)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert flight.shared == 3
+    assert results == [{"items": [1]}] * 4
+    assert results[1] is not results[0]
+
+
+def test_async_followers_receive_the_leader_error():
+    flight = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(*(flight.do("key", fetch) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_leader_mutation_does_not_reach_followers(monkeypatch):
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    real_deepcopy = copy.deepcopy
+
+    def slow_deepcopy(value):
+        # 拉长拷贝时间，让执行者的调用方有机会在拷贝期间修改结果
+        time.sleep(0.05)
+        return real_deepcopy(value)
+
+    monkeypatch.setattr(singleflight.copy, "deepcopy", slow_deepcopy)
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        return {"items": [1]}
+
+    def lead():
+        flight.do("key", fetch)["items"].append("leader")
+
+    follower_result = {}
+    leader = threading.Thread(target=lead)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: follower_result.update(flight.do("key", fetch)))
+    follower.start()
+    while flight.shared < 1:
+        time.sleep(0.001)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert follower_result == {"items": [1]}
+
+
+def test_async_leader_mutation_does_not_reach_followers():
+    flight = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return {"items": [1]}
+
+    async def lead():
+        result = await flight.do("key", fetch)
+        # 执行者先恢复，在等待者拿到结果之前修改返回值
+        result["items"].append("leader")
+        return result
+
+    async def main():
+        return await asyncio.gather(lead(), flight.do("key", fetch), flight.do("key", fetch))
+
+    leader, *followers = asyncio.run(main())
+    assert leader == {"items": [1, "leader"]}
+    assert followers == [{"items": [1]}, {"items": [1]}]
+    assert followers[0] is not followers[1]
@@ -0,0 +1,82 @@
+import pytest
+
+from src.cache import BlobStore, git_blob_sha
+from src.github import tree_cache
+from src.github.github_client import GitHubClient, RawContent
+from src.github.response_cache import ResponseCache
+from src.github.tree_cache import TreeCache
+
+
+SHA = "a" * 40
+TREE = [{"path": "src/app.py", "type": "blob", "size": 5, "sha": git_blob_sha(b"hello")}]
+
+
+@pytest.fixture
+def caches(tmp_path, monkeypatch):
+    monkeypatch.setenv("RADARZ_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(tree_cache, "_tree_cache", TreeCache())
+    monkeypatch.setattr(tree_cache, "_blob_store", BlobStore(tmp_path / "blobs"))
+    return tree_cache._tree_cache, tree_cache._blob_store
+
+
+class FakeClient(GitHubClient):
+    def __init__(self, trees=None):
+        super().__init__(cache=ResponseCache())
+        self.urls = []
+        self.trees = trees or {}
+
+    def _get_raw(self, url, params=None, timeout=None, max_bytes=None, max_lines=None, accept=None, use_cache=True):
+        self.urls.append(url)
+        if "/commits/" in url:
+            return RawContent(SHA)
+        return RawContent("from api")
+
+    def _get_json(self, url, params=None, timeout=None, use_cache=False):
+        self.urls.append(url)
+        return self.trees.get(url)
+
+
+def test_trees_survive_a_restart(caches):
+    TreeCache().set("Owner/Repo", SHA, TREE)
+
+    cache = TreeCache()
+    assert cache.get("owner/repo", SHA) == TREE
+    assert cache.has_repo("OWNER/REPO")
+
+
+def test_cold_read_goes_straight_to_the_contents_api(caches):
+    client = FakeClient()
+
+    assert client.read_file("owner/repo", "src/app.py").text == "from api"
+    assert client.urls == ["https://api.github.com/repos/owner/repo/contents/src/app.py"]
+
+
+def test_cached_tree_and_blob_serve_the_file_locally(caches):
+    trees, blobs = caches
+    trees.set("owner/repo", SHA, TREE)
+    blobs.put(TREE[0]["sha"], "hello")
+    client = FakeClient()
+
+    assert client.read_file("owner/repo", "src/app.py", ref=SHA).text == "hello"
+    assert client.urls == []
+
+
+def test_only_complete_trees_are_cached(caches):
+    trees, _ = caches
+    url = f"https://api.github.com/repos/owner/repo/git/trees/{SHA}"
+    client = FakeClient({url: {"tree": TREE, "truncated": True}})
+
+    assert client.get_repo_structure("owner/repo", SHA) == [{"path": "src/app.py", "type": "blob", "size": 5}]
+    assert trees.get("owner/repo", SHA) is None
+
+    client.trees[url] = {"tree": TREE, "truncated": False}
+    client.get_repo_structure("owner/repo", SHA)
+    assert trees.get("owner/repo", SHA) == TREE
+
+
+def test_missing_tree_is_not_cached(caches):
+    trees, _ = caches
+    client = FakeClient()
+
+    assert client.get_repo_structure("owner/repo", SHA) is None
+    assert not trees.has_repo("owner/repo")
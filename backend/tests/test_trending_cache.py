@@ -0,0 +1,71 @@
+import asyncio
+
+from src.github.trending_cache import TrendingSnapshotCache
+
+
+class CountingLoader:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self, key):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [f"{key}-{self.calls}"]
+
+
+def age_snapshot(cache, key, seconds):
+    cache._snapshots[key].fetched_at -= seconds
+
+
+def test_fresh_snapshot_is_served_without_loading():
+    async def scenario():
+        loader = CountingLoader()
+        cache = TrendingSnapshotCache(loader, ttl=60, max_stale=600)
+        assert await cache.get("daily") == ["daily-1"]
+        assert await cache.get("daily") == ["daily-1"]
+        return loader.calls
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_stale_snapshot_is_served_while_refreshing_in_background():
+    async def scenario():
+        loader = CountingLoader()
+        cache = TrendingSnapshotCache(loader, ttl=60, max_stale=600)
+        await cache.get("daily")
+        age_snapshot(cache, "daily", 120)
+        stale = await cache.get("daily")
+        await asyncio.sleep(0.01)
+        return stale, await cache.get("daily")
+
+    assert asyncio.run(scenario()) == (["daily-1"], ["daily-2"])
+
+
+def test_too_old_snapshot_waits_and_keeps_the_old_one_on_failure():
+    async def scenario():
+        loader = CountingLoader()
+        cache = TrendingSnapshotCache(loader, ttl=60, max_stale=600)
+        await cache.get("daily")
+        age_snapshot(cache, "daily", 3600)
+
+        async def failing(key):
+            return []
+
+        cache.loader = failing
+        return await cache.get("daily")
+
+    assert asyncio.run(scenario()) == ["daily-1"]
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_load():
+    async def scenario():
+        loader = CountingLoader(delay=0.05)
+        cache = TrendingSnapshotCache(loader, ttl=60, max_stale=600)
+        first = asyncio.create_task(cache.get("daily"))
+        second = asyncio.create_task(cache.get("daily"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second, loader.calls
+
+    assert asyncio.run(scenario()) == (["daily-1"], 1)
@@ -0,0 +1,40 @@
+import pytest
+
+from src.searchagent import nodes
+from src.searchagent.nodes import plan_validation_batches
+
+
+@pytest.fixture(autouse=True)
+def fixed_token_count(monkeypatch):
+    # 每个项目的名称和描述固定按 10 个 token 计算
+    monkeypatch.setattr(nodes, "count_tokens", lambda text: 10)
+
+
+def repos(count):
+    return [{"full_name": f"owner/repo{i}"} for i in range(count)]
+
+
+def test_packs_projects_up_to_the_token_budget():
+    # 每个项目 10 + 90 = 100 个 token，提示词 100 个 token，预算 400 时每批 3 个
+    batches = plan_validation_batches(repos(7), base_tokens=100, budget=400, readme_tokens=90, max_size=10)
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+
+
+def test_respects_the_batch_size_limit():
+    batches = plan_validation_batches(repos(5), base_tokens=0, budget=10000, readme_tokens=0, max_size=2)
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_oversized_project_gets_its_own_batch():
+    batches = plan_validation_batches(repos(2), base_tokens=100, budget=50, readme_tokens=90, max_size=10)
+    assert [len(batch) for batch in batches] == [1, 1]
+
+
+def test_keeps_the_original_order():
+    items = repos(5)
+    batches = plan_validation_batches(items, base_tokens=0, budget=250, readme_tokens=90, max_size=10)
+    assert [repo for batch in batches for repo in batch] == items
+
+
+def test_no_projects():
+    assert plan_validation_batches([], base_tokens=0) == []
@@ -0,0 +1,31 @@
+from src.searchagent.verdict_cache import VerdictCache, normalize_criteria
+
+
+def test_criteria_ignore_case_whitespace_punctuation_and_order():
+    assert normalize_criteria(["Supports  Python。", "has a CLI"]) == normalize_criteria(
+        ["has a cli.", "supports python"]
+    )
+
+
+def test_blank_and_duplicate_criteria_are_ignored():
+    assert normalize_criteria(["uses rust", "Uses Rust", " "]) == normalize_criteria(["uses rust"])
+
+
+def test_different_criteria_produce_different_hashes():
+    assert normalize_criteria(["uses rust"]) != normalize_criteria(["uses go"])
+
+
+def test_key_ignores_repo_name_case_but_not_version_or_kind():
+    key = VerdictCache.make_key("validate", "Owner/Repo", "2024-01-01", ["uses rust"], "m")
+
+    assert VerdictCache.make_key("validate", "owner/repo", "2024-01-01", ["Uses Rust."], "m") == key
+    assert VerdictCache.make_key("validate", "owner/repo", "2024-02-01", ["uses rust"], "m") != key
+    assert VerdictCache.make_key("validate_pro", "owner/repo", "2024-01-01", ["uses rust"], "m") != key
+
+
+def test_verdicts_persist_across_instances(tmp_path, monkeypatch):
+    monkeypatch.setenv("RADARZ_CACHE_DIR", str(tmp_path))
+    key = VerdictCache.make_key("validate", "owner/repo", "v1", ["uses rust"], "m")
+    VerdictCache().set(key, False)
+
+    assert VerdictCache().get(key) is False